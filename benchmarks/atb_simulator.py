@@ -0,0 +1,64 @@
+"""
+Battles per second of the headless ATB simulator on the Zephyros and Kefka's Ghost
+fights, single process against the process pool.
+
+This only measures throughput. The boss stats in atb_stats_from_id are
+placeholders (Zephyros) and the ActionModel constants are unverified guesses, so
+win rates and turns would not say anything about the policies yet and are not
+printed. The guesses can be changed from the command line.
+
+Runs without the game. Run from the repo root:
+    python -m benchmarks.atb_simulator [battles] [babamut_damage] [x_crystal_power]
+"""
+import sys
+import time
+
+from evo1.atb import ATBAction, ATBActor, ATBPlan
+from evo1.atb.entity import ATBEntityID
+from evo1.atb.simulator import ActionModel, BattleSetup, Combatant, evaluate_policy
+from evo1.route.black_citadel import zephyros_policy
+
+ZEPHYROS = BattleSetup(
+    allies=(Combatant(ATBEntityID.CLINK, level=3), Combatant(ATBEntityID.KAERIS, 3)),
+    enemies=(Combatant(ATBEntityID.ZEPHYROS, speed=0.8),),
+)
+# Clink alone, farmed to level 2 in the Crystal Cavern. The invincible phase of the
+# boss is not simulated
+KEFKAS_GHOST = BattleSetup(
+    allies=(Combatant(ATBEntityID.CLINK, level=2),),
+    enemies=(Combatant(ATBEntityID.KEFKAS_GHOST),),
+)
+
+
+def attack_policy(battle, actor: ATBActor) -> ATBPlan:
+    # SeqKefkasGhost only ever attacks
+    return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+
+def main() -> None:
+    battles = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    model = ActionModel()
+    if len(sys.argv) > 2:
+        model = model._replace(babamut_damage=int(sys.argv[2]))
+    if len(sys.argv) > 3:
+        model = model._replace(x_crystal_power=float(sys.argv[3]))
+
+    print(f"{battles} battles")
+    for name, setup, policy in (
+        ("Zephyros", ZEPHYROS, zephyros_policy),
+        ("Kefka's Ghost", KEFKAS_GHOST, attack_policy),
+    ):
+        start = time.perf_counter()
+        evaluate_policy(setup, policy, battles, model, processes=0)
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        evaluate_policy(setup, policy, battles, model)
+        pool_time = time.perf_counter() - start
+        print(
+            f"{name:>14}: single process {battles / single_time:.0f} battles/s, "
+            f"process pool {battles / pool_time:.0f} battles/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
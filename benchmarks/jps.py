@@ -0,0 +1,105 @@
+"""
+JumpPointSearch against AStar on the tile grid maps of maps/evo1, between random
+pairs of connected tiles (with diagonal moves). Paths must cost the same, except
+where AStar misses the shortest path (its straight line heuristic overestimates the
+1.4 diagonals a little), where the jump point search path must be shorter. Prints
+the nodes each expands and the time per path.
+
+Run from the repo root:
+    python -m benchmarks.jps [pairs] [min_dist]
+"""
+import glob
+import random
+import sys
+import time
+from collections import deque
+from typing import Callable
+
+from engine.mathlib import Vec2, dist
+from engine.pathing import AStar, JumpPointSearch, Pathing, TileMap
+
+
+def _cost(start: Vec2, path: list[Vec2]) -> float:
+    # Same step costs as AStar
+    cost = 0.0
+    for prev, pos in zip([start] + path, path):
+        cost += 1 if abs(pos.x - prev.x) + abs(pos.y - prev.y) == 1 else 1.4
+    return cost
+
+
+def _component(nav: Pathing, start: Vec2) -> list[Vec2]:
+    # Every tile reachable from start
+    seen = {start}
+    queue = deque([Pathing.Node(start, start)])
+    while queue:
+        node = queue.popleft()
+        for neighbor in nav._neighbors(node, start, free_move=False):
+            if neighbor.pos not in seen:
+                seen.add(neighbor.pos)
+                queue.append(neighbor)
+    return list(seen)
+
+
+def _pairs(
+    nav: Pathing, count: int, min_dist: float, gen: random.Random
+) -> list[tuple[Vec2, Vec2]]:
+    pairs = []
+    for _ in range(count):
+        start = gen.choice(nav.map)
+        tiles = _component(nav, start)
+        far = [tile for tile in tiles if dist(start, tile) >= min_dist]
+        pairs.append((start, gen.choice(far or tiles)))
+    return pairs
+
+
+def _counted(obj: object, method: str) -> Callable[[], int]:
+    # Count the calls to a method of obj, once per expanded node
+    calls = [0]
+    func = getattr(obj, method)
+
+    def counter(*args, **kwargs):
+        calls[0] += 1
+        return func(*args, **kwargs)
+
+    setattr(obj, method, counter)
+    return lambda: calls[0]
+
+
+def _timed(nav: Pathing, pairs: list[tuple[Vec2, Vec2]]) -> tuple[list, float]:
+    start_time = time.perf_counter()
+    paths = [nav.calculate(start, goal) for start, goal in pairs]
+    return paths, time.perf_counter() - start_time
+
+
+def main() -> None:
+    pairs_per_map = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    min_dist = float(sys.argv[2]) if len(sys.argv) > 2 else 40
+    gen = random.Random(0)
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap = TileMap(filename)
+        if tilemap.nav_nodes or not tilemap.map:
+            continue
+        astar, jps = AStar(tilemap.map), JumpPointSearch(tilemap.map)
+        pairs = _pairs(astar, pairs_per_map, min_dist, gen)
+        astar_expanded = _counted(astar, "_neighbors")
+        jps_expanded = _counted(jps, "_directions")
+        astar_paths, astar_time = _timed(astar, pairs)
+        jps_paths, jps_time = _timed(jps, pairs)
+
+        shorter = 0
+        for (start, goal), astar_path, jps_path in zip(pairs, astar_paths, jps_paths):
+            astar_cost, jps_cost = _cost(start, astar_path), _cost(start, jps_path)
+            end = jps_path[-1] if jps_path else start
+            assert end == goal, f"{filename}: {start} -> {goal} misses the goal"
+            assert jps_cost <= astar_cost + 1e-9, f"{filename}: {start} -> {goal}"
+            shorter += jps_cost < astar_cost - 1e-9
+        print(
+            f"{tilemap.name:>24}: {len(tilemap.map):>6} tiles, expanded "
+            f"{astar_expanded() / len(pairs):8.1f} -> {jps_expanded() / len(pairs):6.1f}"
+            f" nodes/path, {1000 * astar_time / len(pairs):7.2f} -> "
+            f"{1000 * jps_time / len(pairs):6.2f} ms/path, {shorter} shorter"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Loading every map in maps/evo1: decoded from the map files, then from the binary
+map cache (written on the first pass, read on the second). The cache goes to a
+temporary directory, the one of maps/evo1/maps.py is left alone.
+
+Run from the repo root:
+    python -m benchmarks.map_loading
+"""
+import glob
+import tempfile
+import time
+
+from engine.pathing import TileMap, load_tilemap
+
+
+def _load_all(filenames: list[str], cache_dir=None) -> float:
+    start = time.perf_counter()
+    for filename in filenames:
+        load_tilemap(filename, cache_dir=cache_dir)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    filenames = sorted(glob.glob("maps/evo1/*.yaml"))
+    # Warm up imports and the file system cache
+    _load_all(filenames)
+
+    decoded = _load_all(filenames)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        written = _load_all(filenames, cache_dir)
+        cached = _load_all(filenames, cache_dir)
+
+    start = time.perf_counter()
+    nodes = sum(len(TileMap(filename).map) for filename in filenames)
+    node_lists = time.perf_counter() - start - decoded
+
+    print(f"{len(filenames)} maps")
+    print(f"Decoded from the map files: {1000 * decoded:7.2f} ms")
+    print(f"Decoded and cache written:  {1000 * written:7.2f} ms")
+    print(f"Read from the cache:        {1000 * cached:7.2f} ms")
+    print(f"Node lists ({nodes} nodes): {1000 * node_lists:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+NavMesh paths from the all-pairs tables against the A* search, between every pair
+of nodes of the navmesh maps in maps/evo1. Both must return the same paths. Also
+times building the tables against reading them from the navmesh cache, and snapping
+positions all over the map to the nearest node in sight against checking every node,
+and planning from them.
+
+Run from the repo root:
+    python -m benchmarks.navmesh
+"""
+import glob
+import random
+import tempfile
+import time
+
+from engine.mathlib import Vec2, dist
+from engine.pathing import NavMesh, Pathing, TileMap, load_navmesh, load_tilemap
+from engine.pathing.navmesh import compute_tables
+
+
+def _nearest_reference(tilemap: TileMap, pos: Vec2) -> float:
+    # Distance to the closest node in sight, checking every node
+    nodes = tilemap.nav_nodes
+    if tilemap.width and tilemap.height:
+        nodes = [node for node in nodes if tilemap.line_of_sight(pos, node)]
+    return min(dist(pos, node) for node in nodes or tilemap.nav_nodes)
+
+
+def _bench_nearest(tilemap: TileMap, nav: NavMesh) -> None:
+    rng = random.Random(0)
+    tiles = tilemap.map or tilemap.nav_nodes
+    positions = [
+        Vec2(tile.x + rng.uniform(-0.5, 0.5), tile.y + rng.uniform(-0.5, 0.5))
+        for tile in rng.choices(tiles, k=1000)
+    ]
+    start_time = time.perf_counter()
+    nearest = [nav.nearest_node(pos) for pos in positions]
+    grid_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    ref_dists = [_nearest_reference(tilemap, pos) for pos in positions]
+    scan_time = time.perf_counter() - start_time
+    for pos, index, ref_dist in zip(positions, nearest, ref_dists):
+        assert dist(pos, nav.map[index]) == ref_dist, f"{pos}: wrong nearest node"
+    goal = nav.map[-1]
+    start_time = time.perf_counter()
+    for pos in positions:
+        nav.path_from(pos, goal)
+    path_time = time.perf_counter() - start_time
+    print(
+        f"{'':>16}  nearest node in sight: "
+        f"{1e6 * grid_time / len(positions):6.1f} us/query "
+        f"(every node {1e6 * scan_time / len(positions):6.1f} us), path from "
+        f"anywhere {1e6 * path_time / len(positions):6.1f} us"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+            tilemap = load_tilemap(filename, cache_dir=cache_dir)
+            if not tilemap.nav_nodes:
+                continue
+            nodes, edges = tilemap.nav_nodes, tilemap.nav_edges
+
+            start_time = time.perf_counter()
+            tables = compute_tables(nodes, edges)
+            build_time = time.perf_counter() - start_time
+            load_navmesh(tilemap, name="bench", cache_dir=cache_dir)  # Write
+            start_time = time.perf_counter()
+            nav = load_navmesh(tilemap, name="bench", cache_dir=cache_dir)
+            load_time = time.perf_counter() - start_time
+            assert (nav.tables.next_hop == tables.next_hop).all()
+
+            pairs = [
+                (start, goal)
+                for i, start in enumerate(nodes)
+                for j, goal in enumerate(nodes)
+                if i != j and tables.next_hop[i, j] >= 0
+            ]
+            start_time = time.perf_counter()
+            paths = [nav.calculate(start, goal) for start, goal in pairs]
+            table_time = time.perf_counter() - start_time
+            # The A* search NavMesh used before the tables
+            search = NavMesh(map_nodes=nodes, edges=edges, tables=tables)
+            start_time = time.perf_counter()
+            ref_paths = [
+                Pathing._search(search, start, goal, None, False)
+                for start, goal in pairs
+            ]
+            search_time = time.perf_counter() - start_time
+
+            assert paths == ref_paths, f"{filename}: paths differ"
+            print(
+                f"{tilemap.name:>16}: {len(nodes)} nodes, {len(pairs)} paths, "
+                f"{1e6 * table_time / len(pairs):6.1f} us/path "
+                f"(A* {1e6 * search_time / len(pairs):6.1f} us, "
+                f"{search_time / table_time:5.1f}x), tables built in "
+                f"{1000 * build_time:.2f} ms, read in {1000 * load_time:.2f} ms"
+            )
+            _bench_nearest(tilemap, nav)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Pathing.calculate against the list based search it replaced, on every map in
+maps/evo1. Both must return the same paths. Start and goal pairs are picked at
+random among tiles connected to each other, at most `max_dist` steps apart so that
+the reference search finishes in reasonable time.
+
+Run from the repo root:
+    python -m benchmarks.pathing [pairs] [max_dist]
+"""
+import glob
+import random
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+from engine.mathlib import Vec2
+from engine.pathing import AStar, NavMesh, Pathing, TileMap
+
+
+def reference_calculate(
+    nav: Pathing, start: Vec2, goal: Vec2, free_move: bool = True
+) -> list[Vec2]:
+    # The search as it was before, sorted open list and list membership checks
+    open_list = [Pathing.Node(start, goal)]
+    closed_list: list[Pathing.Node] = []
+
+    def update(cur_node: Pathing.Node, neighbor: Pathing.Node, node_list) -> None:
+        n_idx = node_list.index(neighbor)
+        if neighbor.cost < node_list[n_idx].cost:
+            node_list[n_idx].cost = neighbor.cost
+            node_list[n_idx].parent = cur_node
+
+    while open_list:
+        open_list.sort()
+        node = open_list.pop()
+        if node.pos == goal:
+            return node.trace_path()
+        closed_list.append(node)
+        for neighbor in nav._neighbors(node, goal, free_move):
+            if neighbor in closed_list:
+                update(node, neighbor, closed_list)
+            elif neighbor in open_list:
+                update(node, neighbor, open_list)
+            else:
+                open_list.append(neighbor)
+    raise ValueError
+
+
+def _reachable(nav: Pathing, start: Vec2, max_dist: int) -> list[Vec2]:
+    # Every node reachable from start in at most max_dist steps
+    seen = {start: 0}
+    queue = deque([Pathing.Node(start, start)])
+    while queue:
+        node = queue.popleft()
+        if seen[node.pos] >= max_dist:
+            continue
+        for neighbor in nav._neighbors(node, start, free_move=False):
+            if neighbor.pos not in seen:
+                seen[neighbor.pos] = seen[node.pos] + 1
+                queue.append(neighbor)
+    return list(seen)
+
+
+def _pairs(
+    nav: Pathing, count: int, max_dist: int, gen: random.Random
+) -> list[tuple[Vec2, Vec2]]:
+    pairs = []
+    for _ in range(count):
+        start = gen.choice(nav.map)
+        pairs.append((start, gen.choice(_reachable(nav, start, max_dist))))
+    return pairs
+
+
+def _navigation(tilemap: TileMap) -> Optional[Pathing]:
+    if tilemap.nav_nodes:
+        return NavMesh(map_nodes=tilemap.nav_nodes, edges=tilemap.nav_edges)
+    return AStar(tilemap.map) if tilemap.map else None
+
+
+def main() -> None:
+    pairs_per_map = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    max_dist = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    gen = random.Random(0)
+    total_new, total_ref = 0.0, 0.0
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap = TileMap(filename)
+        nav = _navigation(tilemap)
+        if nav is None:
+            continue
+        pairs = _pairs(nav, pairs_per_map, max_dist, gen)
+        free_move = isinstance(nav, AStar)
+
+        start_time = time.perf_counter()
+        paths = [
+            nav.calculate(start, goal, free_move=free_move) for start, goal in pairs
+        ]
+        new_time = time.perf_counter() - start_time
+
+        # The reference search with list membership checks, like it used to be
+        nav.passable = nav.map
+        start_time = time.perf_counter()
+        ref_paths = [
+            reference_calculate(nav, start, goal, free_move) for start, goal in pairs
+        ]
+        ref_time = time.perf_counter() - start_time
+
+        assert paths == ref_paths, f"{filename}: paths differ"
+        total_new += new_time
+        total_ref += ref_time
+        print(
+            f"{tilemap.name:>24}: {len(nav.map):>6} nodes, "
+            f"{1000 * new_time / len(pairs):8.2f} ms/path "
+            f"(was {1000 * ref_time / len(pairs):8.2f} ms, "
+            f"{ref_time / max(new_time, 1e-9):6.1f}x)"
+        )
+    print(f"Total: {total_new:.2f}s (was {total_ref:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
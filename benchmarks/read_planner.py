@@ -0,0 +1,65 @@
+"""
+Compare per-field reads against coalesced reads through memory.core.ReadPlan.
+
+Requires Evoland to be running and in the overworld. Run from the repo root:
+    python -m benchmarks.read_planner [iterations]
+"""
+import sys
+import time
+
+from memory import advance_frame
+from memory.evo1 import Evo1GameEntity2D, get_zelda_memory, load_zelda_memory
+
+
+def read_all(entity: Evo1GameEntity2D) -> None:
+    _ = (
+        entity.kind,
+        entity.pos,
+        entity.tile_pos,
+        entity.speed,
+        entity.timer,
+        entity.facing,
+        entity.is_attacking,
+        entity.rotation,
+        entity.cur_anim,
+        entity.mkind,
+        entity.ikind,
+        entity.hp,
+        entity.in_control,
+        entity.encounter_timer,
+    )
+
+
+def bench(iterations: int, max_gap: int = None) -> float:
+    mem = get_zelda_memory()
+    entities = [mem.player] + mem.actors
+    start = time.perf_counter()
+    for _ in range(iterations):
+        advance_frame()
+        if max_gap is not None:
+            mem.prefetch(max_gap=max_gap)
+        for entity in entities:
+            read_all(entity)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    load_zelda_memory()
+    mem = get_zelda_memory()
+    print(f"{len(mem.actors) + 1} entities, {iterations} iterations")
+
+    per_field = bench(iterations)
+    print(f"per-field: {per_field * 1000:.3f} ms/tick")
+    for max_gap in (0, 0x40, 0x100):
+        advance_frame()
+        reads = mem.prefetch(max_gap=max_gap)
+        planned = bench(iterations, max_gap=max_gap)
+        print(
+            f"planned (gap {max_gap:#x}, {reads} reads): {planned * 1000:.3f} ms/tick"
+            f" ({per_field / planned:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
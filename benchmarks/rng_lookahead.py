@@ -0,0 +1,55 @@
+"""
+Compare step by step RNGStruct lookahead with the NumPy RNGLookahead, and check
+that both produce the same values.
+
+Needs only memory.rng and NumPy, the game is never read. Run from the repo root:
+    python -m benchmarks.rng_lookahead [steps]
+"""
+import sys
+import time
+
+from memory.rng import EvolandRNG, random_rng
+from memory.rng_lookahead import RNGLookahead
+
+
+def lookahead_python(rng: EvolandRNG.RNGStruct, steps: int) -> list[int]:
+    return [rng.rand_int() for _ in range(steps)]
+
+
+def floats_python(rng: EvolandRNG.RNGStruct, steps: int) -> list[float]:
+    floats = []
+    for offset in range(steps):
+        copy = EvolandRNG.RNGStruct(cursor=rng.cursor, values=list(rng.values))
+        if offset:
+            copy.advance_rng(offset)
+        floats.append(copy.rand_float())
+    return floats
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random_rng(seed=steps)
+
+    start = time.perf_counter()
+    ints = lookahead_python(EvolandRNG.RNGStruct(rng.cursor, list(rng.values)), steps)
+    python_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lookahead = RNGLookahead(rng, steps)
+    numpy_time = time.perf_counter() - start
+
+    assert lookahead.ints.tolist() == ints, "rand_int mismatch"
+    # Floats at every offset are quadratic step by step, check a prefix
+    check = min(steps, 2000)
+    assert lookahead.floats[:check].tolist() == floats_python(rng, check)
+    for offset in {0, 1, 24, 25, 26, steps // 2, steps - 1} & set(range(steps)):
+        copy = lookahead.rng_at(offset)
+        assert copy.rand_int() == lookahead.rand_int(offset), f"rng_at({offset})"
+
+    print(f"{steps} steps lookahead")
+    print(f"RNGStruct:    {python_time * 1000:.2f} ms")
+    print(f"RNGLookahead: {numpy_time * 1000:.2f} ms ({python_time / numpy_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
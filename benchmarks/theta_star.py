@@ -0,0 +1,72 @@
+"""
+ThetaStar against AStar on the tile grid maps of maps/evo1, between random pairs of
+connected tiles at least `min_dist` apart. Every Theta* path must reach the goal
+with each leg in sight (with the player radius of maps/evo1/maps.py). Prints the
+average path length of AStar, of AStar smoothed by string pulling, and of Theta*,
+and the time per path.
+
+Run from the repo root:
+    python -m benchmarks.theta_star [pairs] [min_dist]
+"""
+import functools
+import glob
+import random
+import sys
+import time
+
+from benchmarks.jps import _pairs
+from engine.mathlib import Vec2, dist
+from engine.pathing import AStar, Pathing, ThetaStar, TileMap
+
+_PLAYER_RADIUS = 0.3  # Same as maps/evo1/maps.py
+
+
+def _length(start: Vec2, path: list[Vec2]) -> float:
+    return sum(dist(prev, pos) for prev, pos in zip([start] + path, path))
+
+
+def _timed(nav: Pathing, pairs: list[tuple[Vec2, Vec2]]) -> tuple[list, float]:
+    start_time = time.perf_counter()
+    paths = [nav.calculate(start, goal) for start, goal in pairs]
+    return paths, time.perf_counter() - start_time
+
+
+def main() -> None:
+    pairs_per_map = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    min_dist = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+    gen = random.Random(0)
+    for filename in sorted(glob.glob("maps/evo1/*.yaml")):
+        tilemap = TileMap(filename)
+        if tilemap.nav_nodes or not tilemap.map:
+            continue
+        line_of_sight = functools.partial(tilemap.line_of_sight, radius=_PLAYER_RADIUS)
+        astar, theta = AStar(tilemap.map), ThetaStar(tilemap.map, line_of_sight)
+        pairs = _pairs(astar, pairs_per_map, min_dist, gen)
+        astar_paths, astar_time = _timed(astar, pairs)
+        theta_paths, theta_time = _timed(theta, pairs)
+        astar.line_of_sight = line_of_sight
+        smoothed = [
+            astar.smooth(start, path) for (start, _), path in zip(pairs, astar_paths)
+        ]
+
+        lengths = [0.0, 0.0, 0.0]
+        for (start, goal), astar_path, smooth_path, theta_path in zip(
+            pairs, astar_paths, smoothed, theta_paths
+        ):
+            legs = list(zip([start] + theta_path, theta_path))
+            assert (theta_path[-1] if theta_path else start) == goal, filename
+            assert all(line_of_sight(a, b) for a, b in legs), f"{filename}: {start}"
+            lengths[0] += _length(start, astar_path)
+            lengths[1] += _length(start, smooth_path)
+            lengths[2] += _length(start, theta_path)
+        astar_len, smooth_len, theta_len = (length / len(pairs) for length in lengths)
+        print(
+            f"{tilemap.name:>24}: length AStar {astar_len:6.1f}, smoothed "
+            f"{smooth_len:6.1f}, Theta* {theta_len:6.1f}, "
+            f"{1000 * astar_time / len(pairs):6.2f} -> "
+            f"{1000 * theta_time / len(pairs):6.2f} ms/path"
+        )
+
+
+if __name__ == "__main__":
+    main()
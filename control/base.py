@@ -123,8 +123,12 @@ class VgTranslator:
         self.gamepad.update()
 
 
-_controller = VgTranslator()
+_controller = None
 
 
 def handle():
+    # Created on first use, so importing control doesn't plug in a gamepad
+    global _controller
+    if _controller is None:
+        _controller = VgTranslator()
     return _controller
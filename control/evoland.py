@@ -126,8 +126,12 @@ class EvolandController:
             wait_frames(self.delay)
 
 
-_controller = EvolandController(delay=4)
+_controller = None
 
 
 def evo_ctrl():
+    # Created on first use, so importing control doesn't plug in a gamepad
+    global _controller
+    if _controller is None:
+        _controller = EvolandController(delay=4)
     return _controller
@@ -63,7 +63,14 @@ class MenuController:
         self.set_button(x_key=Buttons.CANCEL, value=0)
 
 
-_menu_ctrl = MenuController()
+_menu_ctrl = None
+
+
+def _menu_handle() -> MenuController:
+    global _menu_ctrl
+    if _menu_ctrl is None:
+        _menu_ctrl = MenuController()
+    return _menu_ctrl
 
 
 class SeqMenuConfirm(SeqBase):
@@ -71,7 +78,7 @@ class SeqMenuConfirm(SeqBase):
         super().__init__(name)
 
     def execute(self, delta: float) -> bool:
-        _menu_ctrl.confirm()
+        _menu_handle().confirm()
         return True
 
 
@@ -80,7 +87,7 @@ class SeqMenuDown(SeqBase):
         super().__init__(name)
 
     def execute(self, delta: float) -> bool:
-        _menu_ctrl.dpad.tap_down()
+        _menu_handle().dpad.tap_down()
         return True
 
 
@@ -95,5 +102,5 @@ class SeqLoadGame(SeqBase):
     # Navigate to the saveslot in question by tapping down x times
     def execute(self, delta: float) -> bool:
         for _ in range(1, self.saveslot):
-            _menu_ctrl.dpad.tap_down()
+            _menu_handle().dpad.tap_down()
         return True
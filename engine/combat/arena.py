@@ -36,7 +36,11 @@ class SeqArenaCombat(SeqCombat):
     def try_move_into_position_and_attack(self, target: GameEntity2D) -> bool:
         # Find all the ways that the knight is vulnerable
         attack_vectors = self._get_attack_vectors(target=target)
-        # TODO: Filter out invalid positions due to pathing (blocked by terrain)
+        # Filter out positions blocked by terrain
+        if tilemap := self.get_tilemap():
+            attack_vectors = [
+                wp for wp in attack_vectors if tilemap.is_passable(wp.x, wp.y)
+            ]
         # Filter out threatened positions so we don't walk into another enemy
         for enemy in self.plan.targets:
             # For each enemy get a hitbox around them
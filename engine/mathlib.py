@@ -95,6 +95,17 @@ def is_close(a: Vec2, b: Vec2, precision: float) -> bool:
     return dist(a, b) <= precision
 
 
+# Distance from point to the closest point of the segment from a to b
+def dist_to_segment(point: Vec2, a: Vec2, b: Vec2) -> float:
+    dx, dy = b.x - a.x, b.y - a.y
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return dist(point, a)
+    t = ((point.x - a.x) * dx + (point.y - a.y) * dy) / length_sq
+    t = min(max(t, 0.0), 1.0)
+    return dist(point, Vec2(a.x + t * dx, a.y + t * dy))
+
+
 def find_closest_point(origin: Vec2, points: list[Vec2]) -> Vec2:
     closest_point = None
     closest_dist = 999
@@ -5,6 +5,7 @@ from typing import Callable, Optional
 
 from control import evo_ctrl
 from engine.mathlib import Facing, Vec2, angle_between, is_close
+from engine.pathing import NavMesh
 from engine.seq import SeqBase, SeqDelay
 from term.window import SubWindow, WindowLayout
 
@@ -223,9 +224,13 @@ class SeqSection2D(SeqBase):
             center = mem.player.pos
             # Render map
             window.map.write_centered(0, tilemap.name)
-            for i, line in enumerate(tilemap.tiles):
+            # Only the tiles that fit in the window around the player
+            size = window.map.size
+            top = max(int(center.y - tilemap.origin.y) - size.y // 2 - 1, 0)
+            left = max(int(center.x - tilemap.origin.x) - size.x // 2 - 1, 0)
+            for i, line in enumerate(tilemap.tiles[top : top + size.y + 2], start=top):
                 y_pos = i + tilemap.origin.y
-                for j, tile in enumerate(line):
+                for j, tile in enumerate(line[left : left + size.x + 2], start=left):
                     x_pos = j + tilemap.origin.x
                     draw_pos = Vec2(x_pos, y_pos) - center
                     self._print_ch_in_map(window.map, pos=draw_pos, ch=tile)
@@ -258,16 +263,44 @@ class SeqMove2D(SeqSection2D):
         func=None,
         emergency_skip: Optional[Callable[[], bool]] = None,
         invert: bool = False,
+        nav: Optional[NavMesh] = None,
     ):
         self.step = 0
         self.coords = coords
         self.precision = precision
         self.emergency_skip = emergency_skip
         self.invert = invert
+        # With a navmesh, the path to the last coordinate is planned from wherever the
+        # player is, and planned again when the next checkpoint goes out of sight
+        self.nav = nav
+        self.goal = coords[-1] if coords else None
+        self._planned = False
+        self._origin = Vec2(0, 0)
         super().__init__(name, func=func)
 
     def reset(self) -> None:
         self.step = 0
+        self._planned = False
+
+    def _replan(self, player_pos: Vec2) -> None:
+        if self.nav is None or self.goal is None or self._nav_done():
+            return
+        # The last waypoint reached, or where the path was planned from
+        prev = None
+        if self._planned:
+            prev = self.coords[self.step - 1] if self.step else self._origin
+        try:
+            path = self.nav.replan(
+                player_pos, prev, self.coords[self.step :], self.goal, self.precision
+            )
+        except ValueError:
+            logger.warning(f"No path from {player_pos} to {self.goal}: {self.name}")
+            path = None
+        self._planned = True
+        if path is not None:
+            self.coords = path
+            self.step = 0
+            self._origin = player_pos
 
     def _nav_done(self) -> bool:
         num_coords = len(self.coords)
@@ -286,9 +319,12 @@ class SeqMove2D(SeqSection2D):
         # Move towards target
         if self.step >= len(self.coords):
             return
-        target = self.coords[self.step]
         mem = self.zelda_mem()
         cur_pos = mem.player.pos
+        self._replan(cur_pos)
+        if self._nav_done():
+            return
+        target = self.coords[self.step]
 
         ctrl = evo_ctrl()
         # If arrived, go to next coordinate in the list
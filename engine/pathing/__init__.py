@@ -1,11 +1,21 @@
 from engine.pathing.astar import AStar
 from engine.pathing.base import Pathing
-from engine.pathing.navmesh import NavMesh
+from engine.pathing.cache import load_navmesh, load_tilemap
+from engine.pathing.jps import JumpPointSearch
+from engine.pathing.navmesh import NavMesh, NavTables
+from engine.pathing.path_cache import PathCache
+from engine.pathing.theta_star import ThetaStar
 from engine.pathing.tilemap import TileMap
 
 __all__ = [
     "AStar",
+    "JumpPointSearch",
     "NavMesh",
+    "NavTables",
+    "PathCache",
     "Pathing",
+    "ThetaStar",
     "TileMap",
+    "load_navmesh",
+    "load_tilemap",
 ]
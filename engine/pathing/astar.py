@@ -1,67 +1,38 @@
 from engine.mathlib import Vec2
 from engine.pathing.base import Pathing
 
+_ADJACENT = [Vec2(0, -1), Vec2(1, 0), Vec2(0, 1), Vec2(-1, 0)]  # N, E, S, W
+# Diagonals, with the two adjacent directions that must be free to take them
+_DIAGONALS = [
+    (Vec2(-1, -1), 0, 3),  # NW
+    (Vec2(1, -1), 0, 1),  # NE
+    (Vec2(1, 1), 2, 1),  # SE
+    (Vec2(-1, 1), 2, 3),  # SW
+]
+
 
 # f(n) = g(n) + h(n)
 class AStar(Pathing):
     def _neighbors(
         self, node: Pathing.Node, goal: Vec2, free_move: bool
     ) -> list[Pathing.Node]:
+        passable = self.passable
         # directly adjacent
-        node_n = Pathing.Node(
-            node.pos + Vec2(0, -1), goal=goal, cost=node.cost + 1, parent=node
-        )
-        node_e = Pathing.Node(
-            node.pos + Vec2(1, 0), goal=goal, cost=node.cost + 1, parent=node
-        )
-        node_s = Pathing.Node(
-            node.pos + Vec2(0, 1), goal=goal, cost=node.cost + 1, parent=node
-        )
-        node_w = Pathing.Node(
-            node.pos + Vec2(-1, 0), goal=goal, cost=node.cost + 1, parent=node
-        )
+        free = [node.pos + step in passable for step in _ADJACENT]
         # Ignore nodes that are not traversible
         adjacent = [
-            node for node in [node_n, node_e, node_s, node_w] if node.pos in self.map
+            Pathing.Node(node.pos + step, goal=goal, cost=node.cost + 1, parent=node)
+            for step, is_free in zip(_ADJACENT, free)
+            if is_free
         ]
         # diagonals
         if free_move:
-            node_nw = Pathing.Node(
-                node.pos + Vec2(-1, -1), goal=goal, cost=node.cost + 1.4, parent=node
-            )
-            node_ne = Pathing.Node(
-                node.pos + Vec2(1, -1), goal=goal, cost=node.cost + 1.4, parent=node
-            )
-            node_se = Pathing.Node(
-                node.pos + Vec2(1, 1), goal=goal, cost=node.cost + 1.4, parent=node
-            )
-            node_sw = Pathing.Node(
-                node.pos + Vec2(-1, 1), goal=goal, cost=node.cost + 1.4, parent=node
-            )
             # Ignore nodes that are not traversible
             # Only allow nodes we can easily walk to without hitting stuff in the way (disallow hugging walls)
-            if (
-                node_nw.pos in self.map
-                and node_n.pos in self.map
-                and node_w.pos in self.map
-            ):
-                adjacent.append(node_nw)
-            if (
-                node_ne.pos in self.map
-                and node_n.pos in self.map
-                and node_e.pos in self.map
-            ):
-                adjacent.append(node_ne)
-            if (
-                node_se.pos in self.map
-                and node_s.pos in self.map
-                and node_e.pos in self.map
-            ):
-                adjacent.append(node_se)
-            if (
-                node_sw.pos in self.map
-                and node_s.pos in self.map
-                and node_w.pos in self.map
-            ):
-                adjacent.append(node_sw)
+            for step, side_a, side_b in _DIAGONALS:
+                pos = node.pos + step
+                if free[side_a] and free[side_b] and pos in passable:
+                    adjacent.append(
+                        Pathing.Node(pos, goal=goal, cost=node.cost + 1.4, parent=node)
+                    )
         return adjacent
@@ -1,6 +1,8 @@
-from typing import Optional
+import heapq
+from typing import Callable, Optional
 
 from engine.mathlib import Vec2, dist
+from engine.pathing.path_cache import PathCache
 
 
 # f(n) = g(n) + h(n)
@@ -41,6 +43,14 @@ class Pathing:
 
     def __init__(self, map_nodes: list[Vec2]) -> None:
         self.map = map_nodes
+        # For constant time "is this position traversable" checks
+        self.passable = set(map_nodes)
+        # Paths are looked up in path_cache first, if set. cache_key identifies the map
+        self.path_cache: Optional[PathCache] = None
+        self.cache_key = ""
+        # If set, free move paths are cut down to the waypoints where they turn,
+        # skipping every waypoint in sight of the previous one
+        self.line_of_sight: Optional[Callable[[Vec2, Vec2], bool]] = None
 
     def calculate(
         self,
@@ -49,32 +59,68 @@ class Pathing:
         final_pos: Optional[Vec2] = None,
         free_move: bool = True,
     ) -> list[Vec2]:
-        open_list = [Pathing.Node(start, goal)]
-        closed_list: list[Pathing.Node] = []
-        while open_list:
-            open_list.sort()
-            node = open_list.pop()
+        if self.path_cache is None:
+            return self._plan(start, goal, final_pos, free_move)
+        key = (type(self).__name__, self.cache_key, start, goal, final_pos, free_move)
+        path = self.path_cache.get(key)
+        if path is None:
+            path = self._plan(start, goal, final_pos, free_move)
+            self.path_cache.put(key, path)
+        return path
+
+    def _plan(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        if not free_move or self.line_of_sight is None:
+            return self._search(start, goal, final_pos, free_move)
+        # final_pos is left out of the smoothing, the path still goes by the goal
+        path = self.smooth(start, self._search(start, goal, None, free_move))
+        if final_pos:
+            path.append(final_pos)
+        return path
+
+    def smooth(self, start: Vec2, path: list[Vec2]) -> list[Vec2]:
+        """
+        String pulling: from each waypoint, go straight to the furthest one in sight
+        along the path. The last waypoint is always kept.
+        """
+        if self.line_of_sight is None or len(path) < 2:
+            return list(path)
+        ret = []
+        anchor = start
+        for prev, pos in zip(path, path[1:]):
+            if not self.line_of_sight(anchor, pos):
+                ret.append(prev)
+                anchor = prev
+        ret.append(path[-1])
+        return ret
+
+    def _search(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        # The open list is a heap ordered by f, ties going to the most recently added
+        # node (the order the sorted open list used to have). Every node seen so far,
+        # open or closed, is indexed by position.
+        start_node = Pathing.Node(start, goal)
+        open_heap = [(start_node.f, 0, start_node)]
+        nodes: dict[Vec2, Pathing.Node] = {start: start_node}
+        added = 0
+        while open_heap:
+            node = heapq.heappop(open_heap)[2]
             if node.pos == goal:
                 return node.trace_path(final_pos)
-            # else (goal not reached), add to closed_list list and elaborate
-            closed_list.append(node)
             for neighbor in self._neighbors(node, goal, free_move):
-                if neighbor in closed_list:
-                    self._update_node(node, neighbor, closed_list)
-                elif neighbor in open_list:
-                    self._update_node(node, neighbor, open_list)
-                else:
-                    open_list.append(neighbor)
+                known = nodes.get(neighbor.pos)
+                if known is None:
+                    added += 1
+                    nodes[neighbor.pos] = neighbor
+                    heapq.heappush(open_heap, (neighbor.f, -added, neighbor))
+                elif neighbor.cost < known.cost:
+                    # Only the cost and parent are updated, the node keeps its f
+                    known.cost = neighbor.cost
+                    known.parent = node
         raise ValueError  # No path could be found between start and goal
 
     # OVERRIDE
     def _neighbors(self, node: Node, goal: Vec2, free_move: bool) -> list[Node]:
         return []
-
-    def _update_node(
-        self, cur_node: Node, neighbor: Node, node_list: list[Node]
-    ) -> None:
-        n_idx = node_list.index(neighbor)
-        if neighbor.cost < node_list[n_idx].cost:
-            node_list[n_idx].cost = neighbor.cost
-            node_list[n_idx].parent = cur_node
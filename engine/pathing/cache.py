@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from engine.mathlib import Vec2
+from engine.pathing.navmesh import NavMesh, NavTables, compute_tables
+from engine.pathing.tilemap import TileMap
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached data changes, so that stale cache files get rebuilt
+_CACHE_VERSION = 1
+
+
+def _source_key(filename: str) -> str:
+    # Hash of the map file, its bitmap/tmx file (if any) and the cache version
+    sha = hashlib.sha1(f"tilemap v{_CACHE_VERSION}".encode())
+    stem = os.path.splitext(filename)[0]
+    for path in [filename, f"{stem}.png", f"{stem}.tmx"]:
+        if os.path.exists(path):
+            with open(path, mode="rb") as source:
+                sha.update(source.read())
+    return sha.hexdigest()
+
+
+def _save(tilemap: TileMap, key: str, path: str) -> None:
+    # A json header line, then the tile codes and passability grids
+    header = {
+        "key": key,
+        "name": tilemap.name,
+        "type": tilemap.type,
+        "origin": list(tilemap.origin),
+        "width": tilemap.width,
+        "height": tilemap.height,
+        "ascii": tilemap._ascii,
+        "nav_nodes": [list(node) for node in tilemap.nav_nodes],
+        "nav_edges": tilemap.nav_edges,
+    }
+    # Write then rename, so that an interrupted write never leaves a broken cache
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode="wb") as cache_file:
+        cache_file.write(json.dumps(header).encode() + b"\n")
+        cache_file.write(tilemap._codes)
+        cache_file.write(tilemap._passable)
+    os.replace(tmp_path, path)
+
+
+def _load(path: str, key: str) -> Optional[TileMap]:
+    with open(path, mode="rb") as cache_file:
+        header = json.loads(cache_file.readline())
+        if header.get("key") != key:
+            return None
+        size = header["width"] * header["height"]
+        grids = cache_file.read()
+    if len(grids) != 2 * size:
+        raise ValueError("truncated grids")
+    tilemap = TileMap.__new__(TileMap)
+    tilemap.name = header["name"]
+    tilemap.type = header["type"]
+    tilemap.origin = Vec2(*header["origin"])
+    tilemap.width, tilemap.height = header["width"], header["height"]
+    tilemap._codes = bytearray(grids[:size])
+    tilemap._passable = bytearray(grids[size:])
+    tilemap._ascii = header["ascii"]
+    tilemap.nav_nodes = [Vec2(x=node[0], y=node[1]) for node in header["nav_nodes"]]
+    tilemap.nav_edges = header["nav_edges"]
+    tilemap.source_key = key
+    return tilemap
+
+
+def load_tilemap(filename: str, cache_dir: Optional[str] = None) -> TileMap:
+    """
+    TileMap of the map file, from a binary cache in `cache_dir` if one was saved from
+    the same source files (keyed by their hash). Otherwise the map is decoded from
+    its sources and the cache (re)written.
+    """
+    if cache_dir is None:
+        return TileMap(filename=filename)
+    key = _source_key(filename)
+    name = os.path.splitext(os.path.basename(filename))[0]
+    path = os.path.join(cache_dir, f"{name}.map")
+    if os.path.exists(path):
+        try:
+            if (tilemap := _load(path, key)) is not None:
+                return tilemap
+            logger.debug(f"Map cache {path} is out of date")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Couldn't read map cache {path}: {e}")
+    tilemap = TileMap(filename=filename)
+    tilemap.source_key = key
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save(tilemap, key, path)
+    except OSError as e:
+        logger.warning(f"Couldn't write map cache {path}: {e}")
+    return tilemap
+
+
+def _save_tables(tables: NavTables, key: str, path: str) -> None:
+    header = {"key": key, "nodes": len(tables.dist)}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode="wb") as cache_file:
+        cache_file.write(json.dumps(header).encode() + b"\n")
+        cache_file.write(tables.dist.astype("<f8").tobytes())
+        cache_file.write(tables.next_hop.astype("<i2").tobytes())
+    os.replace(tmp_path, path)
+
+
+def _load_tables(path: str, key: str) -> Optional[NavTables]:
+    with open(path, mode="rb") as cache_file:
+        header = json.loads(cache_file.readline())
+        if header.get("key") != key:
+            return None
+        count = header["nodes"]
+        data = cache_file.read()
+    if len(data) != count * count * 10:
+        raise ValueError("truncated tables")
+    split = count * count * 8
+    return NavTables(
+        dist=np.frombuffer(data[:split], dtype="<f8").reshape(count, count),
+        next_hop=np.frombuffer(data[split:], dtype="<i2").reshape(count, count),
+    )
+
+
+def load_navmesh(
+    tilemap: TileMap, name: str, cache_dir: Optional[str] = None
+) -> NavMesh:
+    """
+    NavMesh of the tilemap's nodes, with its shortest path tables read from
+    `cache_dir/name.nav` if they were saved for the same map files. Nodes are in
+    sight of a position if the tiles between them are passable (maps without tiles
+    don't check).
+    """
+    nodes, edges = tilemap.nav_nodes, tilemap.nav_edges
+    visible = tilemap.line_of_sight if tilemap.width and tilemap.height else None
+    if cache_dir is None or tilemap.source_key is None:
+        return NavMesh(map_nodes=nodes, edges=edges, visible=visible)
+    key = f"navmesh v{_CACHE_VERSION} {tilemap.source_key}"
+    path = os.path.join(cache_dir, f"{name}.nav")
+    if os.path.exists(path):
+        try:
+            if (tables := _load_tables(path, key)) is not None:
+                return NavMesh(
+                    map_nodes=nodes, edges=edges, tables=tables, visible=visible
+                )
+            logger.debug(f"Navmesh cache {path} is out of date")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Couldn't read navmesh cache {path}: {e}")
+    tables = compute_tables(nodes, edges)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_tables(tables, key, path)
+    except OSError as e:
+        logger.warning(f"Couldn't write navmesh cache {path}: {e}")
+    return NavMesh(map_nodes=nodes, edges=edges, tables=tables, visible=visible)
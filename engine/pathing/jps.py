@@ -0,0 +1,181 @@
+import heapq
+from typing import Optional
+
+from engine.mathlib import Vec2
+from engine.pathing.astar import AStar
+
+_DIAGONAL_COST = 1.4  # Same as AStar
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+class JumpPointSearch(AStar):
+    """
+    Jump point search over the tile grid, for the same 8-connected uniform cost
+    grids as AStar. Straight and diagonal runs are followed without queueing the
+    tiles along them, stopping only where a path can turn (jump points), so far
+    fewer nodes are expanded. Diagonal steps need both adjacent tiles free, like
+    AStar. Paths are listed tile by tile like AStar's, and are always shortest
+    paths (AStar's straight line heuristic can miss them by a diagonal or so). Moves
+    without diagonals, or between positions off the grid, use the AStar search.
+    """
+
+    def __init__(self, map_nodes: list[Vec2]) -> None:
+        super().__init__(map_nodes=map_nodes)
+        self._min_x = min((pos.x for pos in map_nodes), default=0)
+        self._min_y = min((pos.y for pos in map_nodes), default=0)
+        width = int(max((pos.x for pos in map_nodes), default=0) - self._min_x) + 1
+        height = int(max((pos.y for pos in map_nodes), default=0) - self._min_y) + 1
+        # Walkable tiles, with a blocked border so that runs never leave the grid
+        self._stride = width + 2
+        self._rows = height + 2
+        self._walk = bytearray(self._stride * self._rows)
+        for pos in map_nodes:
+            if (index := self._cell(pos)) is not None:
+                self._walk[index] = 1
+
+    def _cell(self, pos: Vec2) -> Optional[int]:
+        col, row = pos.x - self._min_x, pos.y - self._min_y
+        if col % 1 or row % 1:
+            return None
+        col, row = int(col) + 1, int(row) + 1
+        if 0 < col < self._stride - 1 and 0 < row < self._rows - 1:
+            return row * self._stride + col
+        return None
+
+    def _pos(self, index: int) -> Vec2:
+        row, col = divmod(index, self._stride)
+        return Vec2(self._min_x + col - 1, self._min_y + row - 1)
+
+    def _heuristic(self, index: int, goal: int) -> float:
+        # Octile distance, exact on an open grid
+        dx = abs(self._col(goal) - self._col(index))
+        dy = abs(self._row(goal) - self._row(index))
+        return _DIAGONAL_COST * min(dx, dy) + abs(dx - dy)
+
+    def _col(self, index: int) -> int:
+        return index % self._stride
+
+    def _row(self, index: int) -> int:
+        return index // self._stride
+
+    def _forced(self, index: int, back: int, side: int) -> bool:
+        # The tile to the side is free, but couldn't be reached from behind
+        walk = self._walk
+        return walk[index + side] and not walk[index - back + side]
+
+    def _jump_straight(self, index: int, step: int, goal: int) -> Optional[int]:
+        walk = self._walk
+        # Sides perpendicular to the run
+        side = self._stride if abs(step) == 1 else 1
+        while True:
+            index += step
+            if not walk[index]:
+                return None
+            if index == goal:
+                return index
+            if self._forced(index, step, side) or self._forced(index, step, -side):
+                return index
+
+    def _jump(self, index: int, dx: int, dy: int, goal: int) -> Optional[int]:
+        walk, stride = self._walk, self._stride
+        if not dy:
+            return self._jump_straight(index, dx, goal)
+        if not dx:
+            return self._jump_straight(index, dy * stride, goal)
+        step_x, step_y = dx, dy * stride
+        while True:
+            # No corner cutting, both adjacent tiles have to be free
+            if not (walk[index + step_x] and walk[index + step_y]):
+                return None
+            index += step_x + step_y
+            if not walk[index]:
+                return None
+            if index == goal:
+                return index
+            # A straight run from here leads somewhere the diagonal can't
+            if (
+                self._jump_straight(index, step_x, goal) is not None
+                or self._jump_straight(index, step_y, goal) is not None
+            ):
+                return index
+
+    def _directions(self, index: int, parent: Optional[int]) -> list[tuple[int, int]]:
+        if parent is None:
+            return [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        dx = _sign(self._col(index) - self._col(parent))
+        dy = _sign(self._row(index) - self._row(parent))
+        if dx and dy:
+            return [(dx, 0), (0, dy), (dx, dy)]
+        stride = self._stride
+        ret = [(dx, dy)]
+        # Turns are only needed where an obstacle behind blocks the diagonal
+        if dx:
+            for side in (-1, 1):
+                if self._forced(index, dx, side * stride):
+                    ret += [(0, side), (dx, side)]
+        else:
+            for side in (-1, 1):
+                if self._forced(index, dy * stride, side):
+                    ret += [(side, 0), (side, dy)]
+        return ret
+
+    def _trace(self, parents: dict[int, Optional[int]], index: int) -> list[Vec2]:
+        # Jump points back to the start, then every tile between them
+        jump_points = []
+        while index is not None:
+            jump_points.append(index)
+            index = parents[index]
+        jump_points.reverse()
+        ret = []
+        for start, end in zip(jump_points, jump_points[1:]):
+            dx = _sign(self._col(end) - self._col(start))
+            dy = _sign(self._row(end) - self._row(start))
+            step = dx + dy * self._stride
+            index = start
+            while index != end:
+                index += step
+                ret.append(self._pos(index))
+        return ret
+
+    def _search(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        start_index, goal_index = self._cell(start), self._cell(goal)
+        if not free_move or start_index is None or goal_index is None:
+            return super()._search(start, goal, final_pos, free_move)
+        if not self._walk[goal_index]:
+            raise ValueError  # No path could be found between start and goal
+        costs = {start_index: 0.0}
+        parents: dict[int, Optional[int]] = {start_index: None}
+        open_heap = [(self._heuristic(start_index, goal_index), 0, start_index)]
+        closed = set()
+        added = 0
+        while open_heap:
+            index = heapq.heappop(open_heap)[2]
+            if index in closed:
+                continue
+            if index == goal_index:
+                path = self._trace(parents, index)
+                if final_pos:
+                    path.append(final_pos)
+                return path
+            closed.add(index)
+            for dx, dy in self._directions(index, parents[index]):
+                jump_point = self._jump(index, dx, dy, goal_index)
+                if jump_point is None or jump_point in closed:
+                    continue
+                steps = max(
+                    abs(self._col(jump_point) - self._col(index)),
+                    abs(self._row(jump_point) - self._row(index)),
+                )
+                cost = costs[index] + steps * (_DIAGONAL_COST if dx and dy else 1)
+                if cost < costs.get(jump_point, float("inf")):
+                    costs[jump_point] = cost
+                    parents[jump_point] = index
+                    added += 1
+                    f = cost + self._heuristic(jump_point, goal_index)
+                    heapq.heappush(open_heap, (f, added, jump_point))
+        raise ValueError  # No path could be found between start and goal
@@ -1,20 +1,179 @@
-from engine.mathlib import Vec2, dist
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from engine.mathlib import Vec2, dist, dist_to_segment, is_close
 from engine.pathing.base import Pathing
+from engine.pathing.spatial import NodeGrid
 
 Edges = list[int]
 
 
+class NavTables(NamedTuple):
+    """All-pairs shortest paths of a navmesh, by node index."""
+
+    dist: np.ndarray  # float64, inf if there is no path
+    next_hop: np.ndarray  # int16, next node on the way to the goal, -1 if no path
+
+
+def compute_tables(map_nodes: list[Vec2], edges: list[Edges]) -> NavTables:
+    """Floyd-Warshall over the navmesh graph."""
+    count = len(map_nodes)
+    costs = np.full((count, count), np.inf)
+    next_hop = np.full((count, count), -1, dtype=np.int16)
+    for i, targets in enumerate(edges):
+        for j in targets:
+            cost = dist(map_nodes[i], map_nodes[j])
+            if cost < costs[i, j]:
+                costs[i, j] = cost
+                next_hop[i, j] = j
+    np.fill_diagonal(costs, 0.0)
+    np.fill_diagonal(next_hop, np.arange(count))
+    for k in range(count):
+        # Row and column k don't change while going through k
+        via = costs[:, k : k + 1] + costs[k : k + 1, :]
+        shorter = via < costs
+        costs = np.where(shorter, via, costs)
+        next_hop = np.where(shorter, next_hop[:, k : k + 1], next_hop)
+    return NavTables(dist=costs, next_hop=next_hop.astype(np.int16))
+
+
 # f(n) = g(n) + h(n)
 class NavMesh(Pathing):
-    def __init__(self, map_nodes: list[Vec2], edges: list[Edges]) -> None:
+    """
+    Navmesh graph. Shortest paths between every pair of nodes are precomputed, so
+    paths between nodes are walked from the next hop table. Positions that are
+    not nodes are snapped to the nearest node in sight (`visible`, usually the line
+    of sight on the tilemap, every node is in sight without it).
+    """
+
+    def __init__(
+        self,
+        map_nodes: list[Vec2],
+        edges: list[Edges],
+        tables: Optional[NavTables] = None,
+        visible: Optional[Callable[[Vec2, Vec2], bool]] = None,
+    ) -> None:
         super().__init__(map_nodes=map_nodes)
         self.edges = edges
         assert len(map_nodes) == len(edges)
+        # Index of each node (the first one, should a position appear twice)
+        self.node_index: dict[Vec2, int] = {}
+        for i, pos in enumerate(map_nodes):
+            self.node_index.setdefault(pos, i)
+        self.tables = tables if tables is not None else compute_tables(map_nodes, edges)
+        self.visible = visible
+        self.node_grid = NodeGrid(map_nodes)
+        self._node_xy = np.array(map_nodes, dtype=np.float64).reshape(-1, 2)
+
+    def visible_from(self, a: Vec2, b: Vec2) -> bool:
+        return self.visible is None or self.visible(a, b)
+
+    def nearest_node(self, pos: Vec2) -> Optional[int]:
+        """Index of the closest node in sight of pos, or of the closest node."""
+        if (index := self.node_index.get(pos)) is not None:
+            return index
+        if self.visible is not None:
+            index = self.node_grid.nearest(
+                pos, accept=lambda i: self.visible(pos, self.map[i])
+            )
+            if index is not None:
+                return index
+        return self.node_grid.nearest(pos)
+
+    def entry_node(self, pos: Vec2, goal_index: int) -> Optional[int]:
+        """
+        Index of the node in sight of pos with the shortest way to the goal node
+        through it, so that the path doesn't go back to a node already passed.
+        """
+        if (index := self.node_index.get(pos)) is not None:
+            return index
+        offsets = self._node_xy - (pos.x, pos.y)
+        costs = np.hypot(offsets[:, 0], offsets[:, 1]) + self.tables.dist[:, goal_index]
+        for index in np.argsort(costs, kind="stable"):
+            if not np.isfinite(costs[index]):
+                break  # No way to the goal from the rest
+            if self.visible_from(pos, self.map[index]):
+                return int(index)
+        return self.nearest_node(pos)
+
+    def path_from(
+        self, pos: Vec2, goal: Vec2, final_pos: Optional[Vec2] = None
+    ) -> list[Vec2]:
+        """
+        Path from any position to any goal: from the node in sight with the shortest
+        way to the goal, to the node nearest the goal. Cheap enough to replan on
+        every frame, so it skips the path cache.
+        """
+        goal_index = self.nearest_node(goal)
+        if goal_index is None:
+            raise ValueError  # Empty navmesh
+        index = self.entry_node(pos, goal_index)
+        ret = [] if self.map[index] == pos else [self.map[index]]
+        ret.extend(self._walk(index, goal_index))
+        if self.map[goal_index] != goal:
+            ret.append(goal)
+        if final_pos:
+            ret.append(final_pos)
+        return ret
+
+    # Players pushed further than this off the path they follow get a new one
+    OFF_PATH_DISTANCE = 1.0
+
+    def replan(
+        self,
+        pos: Vec2,
+        prev: Optional[Vec2],
+        path: list[Vec2],
+        goal: Vec2,
+        precision: float,
+    ) -> Optional[list[Vec2]]:
+        """
+        New path to the goal for a player at pos following `path` (the waypoints
+        left) from `prev` (the last waypoint reached, None to plan from scratch).
+        None if the player should keep following the path. The edges of the navmesh
+        are placed by hand and traversable even where their ends aren't in sight,
+        so the path is only replaced once the player is pushed off it and can't see
+        the next waypoint. Waypoints already within precision are left out.
+        """
+        if prev is not None and path:
+            if dist_to_segment(pos, prev, path[0]) <= self.OFF_PATH_DISTANCE:
+                return None
+            if self.visible_from(pos, path[0]):
+                return None
+        new_path = self.path_from(pos, goal)
+        while new_path and is_close(pos, new_path[0], precision):
+            new_path.pop(0)
+        # Planning the same path again would restart it from its first waypoint
+        if prev is not None and new_path == path:
+            return None
+        return new_path
+
+    def _walk(self, index: int, goal_index: int) -> list[Vec2]:
+        next_hop = self.tables.next_hop
+        if next_hop[index, goal_index] < 0:
+            raise ValueError  # No path could be found between start and goal
+        ret = []
+        while index != goal_index:
+            index = int(next_hop[index, goal_index])
+            ret.append(self.map[index])
+        return ret
+
+    def _search(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        index, goal_index = self.node_index.get(start), self.node_index.get(goal)
+        if index is None or goal_index is None:
+            return self.path_from(start, goal, final_pos)
+        ret = self._walk(index, goal_index)
+        if final_pos:
+            ret.append(final_pos)
+        return ret
 
     def _neighbors(
         self, node: Pathing.Node, goal: Vec2, free_move: bool = False
     ) -> list[Pathing.Node]:
-        index = self.map.index(node.pos)
+        index = self.node_index[node.pos]
         ret = []
         for node_idx in self.edges[index]:
             target = self.map[node_idx]
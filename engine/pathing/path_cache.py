@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from engine.mathlib import Vec2
+
+logger = logging.getLogger(__name__)
+
+# (pathing algorithm, map hash, start, goal, final_pos, free_move)
+PathKey = tuple[str, str, Vec2, Vec2, Optional[Vec2], bool]
+
+
+class PathCache:
+    """
+    Paths already calculated, so that routes don't run the same searches on every
+    launch. The most recently used `max_entries` paths are kept in memory, and can be
+    saved to and loaded from a json file. The file is ignored when its version
+    differs, bump VERSION whenever the pathing results change.
+    """
+
+    VERSION = 2
+
+    def __init__(self, filename: Optional[str] = None, max_entries: int = 4096) -> None:
+        self.filename = filename
+        self.max_entries = max_entries
+        self._paths: OrderedDict[PathKey, tuple[Vec2, ...]] = OrderedDict()
+        self._loaded = filename is None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def get(self, key: PathKey) -> Optional[list[Vec2]]:
+        if not self._loaded:
+            self.load()
+        path = self._paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths.move_to_end(key)
+        return list(path)
+
+    def put(self, key: PathKey, path: list[Vec2]) -> None:
+        if not self._loaded:
+            self.load()
+        self._paths[key] = tuple(path)
+        self._paths.move_to_end(key)
+        while len(self._paths) > self.max_entries:
+            self._paths.popitem(last=False)
+        self._dirty = True
+
+    def load(self) -> None:
+        self._loaded = True
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, mode="r") as cache_file:
+                data = json.load(cache_file)
+            if data.get("version") != self.VERSION:
+                logger.info(f"Path cache {self.filename} is out of date, ignoring it")
+                return
+            for algo, map_key, start, goal, final_pos, free_move, path in data["paths"]:
+                key = (
+                    algo,
+                    map_key,
+                    Vec2(*start),
+                    Vec2(*goal),
+                    Vec2(*final_pos) if final_pos is not None else None,
+                    free_move,
+                )
+                # Saved from least to most recently used
+                self._paths[key] = tuple(Vec2(*pos) for pos in path)
+            while len(self._paths) > self.max_entries:
+                self._paths.popitem(last=False)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Couldn't read path cache {self.filename}: {e}")
+
+    def save(self) -> None:
+        """Write the paths to the cache file, if any were added."""
+        if self.filename is None or not self._dirty:
+            return
+        data = {
+            "version": self.VERSION,
+            "paths": [
+                [algo, map_key, start, goal, final_pos, free_move, path]
+                for (algo, map_key, start, goal, final_pos, free_move), path in (
+                    self._paths.items()
+                )
+            ],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+            # Write then rename, so that an interrupted write never leaves a broken cache
+            tmp_filename = f"{self.filename}.tmp"
+            with open(tmp_filename, mode="w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_filename, self.filename)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Couldn't write path cache {self.filename}: {e}")
@@ -0,0 +1,81 @@
+import heapq
+import math
+from typing import Callable, Optional
+
+from engine.mathlib import Vec2, dist
+
+
+class NodeGrid:
+    """
+    Uniform grid hash over a list of points, for nearest point queries. Cells are
+    searched in square rings around the query position, so a query only looks at the
+    points close to it.
+    """
+
+    def __init__(self, points: list[Vec2], cell_size: Optional[float] = None) -> None:
+        self.points = points
+        if cell_size is None:
+            # About two points per cell over the bounding box
+            width = max((p.x for p in points), default=0) - min(
+                (p.x for p in points), default=0
+            )
+            height = max((p.y for p in points), default=0) - min(
+                (p.y for p in points), default=0
+            )
+            cell_size = math.sqrt(2 * max(width * height, 1) / max(len(points), 1))
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i, point in enumerate(points):
+            self.cells.setdefault(self._cell(point), []).append(i)
+        cols = [cell[0] for cell in self.cells] or [0]
+        rows = [cell[1] for cell in self.cells] or [0]
+        self._bounds = (min(cols), min(rows), max(cols), max(rows))
+
+    def _cell(self, pos: Vec2) -> tuple[int, int]:
+        return math.floor(pos.x / self.cell_size), math.floor(pos.y / self.cell_size)
+
+    def _ring(self, center: tuple[int, int], radius: int) -> list[int]:
+        # Points in the cells at Chebyshev distance `radius` from the center cell
+        cx, cy = center
+        if radius == 0:
+            return self.cells.get(center, [])
+        ret = []
+        for x in range(cx - radius, cx + radius + 1):
+            ret.extend(self.cells.get((x, cy - radius), []))
+            ret.extend(self.cells.get((x, cy + radius), []))
+        for y in range(cy - radius + 1, cy + radius):
+            ret.extend(self.cells.get((cx - radius, y), []))
+            ret.extend(self.cells.get((cx + radius, y), []))
+        return ret
+
+    def nearest(
+        self, pos: Vec2, accept: Optional[Callable[[int], bool]] = None
+    ) -> Optional[int]:
+        """
+        Index of the point closest to pos for which accept(index) is True (any point
+        if accept isn't given). None if there is no such point.
+        """
+        center = self._cell(pos)
+        min_col, min_row, max_col, max_row = self._bounds
+        # Past this ring, every cell is out of the grid
+        max_radius = max(
+            center[0] - min_col,
+            max_col - center[0],
+            center[1] - min_row,
+            max_row - center[1],
+        )
+        candidates: list[tuple[float, int]] = []
+        for radius in range(max_radius + 1):
+            for i in self._ring(center, radius):
+                heapq.heappush(candidates, (dist(pos, self.points[i]), i))
+            # Points of the next rings are at least this far from pos
+            bound = radius * self.cell_size
+            while candidates and candidates[0][0] <= bound:
+                i = heapq.heappop(candidates)[1]
+                if accept is None or accept(i):
+                    return i
+        while candidates:
+            i = heapq.heappop(candidates)[1]
+            if accept is None or accept(i):
+                return i
+        return None
@@ -0,0 +1,88 @@
+import heapq
+import math
+from typing import Callable, Optional
+
+from engine.mathlib import Vec2, dist
+from engine.pathing.astar import _ADJACENT, _DIAGONALS, AStar
+
+
+class ThetaStar(AStar):
+    """
+    Lazy Theta* over the tile grid: A* over the same 8-connected tiles, where a tile
+    can be reached in a straight line from any earlier tile in sight instead of
+    only from a neighbor. Paths go at any angle and only list the tiles where they
+    turn. Sight is checked with line_of_sight, lazily when a tile is expanded.
+    Without line_of_sight, or for moves without diagonals, this is the AStar search.
+    """
+
+    def __init__(
+        self,
+        map_nodes: list[Vec2],
+        line_of_sight: Optional[Callable[[Vec2, Vec2], bool]] = None,
+    ) -> None:
+        super().__init__(map_nodes=map_nodes)
+        self.line_of_sight = line_of_sight
+
+    def _tiles_around(self, pos: Vec2) -> list[Vec2]:
+        # Neighboring tiles, diagonals only past free corners (like AStar)
+        passable = self.passable
+        free = [pos + step in passable for step in _ADJACENT]
+        ret = [pos + step for step, is_free in zip(_ADJACENT, free) if is_free]
+        for step, side_a, side_b in _DIAGONALS:
+            target = pos + step
+            if free[side_a] and free[side_b] and target in passable:
+                ret.append(target)
+        return ret
+
+    def _search(
+        self, start: Vec2, goal: Vec2, final_pos: Optional[Vec2], free_move: bool
+    ) -> list[Vec2]:
+        line_of_sight = self.line_of_sight
+        if not free_move or line_of_sight is None:
+            return super()._search(start, goal, final_pos, free_move)
+        costs = {start: 0.0}
+        parents = {start: start}
+        open_heap = [(dist(start, goal), 0, start)]
+        closed = set()
+        added = 0
+        while open_heap:
+            pos = heapq.heappop(open_heap)[2]
+            if pos in closed:
+                continue
+            parent = parents[pos]
+            if parent != pos and not line_of_sight(parent, pos):
+                # Not in sight after all, come from the best expanded neighbor
+                neighbors = [tile for tile in self._tiles_around(pos) if tile in closed]
+                # The start may not be a tile, then it's only next to this one
+                costs[pos], parents[pos] = min(
+                    (costs[neighbor] + dist(neighbor, pos), neighbor)
+                    for neighbor in neighbors or [start]
+                )
+                parent = parents[pos]
+            if pos == goal:
+                return self._trace(parents, pos, final_pos)
+            closed.add(pos)
+            for neighbor in self._tiles_around(pos):
+                if neighbor in closed:
+                    continue
+                # Straight from the parent, sight is checked once it is expanded
+                cost = costs[parent] + dist(parent, neighbor)
+                if cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = cost
+                    parents[neighbor] = parent
+                    added += 1
+                    f = cost + dist(neighbor, goal)
+                    heapq.heappush(open_heap, (f, added, neighbor))
+        raise ValueError  # No path could be found between start and goal
+
+    def _trace(
+        self, parents: dict[Vec2, Vec2], pos: Vec2, final_pos: Optional[Vec2]
+    ) -> list[Vec2]:
+        ret = []
+        while parents[pos] != pos:
+            ret.append(pos)
+            pos = parents[pos]
+        ret.reverse()
+        if final_pos:
+            ret.append(final_pos)
+        return ret
@@ -1,8 +1,15 @@
+import base64
+import gzip
 import logging
+import math
 import os
+import xml.etree.ElementTree as ElementTree
+import zlib
 from enum import Enum
+from functools import cached_property
+from typing import Optional
 
-import tmx
+import numpy as np
 import yaml
 from PIL import Image
 
@@ -23,8 +30,13 @@ class TileMap:
         self.type = map_data.get("type", "ascii")
         origin_vec = map_data.get("origin", [0, 0])
         self.origin = Vec2(origin_vec[0], origin_vec[1])
-        # Map consists of a list of traversible nodes. Nodes are connected NWSE
-        self.map = []  # Map, as a set of Vec2 nodes
+        # Dense grid of tile types, one byte per tile (index in TILE_TYPES), row by row.
+        # Tile (0, 0) of the grid is at the origin
+        self.width, self.height = 0, 0
+        self._codes = bytearray()
+        self._passable = bytearray()  # 1 for traversible tiles
+        self._ascii: Optional[list[str]] = None  # ascii maps keep their source
+        self.source_key: Optional[str] = None  # hash of the map files, if known
         match self.type:
             case "ascii":
                 self._load_ascii(map_data=map_data)
@@ -39,33 +51,180 @@ class TileMap:
         self.nav_nodes = [Vec2(x=node[0], y=node[1]) for node in nodes]
         self.nav_edges = map_data.get("edges", [])
 
+    def _init_grid(self, codes: np.ndarray, trees_passable: bool = False) -> None:
+        self.height, self.width = codes.shape
+        self._codes = bytearray(codes.astype(np.uint8).tobytes())
+        lut = np.array(
+            [self._is_passable(tile, trees_passable) for tile in self.TILE_TYPES],
+            dtype=np.uint8,
+        )
+        self._passable = bytearray(lut[codes].tobytes())
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Tile type codes (indexes in TILE_TYPES), as a height x width array."""
+        return np.frombuffer(self._codes, dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+
+    def _index(self, x: float, y: float) -> Optional[int]:
+        # Tiles are centered on integer coordinates (the positions pathing walks through)
+        col = math.floor(x - self.origin.x + 0.5)
+        row = math.floor(y - self.origin.y + 0.5)
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return row * self.width + col
+        return None
+
+    def is_passable(self, x: float, y: float) -> bool:
+        index = self._index(x, y)
+        return index is not None and self._passable[index] != 0
+
+    def _passable_cell(self, col: int, row: int) -> bool:
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self._passable[row * self.width + col] != 0
+        return False
+
+    def line_of_sight(self, a: Vec2, b: Vec2, radius: float = 0.0) -> bool:
+        """
+        True if every tile crossed by the segment from a to b is passable. The
+        segment can't slip between two blocked tiles through their shared corner.
+        With a radius (up to half a tile), the segment is as wide as 2 * radius.
+        """
+        if not radius or a == b:
+            return self._ray(a, b)
+        # The center and both edges of the band, no tile fits between them
+        offset = Vec2(a.y - b.y, b.x - a.x).normalized * radius
+        return (
+            self._ray(a, b)
+            and self._ray(a + offset, b + offset)
+            and self._ray(a - offset, b - offset)
+        )
+
+    def _ray(self, a: Vec2, b: Vec2) -> bool:
+        # Grid coordinates, tile (col, row) covers [col, col + 1) x [row, row + 1)
+        x0, y0 = a.x - self.origin.x + 0.5, a.y - self.origin.y + 0.5
+        x1, y1 = b.x - self.origin.x + 0.5, b.y - self.origin.y + 0.5
+        col, row = math.floor(x0), math.floor(y0)
+        end_col, end_row = math.floor(x1), math.floor(y1)
+        dx, dy = x1 - x0, y1 - y0
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        # Distance along the segment (0 to 1) to cross a tile, and to the next edge
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+        next_x = (
+            ((col + 1 - x0) if dx > 0 else (x0 - col)) * delta_x if dx else math.inf
+        )
+        next_y = (
+            ((row + 1 - y0) if dy > 0 else (y0 - row)) * delta_y if dy else math.inf
+        )
+        steps = abs(end_col - col) + abs(end_row - row)
+        while steps > 0:
+            if not self._passable_cell(col, row):
+                return False
+            if next_x < next_y:
+                col += step_col
+                next_x += delta_x
+                steps -= 1
+            elif next_y < next_x:
+                row += step_row
+                next_y += delta_y
+                steps -= 1
+            else:
+                # Through a corner, both tiles next to it have to be free
+                if not self._passable_cell(
+                    col + step_col, row
+                ) or not self._passable_cell(col, row + step_row):
+                    return False
+                col += step_col
+                row += step_row
+                next_x += delta_x
+                next_y += delta_y
+                steps -= 2
+        return self._passable_cell(col, row)
+
+    def tile_at(self, x: float, y: float) -> Optional["TileMap.BitmapTile"]:
+        index = self._index(x, y)
+        return None if index is None else self.TILE_TYPES[self._codes[index]]
+
+    def __contains__(self, pos: Vec2) -> bool:
+        # Exact tile positions only, same as `pos in self.map`
+        if (pos.x - self.origin.x) % 1 or (pos.y - self.origin.y) % 1:
+            return False
+        return self.is_passable(pos.x, pos.y)
+
+    @cached_property
+    def map(self) -> list[Vec2]:
+        """Traversible tiles, row by row. Nodes are connected NWSE."""
+        rows, cols = np.nonzero(
+            np.frombuffer(self._passable, dtype=np.uint8).reshape(
+                self.height, self.width
+            )
+        )
+        xs = (cols + self.origin.x).tolist()
+        ys = (rows + self.origin.y).tolist()
+        return list(map(Vec2, xs, ys))
+
+    @cached_property
+    def tiles(self) -> list[str]:
+        """ascii representation of the map, as array of strings."""
+        if self._ascii is not None:
+            return self._ascii
+        chars = np.array([self.TileToAscii.get(tile, ".") for tile in self.TILE_TYPES])
+        return ["".join(row) for row in chars[self.grid]]
+
     def _load_ascii(self, map_data: dict) -> None:
-        # ascii representation of map, as array of strings
-        self.tiles = map_data.get("tiles", [])
-        for i, line in enumerate(self.tiles):
-            y_pos = i + self.origin.y
+        self._ascii = map_data.get("tiles", [])
+        width = max((len(line) for line in self._ascii), default=0)
+        codes = np.full(
+            (len(self._ascii), width), self.TILE_CODES[self.BitmapTile.EMPTY]
+        )
+        for i, line in enumerate(self._ascii):
             for j, tile in enumerate(line):
                 if tile == ".":
-                    x_pos = j + self.origin.x
-                    self.map.append(Vec2(x_pos, y_pos))
+                    codes[i, j] = self.TILE_CODES[self.BitmapTile.PASSABLE]
+                elif tile != " ":
+                    codes[i, j] = self.TILE_CODES[self.BitmapTile.WALLS]
+        self._init_grid(codes)
 
     def _load_tmx(self, filename: str, map_data: dict) -> None:
-        # self.map.append()
-        tilemap: tmx.TileMap = tmx.TileMap.load(fname=filename)
-        width, height = tilemap.width, tilemap.height
-        self.tiles = ["" for _ in range(height)]
+        root = ElementTree.parse(filename).getroot()
+        width, height = int(root.get("width")), int(root.get("height"))
         logger.debug(f"Map bitmap {filename} dims: {width} x {height}")
-        layer: tmx.Layer
-        for layer in tilemap.layers_list:
-            if layer.name != "collide":
+        # Only the collide layer counts, tiles are empty without one
+        codes = np.full((height, width), self.TILE_CODES[self.BitmapTile.EMPTY])
+        for layer in root.iter("layer"):
+            if layer.get("name") != "collide":
                 continue
-            tile: tmx.LayerTile
-            for i, tile in enumerate(layer.tiles):
-                x_pos, y_pos = i % width, i // width
-                wall = tile.gid != 0
-                self.tiles[y_pos] += "#" if wall else "."
-                if not wall:
-                    self.map.append(Vec2(x_pos, y_pos))
+            gids = self._tmx_gids(layer.find("data")).reshape(height, width)
+            codes = np.where(
+                gids != 0,
+                self.TILE_CODES[self.BitmapTile.WALLS],
+                self.TILE_CODES[self.BitmapTile.PASSABLE],
+            )
+        self._init_grid(codes)
+
+    @staticmethod
+    def _tmx_gids(data: ElementTree.Element) -> np.ndarray:
+        # Tile ids of a layer, without the flip flags in the top bits
+        match data.get("encoding"), data.get("compression"):
+            case "csv", _:
+                gids = np.array(data.text.replace(",", " ").split(), dtype=np.uint32)
+            case "base64", compression:
+                raw = base64.b64decode(data.text.strip())
+                match compression:
+                    case "zlib":
+                        raw = zlib.decompress(raw)
+                    case "gzip":
+                        raw = gzip.decompress(raw)
+                    case None:
+                        pass
+                    case _:
+                        raise ValueError(f"Unsupported tmx compression {compression}")
+                gids = np.frombuffer(raw, dtype="<u4")
+            case encoding, _:
+                raise ValueError(f"Unsupported tmx encoding {encoding}")
+        return gids & 0x1FFFFFFF
 
     class BitmapTile(Enum):
         # Impassable terrain
@@ -152,11 +311,14 @@ class TileMap:
         # Default: '.'
     }
 
-    def _get_rgb_hex(self, pixel: list[int]) -> int:
-        red = int(pixel[0]) & 0xFF
-        green = int(pixel[1]) & 0xFF
-        blue = int(pixel[2]) & 0xFF
-        return (red << 16) | (green << 8) | blue
+    TILE_TYPES = list(BitmapTile)
+    TILE_CODES = {tile: code for code, tile in enumerate(BitmapTile)}
+
+    # Colors of the bitmap tiles, sorted, and their tile codes
+    _COLOR_CODES = np.argsort([tile.value for tile in BitmapTile]).astype(np.uint8)
+    _COLORS = np.array([tile.value for tile in BitmapTile], dtype=np.uint32)[
+        _COLOR_CODES
+    ]
 
     def _is_passable(self, tile: BitmapTile, trees_passable: bool) -> bool:
         match tile:
@@ -167,24 +329,23 @@ class TileMap:
         return True
 
     def _load_bitmap(self, filename: str, map_data: dict) -> None:
-        self.tiles = []
         trees_passable = map_data.get("trees_passable", False)
         bitmap = Image.open(filename)
         if bitmap.mode != "RGB":
             bitmap = bitmap.convert("RGB")
         width, height = bitmap.size[0], bitmap.size[1]
         logger.debug(f"Map bitmap {filename} dims: {width} x {height}")
-        for y_pos in range(height):
-            self.tiles.append("")  # Append new empty line
-            for x_pos in range(width):
-                coord = x_pos, y_pos
-                rgb = self._get_rgb_hex(bitmap.getpixel(coord))
-                tile = self.BitmapTile(rgb)
-                # Fill out ascii tile
-                self.tiles[y_pos] += self.TileToAscii.get(tile, ".")
-                # Add passable nodes to AStar map
-                if self._is_passable(tile, trees_passable):
-                    self.map.append(Vec2(x_pos, y_pos))
+        # 24-bit colors, looked up in the sorted tile colors
+        pixels = np.asarray(bitmap, dtype=np.uint32)
+        rgb = (pixels[:, :, 0] << 16) | (pixels[:, :, 1] << 8) | pixels[:, :, 2]
+        index = np.minimum(np.searchsorted(self._COLORS, rgb), len(self._COLORS) - 1)
+        # Unknown colors are passable, like BitmapTile._missing_
+        codes = np.where(
+            self._COLORS[index] == rgb,
+            self._COLOR_CODES[index],
+            self.TILE_CODES[self.BitmapTile.PASSABLE],
+        )
+        self._init_grid(codes, trees_passable)
 
     def _open(self, filename: str) -> dict:
         # Open the map file and parse the yaml contents
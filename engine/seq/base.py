@@ -5,6 +5,7 @@ from typing import Optional
 from engine.blackboard import blackboard
 from engine.game import get_current_tilemap, get_zelda_memory
 from engine.pathing import TileMap
+from memory import mark_checkpoint
 from memory.zelda_base import ZeldaMemory
 from term.window import WindowLayout
 
@@ -58,6 +59,7 @@ class SeqCheckpoint(SeqBase):
 
     def execute(self, delta: float) -> bool:
         blackboard().log_checkpoint(self.checkpoint)
+        mark_checkpoint(self.checkpoint)
         return True
 
 
@@ -7,6 +7,7 @@ import time
 from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.seq.base import SeqBase
+from memory import advance_frame
 from memory.rng import EvolandRNG
 from term.window import WindowLayout
 
@@ -120,6 +121,8 @@ class SequencerEngine(object):
 
     # Execute and render TAS progress
     def run(self) -> None:
+        # New tick; memory reads are cached until the next one
+        advance_frame()
         self._handle_input()
         self._update()
         self._render()
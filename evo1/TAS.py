@@ -1,6 +1,7 @@
 # Libraries and Core Files
 import contextlib
 import logging
+import time
 
 from engine.blackboard import blackboard
 from engine.game import GameVersion, set_game_version
@@ -44,7 +45,13 @@ from evo1.route import (
     Sarudnahk,
 )
 from evo1.route.mana_tree import SeqZephyrosObserver
-from memory.evo1 import load_diablo_memory, load_memory, load_zelda_memory
+from maps.evo1 import GetPathCache, SavePathCache
+from memory.evo1 import (
+    load_memory,
+    load_zelda_memory,
+    refresh_diablo_memory,
+    refresh_zelda_memory,
+)
 from term.window import WindowLayout
 
 logger = logging.getLogger("SYSTEM")
@@ -54,18 +61,26 @@ def stop_timer() -> None:
     blackboard().stop()
 
 
-def setup_memory() -> None:
+def setup_memory(snapshot: bool = False) -> None:
     with contextlib.suppress(ReferenceError):
         load_memory()
-        load_zelda_memory()
+        # Entities are kept between ticks, only new actors are allocated
+        refresh_zelda_memory(snapshot=snapshot)
         # TODO: Optimize this, should only load when relevant
-        load_diablo_memory()
+        refresh_diablo_memory(snapshot=snapshot)
+
+
+# Read-only sequences refresh memory every tick, which keeps the entity objects and
+# takes a new snapshot of each (each entity block read in one go). Snapshots stay
+# frozen until the next refresh, so sequences that wait on the game read live.
+def setup_memory_snapshot() -> None:
+    setup_memory(snapshot=True)
 
 
 def observer(window: WindowLayout):
     set_game_version(GameVersion.EVOLAND_1)
 
-    obs = SeqObserver2D("Observer", func=setup_memory)
+    obs = SeqObserver2D("Observer", func=setup_memory_snapshot)
 
     engine = SequencerEngine(
         window=window,
@@ -132,35 +147,9 @@ def move_speed_test(window: WindowLayout):
     wait_seconds(3)
 
 
-def perform_TAS(window: WindowLayout):
-    set_game_version(GameVersion.EVOLAND_1)
-
-    # Print loading
-    window.main.erase()
-    window.stats.erase()
-
-    text = "Preparing TAS"
-    size = window.main.size
-    text_len = len(text)
-    x_off = int(size.x / 2 - text_len / 2)
-    window.main.addstr(Vec2(x_off, int(size.y / 2)), text)
-    window.update()
-
-    logger.info("Evoland1 TAS selected")
-
-    # Define sequence to run
-    saveslot = window.config_data.get("saveslot", 0)
-    checkpoint = window.config_data.get("checkpoint", "")
-
-    # TODO: More run modes
-    logger.info(
-        f"Run mode is {'Any% from New Game' if saveslot == 0 else 'Any% from load'}"
-    )
-    logger.info("Preparing TAS... (may take a few seconds)")
-
-    start_game = EvolandStartGame(saveslot, game=1)
-
-    root = SeqList(
+def create_route() -> SeqList:
+    """The whole Any% route. Building it calculates (or looks up) every path it uses."""
+    return SeqList(
         name="Evoland1 Any%",
         func=setup_memory,
         children=[
@@ -216,6 +205,36 @@ def perform_TAS(window: WindowLayout):
         ],
     )
 
+
+def perform_TAS(window: WindowLayout):
+    set_game_version(GameVersion.EVOLAND_1)
+
+    # Print loading
+    window.main.erase()
+    window.stats.erase()
+
+    text = "Preparing TAS"
+    size = window.main.size
+    text_len = len(text)
+    x_off = int(size.x / 2 - text_len / 2)
+    window.main.addstr(Vec2(x_off, int(size.y / 2)), text)
+    window.update()
+
+    logger.info("Evoland1 TAS selected")
+
+    # Define sequence to run
+    saveslot = window.config_data.get("saveslot", 0)
+    checkpoint = window.config_data.get("checkpoint", "")
+
+    # TODO: More run modes
+    logger.info(
+        f"Run mode is {'Any% from New Game' if saveslot == 0 else 'Any% from load'}"
+    )
+    logger.info("Preparing TAS... (may take a few seconds)")
+
+    start_game = EvolandStartGame(saveslot, game=1)
+    root = create_route()
+
     engine = SequencerEngine(
         window=window,
         root=start_game,
@@ -240,3 +259,27 @@ def perform_TAS(window: WindowLayout):
     logger.info("Evoland1 TAS Done!"),
 
     wait_seconds(3)
+
+
+def compile_routes(window: WindowLayout):
+    """Build the route once, so that the path cache has every path it uses."""
+    window.main.erase()
+    window.stats.erase()
+    text = "Compiling routes"
+    size = window.main.size
+    x_off = int(size.x / 2 - len(text) / 2)
+    window.main.addstr(Vec2(x_off, int(size.y / 2)), text)
+    window.update()
+
+    path_cache = GetPathCache()
+    hits, misses = path_cache.hits, path_cache.misses
+    start = time.perf_counter()
+    create_route()
+    elapsed = time.perf_counter() - start
+    SavePathCache()
+    logger.info(
+        f"Compiled routes in {elapsed:.2f}s: {path_cache.misses - misses} paths calculated, "
+        f"{path_cache.hits - hits} already cached ({len(path_cache)} in the cache)"
+    )
+
+    wait_seconds(3)
@@ -1,4 +1,5 @@
 from evo1.TAS import (
+    compile_routes,
     dark_clink_observer,
     move_speed_test,
     observer,
@@ -12,4 +13,5 @@ __all__ = [
     "zephy_observer",
     "dark_clink_observer",
     "move_speed_test",
+    "compile_routes",
 ]
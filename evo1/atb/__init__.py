@@ -2,18 +2,51 @@ from evo1.atb.base import ATBAction, ATBActor, ATBPlan, SeqATBCombat
 from evo1.atb.encounter import Encounter, EncounterID, calc_next_encounter
 from evo1.atb.entity import atb_stats_from_memory
 from evo1.atb.farming import FarmingGoal, SeqATBmove2D
+from evo1.atb.lookahead import EncounterTable, encounter_lookahead
 from evo1.atb.manual import SeqATBCombatManual
+from evo1.atb.planner import (
+    EncounterModel,
+    EncounterPoint,
+    MenuManip,
+    Plan,
+    PlanGoal,
+    plan_encounters,
+)
 from evo1.atb.predict import predict_attack
+from evo1.atb.search import ATBSearch
+from evo1.atb.simulator import (
+    ActionModel,
+    BattleSetup,
+    Combatant,
+    PolicyReport,
+    SimBattle,
+    evaluate_policy,
+)
 
 __all__ = [
     "ATBAction",
     "ATBActor",
     "ATBPlan",
+    "ATBSearch",
+    "ActionModel",
+    "BattleSetup",
+    "Combatant",
     "Encounter",
     "EncounterID",
+    "EncounterTable",
+    "EncounterModel",
+    "EncounterPoint",
+    "MenuManip",
+    "Plan",
+    "PlanGoal",
+    "PolicyReport",
+    "SimBattle",
     "SeqATBmove2D",
     "FarmingGoal",
     "calc_next_encounter",
+    "encounter_lookahead",
+    "evaluate_policy",
+    "plan_encounters",
     "predict_attack",
     "SeqATBCombat",
     "SeqATBCombatManual",
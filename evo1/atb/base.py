@@ -1,17 +1,22 @@
 import contextlib
 import logging
 from enum import Enum, IntEnum, auto
-from typing import NamedTuple, Optional
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
 from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.seq import SeqBase
 from evo1.atb.entity import atb_stats_from_memory
 from evo1.atb.predict import predict_attack
+from memory import advance_frame
 from memory.evo1 import BattleEntity, BattleMemory
 from memory.rng import EvolandRNG
 from term.window import WindowLayout
 
+if TYPE_CHECKING:
+    # evo1.atb.search imports this module
+    from evo1.atb.search import ATBSearch
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,10 +65,14 @@ class SeqATBCombat(SeqBase):
         BATTLE = auto()
         POST_BATTLE = auto()
 
-    def __init__(self, name: str = "Generic") -> None:
+    def __init__(
+        self, name: str = "Generic", search: Optional["ATBSearch"] = None
+    ) -> None:
         self.mem: BattleMemory = None
         self.state = self._BattleFSM.PRE_BATTLE
         self.cur_plan: Optional[ATBPlan] = None
+        # Plans the turns if set, see search_plan
+        self.search = search
         super().__init__(name=name)
 
     def reset(self) -> None:
@@ -80,6 +89,12 @@ class SeqATBCombat(SeqBase):
             return False
         return True
 
+    def search_plan(self, actor: ATBActor) -> Optional[ATBPlan]:
+        """Plan that wins the battle in the fewest turns, if a search is set and finds one."""
+        if self.search is None:
+            return None
+        return self.search.plan_from_memory(self.mem, actor)
+
     _ATTACK_CURSOR_POS = 0
     _SPECIAL_CURSOR_POS = 1
     _ITEM_CURSOR_POS = 2
@@ -119,6 +134,7 @@ class SeqATBCombat(SeqBase):
             with contextlib.suppress(ReferenceError):
                 while self.mem.cursor != self._SPECIAL_CURSOR_POS:
                     ctrl.dpad.tap_down()
+                    advance_frame()
             ctrl.confirm(tapping=True)
             # Select special ability
             for _ in range(option):
@@ -138,6 +154,7 @@ class SeqATBCombat(SeqBase):
             with contextlib.suppress(ReferenceError):
                 while self.mem.cursor != self._ITEM_CURSOR_POS:
                     ctrl.dpad.tap_down()
+                    advance_frame()
             ctrl.confirm(tapping=True)
             # Select item
             for _ in range(item_index):
@@ -160,6 +177,7 @@ class SeqATBCombat(SeqBase):
                     ctrl = evo_ctrl()
                     while self.mem.cursor != self._RUN_CURSOR_POS:
                         ctrl.dpad.tap_down()
+                        advance_frame()
                     ctrl.confirm()
         else:
             _tap_confirm()
@@ -1,5 +1,6 @@
 import logging
 from enum import Enum, auto
+from typing import Optional
 
 from evo1.atb.entity import ATBEntity, ATBEntityID, atb_stats_from_id
 from evo1.atb.predict import AttackPrediction, predict_attack
@@ -82,8 +83,11 @@ def get_enc_enemies(enc: EncounterID) -> list[ATBEntityID]:
             return [ATBEntityID.APIDYA, ATBEntityID.ZOOMBA]
 
 
-def get_enc_kind(rng_value: int, has_3d_monsters: bool = False) -> EncounterID:
-    map_id = get_memory().map_id
+def get_enc_kind(
+    rng_value: int, has_3d_monsters: bool = False, map_id: Optional[MapID] = None
+) -> EncounterID:
+    if map_id is None:
+        map_id = get_memory().map_id
     modulo = 0xA
     # Crystal Caverns
     if map_id == MapID.CRYSTAL_CAVERN:
@@ -5,7 +5,8 @@ from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.move2d import SeqMove2D, is_close, move_to
 from evo1.atb.base import SeqATBCombat
-from evo1.atb.encounter import Encounter, calc_next_encounter
+from evo1.atb.encounter import Encounter
+from evo1.atb.lookahead import EncounterTable, encounter_lookahead
 from memory.evo1 import get_memory, get_zelda_memory
 from memory.rng import EvolandRNG
 from term.window import WindowLayout
@@ -87,6 +88,9 @@ class SeqATBmove2D(SeqMove2D):
     ):
         self.goal = goal
         self.next_enc: Encounter = None
+        # Upcoming encounters, and the offset of the current RNG state in the table
+        self.enc_table: Optional[EncounterTable] = None
+        self.enc_offset = 0
         self.battle_handler = battle_handler
         self.forced = forced
         super().__init__(name, coords, precision, func=func)
@@ -122,9 +126,10 @@ class SeqATBmove2D(SeqMove2D):
     def calc_next_encounter(self, small_sword: bool = False) -> None:
         mem = get_memory()
         rng = EvolandRNG().get_rng()
-        self.next_enc = calc_next_encounter(
+        self.enc_table, self.enc_offset = encounter_lookahead(
             rng=rng, has_3d_monsters=False, clink_level=0 if small_sword else mem.lvl
         )
+        self.next_enc = self.enc_table[self.enc_offset]
 
     def should_run(self) -> bool:
         return not self.forced and self._farm_done()
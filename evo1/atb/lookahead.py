@@ -0,0 +1,179 @@
+import logging
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from evo1.atb.encounter import Encounter, EncounterID, get_enc_enemies, get_enc_kind
+from evo1.atb.entity import ATBEntity, ATBEntityID, atb_stats_from_id
+from evo1.atb.predict import AttackPrediction
+from memory.evo1 import MapID, get_memory
+from memory.rng import EvolandRNG
+from memory.rng_lookahead import RNGLookahead
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENEMIES = 3
+# RNG values consumed by the largest encounter: kind, 3 gauges, damage and hit
+MAX_CONSUMED = 1 + 3 * _MAX_ENEMIES + 3 + 1
+# get_enc_kind picks the encounter with % 10 or % 7 depending on the map,
+# a LUT over lcm(10, 7) values covers both
+_KIND_LUT_SIZE = 70
+
+
+class EncounterTable:
+    """
+    The encounters for the next `steps` RNG offsets from a captured RNG state.
+    Entry k is what calc_next_encounter returns after k more RNG values have been
+    consumed. The whole table is computed at once from an RNGLookahead, and
+    Encounter objects are only built on access.
+    """
+
+    def __init__(
+        self,
+        rng: EvolandRNG.RNGStruct,
+        steps: int = 2000,
+        has_3d_monsters: bool = False,
+        clink_level: int = 0,
+        map_id: Optional[MapID] = None,
+    ) -> None:
+        self.steps = steps
+        self.has_3d_monsters = has_3d_monsters
+        self.clink_level = clink_level
+        # The map is read from memory unless given, such as when planning offline
+        self.map_id = get_memory().map_id if map_id is None else map_id
+        self.lookahead = RNGLookahead(rng, steps + MAX_CONSUMED)
+        ints, floats = self.lookahead.ints, self.lookahead.floats
+
+        # Encounter kind per offset, as an index into self.kinds
+        lut = [
+            get_enc_kind(value, has_3d_monsters, self.map_id)
+            for value in range(_KIND_LUT_SIZE)
+        ]
+        self.kinds: list[EncounterID] = list(dict.fromkeys(lut))
+        kind_lut = np.array([self.kinds.index(kind) for kind in lut], dtype=np.int8)
+        self.kind = kind_lut[(ints[:steps] & 0x3FFFFFFF) % _KIND_LUT_SIZE]
+
+        # Per kind properties, gathered per offset
+        clink = atb_stats_from_id(ATBEntityID.CLINK, level=clink_level)
+        self.enemy_ids = [get_enc_enemies(kind) for kind in self.kinds]
+        first = [atb_stats_from_id(enemy_ids[0]) for enemy_ids in self.enemy_ids]
+        self.num_enemies = np.array([len(ids) for ids in self.enemy_ids])[self.kind]
+        defense = np.array([stats.defense for stats in first])[self.kind]
+        evade = np.array([stats.evade for stats in first])[self.kind]
+        self.cur_hp = np.array([stats.cur_hp for stats in first])[self.kind]
+
+        # Enemy i takes the float after the kind and the previous enemies
+        offsets = np.arange(steps)
+        self.gauges = np.full((steps, _MAX_ENEMIES), np.nan)
+        for i in range(_MAX_ENEMIES):
+            has_enemy = self.num_enemies > i
+            self.gauges[has_enemy, i] = floats[offsets[has_enemy] + 1 + 3 * i]
+
+        # First turn, Clink attacks the first enemy (same as predict_attack)
+        turn = offsets + 1 + 3 * self.num_enemies
+        # RNG values consumed by the encounter up to the first attack
+        self.consumed = turn + 4 - offsets
+        attack = clink.attack
+        self.dmg = (attack + (0.5 * attack * floats[turn]) - defense + 0.5).astype(int)
+        self.hit = ((ints[turn + 3] & 0x3FFFFFFF) % 100) >= evade
+
+        # Next matching offset per query, see advances_until
+        self._next: dict[tuple[frozenset, frozenset], np.ndarray] = {}
+        # Batch index of each batch in the stream by its first word, for offset_of
+        self._batches: Optional[dict[int, list[int]]] = None
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def enc_id(self, offset: int) -> EncounterID:
+        return self.kinds[self.kind[offset]]
+
+    def __getitem__(self, offset: int) -> Encounter:
+        kind = self.kind[offset]
+        enemies = [
+            ATBEntity(enemy_id, float(self.gauges[offset, i]))
+            for i, enemy_id in enumerate(self.enemy_ids[kind])
+        ]
+        first_turn = AttackPrediction(
+            dmg=int(self.dmg[offset]),
+            hit=bool(self.hit[offset]),
+            cur_hp=int(self.cur_hp[offset]),
+        )
+        return Encounter(self.kinds[kind], enemies, first_turn)
+
+    def matches(
+        self, encs: Iterable[EncounterID], must_hit: Iterable[EncounterID] = ()
+    ) -> np.ndarray:
+        """Per offset, whether the encounter is one of `encs` (see advances_until)."""
+        accepted = np.array([kind in encs for kind in self.kinds])
+        needs_hit = np.array([kind in must_hit for kind in self.kinds])
+        return accepted[self.kind] & (self.hit | ~needs_hit[self.kind])
+
+    def advances_until(
+        self,
+        encs: Iterable[EncounterID],
+        start: int = 0,
+        must_hit: Iterable[EncounterID] = (),
+    ) -> Optional[int]:
+        """
+        Fewest RNG advances from `start` until one of `encs` comes up, or None if
+        there is none left in the table. Encounters in `must_hit` only count when the
+        first attack hits. The first query for a set is O(steps), then O(1).
+        """
+        key = (frozenset(encs), frozenset(must_hit))
+        if key not in self._next:
+            # next[k] is the first matching offset >= k, or steps
+            candidates = np.where(self.matches(*key), np.arange(self.steps), self.steps)
+            self._next[key] = np.minimum.accumulate(candidates[::-1])[::-1]
+        if start >= self.steps:
+            return None
+        found = int(self._next[key][start])
+        return None if found >= self.steps else found - start
+
+    def offset_of(self, rng: EvolandRNG.RNGStruct) -> Optional[int]:
+        """Offset of a later RNG state in this table, or None if it is not in it."""
+        raw = self.lookahead.raw
+        if self._batches is None:
+            self._batches = {}
+            for batch, first in enumerate(raw[:: EvolandRNG.RNG_VALS].tolist()):
+                self._batches.setdefault(first, []).append(batch)
+        values = np.array(rng.values, dtype=np.uint32)
+        for batch in self._batches.get(rng.values[0], []):
+            start = batch * EvolandRNG.RNG_VALS
+            if np.array_equal(raw[start : start + EvolandRNG.RNG_VALS], values):
+                offset = start + rng.cursor - self.lookahead.cursor
+                if 0 <= offset < self.steps:
+                    return offset
+        return None
+
+
+# Most recently used tables, one per map/monster set/level
+_tables: OrderedDict[tuple, EncounterTable] = OrderedDict()
+_MAX_TABLES = 4
+
+
+def encounter_lookahead(
+    rng: EvolandRNG.RNGStruct,
+    has_3d_monsters: bool = False,
+    clink_level: int = 0,
+    steps: int = 2000,
+) -> tuple[EncounterTable, int]:
+    """
+    Encounter table covering the RNG state, and the offset of the state in it.
+    The table is reused while the RNG moves through it (for instance every tick
+    while standing still) and rebuilt once less than half of it is left.
+    """
+    key = (get_memory().map_id, has_3d_monsters, clink_level, steps)
+    table = _tables.get(key)
+    if table is not None:
+        offset = table.offset_of(rng)
+        if offset is not None and offset < steps // 2:
+            _tables.move_to_end(key)
+            return table, offset
+    table = EncounterTable(rng, steps, has_3d_monsters, clink_level)
+    _tables[key] = table
+    _tables.move_to_end(key)
+    while len(_tables) > _MAX_TABLES:
+        _tables.popitem(last=False)
+    return table, 0
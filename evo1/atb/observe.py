@@ -0,0 +1,59 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from evo1.atb.encounter import EncounterID, get_enc_enemies, get_enc_kind
+from evo1.atb.entity import ATBEntityStats
+from memory.evo1 import MapID, get_memory
+from memory.rng_solver import FloatObservation, IntObservation, Observation, Skip
+
+logger = logging.getLogger(__name__)
+
+# Observations for memory.rng_solver.RNGSolver, in the order the game consumes RNG
+
+
+def observe_damage(
+    attacker: ATBEntityStats, defender: ATBEntityStats, dmg: int
+) -> FloatObservation:
+    """An attack that dealt `dmg` (same roll as predict_damage)."""
+    attack, defense = attacker.attack, defender.defense
+
+    def match(floats: np.ndarray) -> np.ndarray:
+        rolls = attack + (0.5 * attack * floats) - defense + 0.5
+        return np.trunc(rolls) == dmg
+
+    return FloatObservation(match)
+
+
+def observe_hit(defender: ATBEntityStats, hit: bool) -> IntObservation:
+    """An attack that hit or missed (same roll as predict_hit)."""
+    hits = range(defender.evade, 100) if hit else range(min(defender.evade, 100))
+    return IntObservation(100, frozenset(hits))
+
+
+def observe_attack(
+    attacker: ATBEntityStats, defender: ATBEntityStats, dmg: Optional[int]
+) -> list[Observation]:
+    """An attack, as predict_attack rolls it. `dmg` is None for a miss."""
+    if dmg is None:
+        return [Skip(3), observe_hit(defender, hit=False)]
+    return [observe_damage(attacker, defender, dmg), observe_hit(defender, hit=True)]
+
+
+def observe_encounter(
+    enc_id: EncounterID,
+    has_3d_monsters: bool = False,
+    map_id: Optional[MapID] = None,
+) -> list[Observation]:
+    """An encounter of the given kind and its enemy gauges (same as calc_next_encounter)."""
+    if map_id is None:
+        map_id = get_memory().map_id
+    # lcm of the % 10 and % 7 get_enc_kind uses, so both are covered
+    values = frozenset(
+        value
+        for value in range(70)
+        if get_enc_kind(value, has_3d_monsters, map_id) == enc_id
+    )
+    gauges = 3 * len(get_enc_enemies(enc_id))
+    return [IntObservation(70, values), Skip(gauges)]
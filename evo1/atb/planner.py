@@ -0,0 +1,294 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from evo1.atb.encounter import EncounterID
+from evo1.atb.entity import ATBEntityID
+from evo1.atb.lookahead import MAX_CONSUMED, EncounterTable
+from memory.evo1.map_id import MapID
+from memory.rng import EvolandRNG
+
+logger = logging.getLogger(__name__)
+
+
+class MenuManip(NamedTuple):
+    """Something that advances the RNG by a known amount, such as opening a chest."""
+
+    name: str
+    advances: int
+    cost: float  # seconds
+
+
+class EncounterPoint(NamedTuple):
+    """
+    A place on the route where an encounter triggers. `advances_before` is the RNG
+    consumed since the previous encounter (walking, battle turns after the first
+    attack and so on), measured on the route.
+    """
+
+    name: str
+    advances_before: int = 0
+    max_wait: int = 60
+    wait_cost: float = 1 / 60  # seconds per RNG advance while standing still
+    manips: tuple[MenuManip, ...] = ()
+    # Encounters that may be taken here, any if empty (same as pref_enc)
+    accept: frozenset[EncounterID] = frozenset()
+    # Encounters that are only taken when the first attack hits
+    must_hit: frozenset[EncounterID] = frozenset()
+
+
+class EncounterModel(NamedTuple):
+    """Rough reward and duration of a battle, per enemy."""
+
+    gli_per_enemy: int = 50
+    exp_per_enemy: dict[ATBEntityID, int] = {}
+    battle_time_per_enemy: float = 4.0  # seconds
+
+
+class PlanGoal(NamedTuple):
+    gli: int = 0
+    exp: int = 0
+    # Encounters that must be fought at least once along the route
+    encounters: frozenset[EncounterID] = frozenset()
+
+
+class ScheduledEncounter(NamedTuple):
+    point: str
+    wait: int  # RNG advances to stand still for
+    manip: Optional[str]
+    offset: int  # offset of the encounter from the starting RNG state
+    enc_id: EncounterID
+
+
+class Plan(NamedTuple):
+    time: float
+    gli: int
+    exp: int
+    schedule: tuple[ScheduledEncounter, ...]
+
+
+# Columns of the candidate arrays passed between the planner and its workers
+_PARENT, _MANIP, _WAIT, _ENC, _OFFSET, _TIME, _GLI, _EXP, _FOUGHT = range(9)
+_COLUMNS = 9
+# Below this many candidates per point, expanding in process beats the pool overhead
+_POOL_MIN_CANDIDATES = 200000
+
+# Encounter table of the worker process, built once by _init_worker
+_table: Optional[EncounterTable] = None
+
+
+def _init_worker(
+    cursor: int,
+    values: list[int],
+    steps: int,
+    has_3d_monsters: bool,
+    clink_level: int,
+    map_id: MapID,
+) -> None:
+    global _table
+    _table = EncounterTable(
+        EvolandRNG.RNGStruct(cursor=cursor, values=values),
+        steps=steps,
+        has_3d_monsters=has_3d_monsters,
+        clink_level=clink_level,
+        map_id=map_id,
+    )
+
+
+def _fought_mask(encs: frozenset[EncounterID]) -> int:
+    return sum(1 << enc.value for enc in encs)
+
+
+def _prune(
+    candidates: np.ndarray, goal: PlanGoal, model: EncounterModel, keep: int
+) -> np.ndarray:
+    """Merge candidates with the same RNG offset and progress, keep the best ones."""
+    if not len(candidates):
+        return candidates
+    goal_mask = _fought_mask(goal.encounters)
+    fought = candidates[:, _FOUGHT].astype(np.int64)
+    keys = np.stack(
+        [
+            candidates[:, _OFFSET],
+            np.minimum(candidates[:, _GLI], goal.gli),
+            np.minimum(candidates[:, _EXP], goal.exp),
+            fought & goal_mask,
+        ],
+        axis=1,
+    )
+    # Fastest first, so np.unique keeps the fastest of each key
+    order = np.argsort(candidates[:, _TIME], kind="stable")
+    candidates, keys = candidates[order], keys[order]
+    _, first = np.unique(keys, axis=0, return_index=True)
+    candidates = candidates[first]
+
+    # Time so far, plus the battles still needed to reach the goal
+    enemies = np.maximum(goal.gli - candidates[:, _GLI], 0) / model.gli_per_enemy
+    if model.exp_per_enemy:
+        best_exp = max(model.exp_per_enemy.values())
+        enemies = np.maximum(
+            enemies, np.maximum(goal.exp - candidates[:, _EXP], 0) / best_exp
+        )
+    missing = goal_mask & ~candidates[:, _FOUGHT].astype(np.int64)
+    enemies += np.array([bin(mask).count("1") for mask in missing])
+    estimate = candidates[:, _TIME] + enemies * model.battle_time_per_enemy
+    return candidates[np.argsort(estimate, kind="stable")[:keep]]
+
+
+def _expand(
+    beam: np.ndarray,
+    point: EncounterPoint,
+    goal: PlanGoal,
+    model: EncounterModel,
+    keep: int,
+) -> np.ndarray:
+    """Every way of reaching the encounter at `point` from the beam, pruned to `keep`."""
+    table = _table
+    accepted = table.matches(point.accept or table.kinds, point.must_hit)
+    # Per encounter kind
+    enemies = [table.enemy_ids[kind] for kind in range(len(table.kinds))]
+    kind_gli = np.array([len(ids) * model.gli_per_enemy for ids in enemies])
+    kind_exp = np.array(
+        [sum(model.exp_per_enemy.get(enemy, 0) for enemy in ids) for ids in enemies]
+    )
+    kind_mask = np.array([1 << kind.value for kind in table.kinds])
+
+    waits = np.arange(point.max_wait + 1)
+    choices = [(0, 0.0)] + [(m.advances, m.cost) for m in point.manips]
+    expanded = []
+    for manip, (manip_advances, manip_cost) in enumerate(choices):
+        base = beam[:, _OFFSET].astype(np.int64) + point.advances_before
+        offsets = (base + manip_advances)[:, None] + waits
+        parents, wait = np.nonzero(offsets < len(table))
+        offsets = offsets[parents, wait]
+        ok = accepted[offsets]
+        parents, wait, offsets = parents[ok], wait[ok], offsets[ok]
+        kind = table.kind[offsets]
+        rows = np.empty((len(offsets), _COLUMNS))
+        rows[:, _PARENT] = beam[parents, _PARENT]
+        rows[:, _MANIP] = manip
+        rows[:, _WAIT] = wait
+        rows[:, _ENC] = offsets
+        rows[:, _OFFSET] = offsets + table.consumed[offsets]
+        rows[:, _TIME] = (
+            beam[parents, _TIME]
+            + manip_cost
+            + wait * point.wait_cost
+            + table.num_enemies[offsets] * model.battle_time_per_enemy
+        )
+        rows[:, _GLI] = beam[parents, _GLI] + kind_gli[kind]
+        rows[:, _EXP] = beam[parents, _EXP] + kind_exp[kind]
+        rows[:, _FOUGHT] = beam[parents, _FOUGHT].astype(np.int64) | kind_mask[kind]
+        expanded.append(rows)
+    return _prune(np.concatenate(expanded), goal, model, keep)
+
+
+def plan_encounters(
+    rng: EvolandRNG.RNGStruct,
+    points: list[EncounterPoint],
+    goal: PlanGoal,
+    model: EncounterModel = EncounterModel(),
+    map_id: MapID = MapID.CRYSTAL_CAVERN,
+    has_3d_monsters: bool = False,
+    clink_level: int = 0,
+    beam_width: int = 256,
+    processes: Optional[int] = None,
+) -> Optional[Plan]:
+    """
+    Plan how long to wait (and which menu manips to do) before each encounter of a
+    route section, starting from a captured RNG state, so that the goal is reached
+    in the least time. Beam search over the points: every kept state is expanded
+    with all waits and manips, states that land on the same RNG offset with the same
+    progress are merged, and the `beam_width` most promising ones are kept.
+    Large beams are expanded across a process pool (processes=0 never uses one).
+    Returns None if the goal cannot be reached within the allowed waits.
+    """
+    steps = sum(
+        point.advances_before
+        + point.max_wait
+        + max((manip.advances for manip in point.manips), default=0)
+        + MAX_CONSUMED
+        for point in points
+    )
+    init_args = (
+        rng.cursor,
+        list(rng.values),
+        steps,
+        has_3d_monsters,
+        clink_level,
+        map_id,
+    )
+    _init_worker(*init_args)
+    pool = None
+    workers = processes or os.cpu_count() or 1
+    if processes != 0 and workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=init_args
+        )
+
+    # One row per kept state, _PARENT being the row of its parent in the previous
+    # beam. Every beam is kept in `history` to walk the schedule back at the end
+    beam = np.zeros((1, _COLUMNS))
+    history: list[np.ndarray] = []
+    try:
+        for point in points:
+            beam = beam.copy()
+            beam[:, _PARENT] = np.arange(len(beam))
+            num_choices = (point.max_wait + 1) * (len(point.manips) + 1)
+            if pool is None or len(beam) * num_choices < _POOL_MIN_CANDIDATES:
+                beam = _expand(beam, point, goal, model, beam_width)
+            else:
+                chunks = [beam[i::workers] for i in range(workers)]
+                futures = [
+                    pool.submit(_expand, chunk, point, goal, model, beam_width)
+                    for chunk in chunks
+                    if len(chunk)
+                ]
+                candidates = np.concatenate([future.result() for future in futures])
+                beam = _prune(candidates, goal, model, beam_width)
+            logger.debug(f"{point.name}: kept {len(beam)} states")
+            if not len(beam):
+                logger.warning(f"No acceptable encounter at {point.name}")
+                return None
+            history.append(beam)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    goal_mask = _fought_mask(goal.encounters)
+    reached = np.nonzero(
+        (beam[:, _GLI] >= goal.gli)
+        & (beam[:, _EXP] >= goal.exp)
+        & (beam[:, _FOUGHT].astype(np.int64) & goal_mask == goal_mask)
+    )[0]
+    if not len(reached):
+        return None
+    best = reached[np.argmin(beam[reached, _TIME])]
+
+    # Walk the parents back to the first point
+    schedule = []
+    row = best
+    for point, states in zip(reversed(points), reversed(history)):
+        state = states[row]
+        manip = int(state[_MANIP])
+        enc = int(state[_ENC])
+        schedule.append(
+            ScheduledEncounter(
+                point=point.name,
+                wait=int(state[_WAIT]),
+                manip=point.manips[manip - 1].name if manip else None,
+                offset=enc,
+                enc_id=_table.enc_id(enc),
+            )
+        )
+        row = int(state[_PARENT])
+    final = beam[best]
+    return Plan(
+        time=float(final[_TIME]),
+        gli=int(final[_GLI]),
+        exp=int(final[_EXP]),
+        schedule=tuple(reversed(schedule)),
+    )
@@ -24,17 +24,17 @@ class AttackPrediction:
 def predict_attack(
     rng: EvolandRNG.RNGStruct, attacker: ATBEntityStats, defender: ATBEntityStats
 ) -> AttackPrediction:
-    dmg = _predict_damage(attacker.attack, defender.defense, rng.rand_float())
-    hit = _predict_hit(defender.evade, rng.rand_int())
+    dmg = predict_damage(attacker.attack, defender.defense, rng.rand_float())
+    hit = predict_hit(defender.evade, rng.rand_int())
     cur_hp = defender.cur_hp
     return AttackPrediction(dmg=dmg, hit=hit, cur_hp=cur_hp)
 
 
 # Att + (0.5 * Att * random_float) - enemy_def
-def _predict_damage(attack: int, defense: int, rng_float: float) -> int:
+def predict_damage(attack: int, defense: int, rng_float: float) -> int:
     return int(attack + (0.5 * attack * rng_float) - defense + 0.5)
 
 
-def _predict_hit(evade: int, rng_int: int) -> bool:
+def predict_hit(evade: int, rng_int: int) -> bool:
     roll = (rng_int & 0x3FFFFFFF) % 100
     return roll >= evade
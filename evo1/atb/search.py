@@ -0,0 +1,160 @@
+import logging
+import math
+import time
+from typing import Optional
+
+from evo1.atb.base import ATBAction, ATBActor, ATBPlan
+from evo1.atb.predict import predict_damage
+from evo1.atb.simulator import ActionModel, SimBattle
+from memory.evo1 import BattleMemory
+from memory.rng import EvolandRNG
+
+logger = logging.getLogger(__name__)
+
+# Actions that deal damage are tried first, so that wins are found early
+_ACTION_ORDER = [
+    ATBAction.BABAMUT,
+    ATBAction.X_CRYSTAL,
+    ATBAction.ATTACK,
+    ATBAction.HEAL,
+    ATBAction.POTION,
+]
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class ATBSearch:
+    """
+    Searches the plans that finish a battle in the fewest ally turns. From an exact
+    RNG state the battle is deterministic (enemy targets and every roll come from
+    the RNG), so each plan leads to a single next state, simulated with SimBattle.
+    This is a deterministic iterative deepening depth-first search (IDDFS) over the
+    number of turns, not expectiminimax: there are no chance nodes. It is pruned
+    with a lower bound on the turns left and a transposition table of (RNG state,
+    hp, gauges, potions) states already known not to win within a given depth.
+    Gives up after `time_budget` seconds, so that the caller can fall back to a
+    policy. Only used by SeqATBCombat when given one, the route never does.
+    """
+
+    def __init__(
+        self,
+        actions: dict[ATBActor, tuple[ATBAction, ...]],
+        model: ActionModel = ActionModel(),
+        max_depth: int = 20,
+        time_budget: float = 0.1,
+    ) -> None:
+        self.actions = actions
+        self.model = model
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        # State key -> largest depth the state is known not to win within
+        self._table: dict[tuple, int] = {}
+        self._deadline = 0.0
+        self.nodes = 0
+
+    def _candidates(self, battle: SimBattle, actor: ATBActor) -> list[ATBPlan]:
+        available = self.actions.get(actor, (ATBAction.ATTACK,))
+        enemies = [i for i, enemy in enumerate(battle.enemies) if enemy.alive]
+        hurt = [
+            ATBActor(i)
+            for i, ally in enumerate(battle.allies)
+            if ally.alive and ally.cur_hp < ally.max_hp
+        ]
+        plans = []
+        for action in _ACTION_ORDER:
+            if action not in available:
+                continue
+            match action:
+                case ATBAction.ATTACK | ATBAction.X_CRYSTAL:
+                    plans += [ATBPlan(actor, action, target=i) for i in enemies]
+                case ATBAction.POTION:
+                    if battle.potions > 0:
+                        plans += [ATBPlan(actor, action, target=a) for a in hurt]
+                case ATBAction.HEAL:
+                    if hurt:
+                        plans.append(ATBPlan(actor, action, target=None))
+                case ATBAction.BABAMUT:
+                    plans.append(ATBPlan(actor, action, target=None))
+        return plans
+
+    def _turns_needed(self, battle: SimBattle) -> int:
+        """Lower bound on the turns left, every turn dealing the most damage possible."""
+        hp = sum(enemy.cur_hp for enemy in battle.enemies if enemy.alive)
+        defense = min(enemy.defense for enemy in battle.enemies if enemy.alive)
+        best = 0.0
+        for i, ally in enumerate(battle.allies):
+            if not ally.alive:
+                continue
+            available = self.actions.get(ATBActor(i), (ATBAction.ATTACK,))
+            if ATBAction.ATTACK in available:
+                best = max(best, predict_damage(ally.attack, defense, 1.0))
+            if ATBAction.X_CRYSTAL in available:
+                power = int(ally.magic * self.model.x_crystal_power)
+                best = max(best, predict_damage(power, defense, 1.0))
+            if ATBAction.BABAMUT in available:
+                best = max(best, self.model.babamut_damage * len(battle.enemies))
+        return math.ceil(hp / best) if best > 0 else self.max_depth + 1
+
+    @staticmethod
+    def _key(battle: SimBattle, actor: ATBActor) -> tuple:
+        entities = battle.allies + battle.enemies
+        return (
+            actor,
+            battle.rng.cursor,
+            tuple(battle.rng.values),
+            tuple(entity.cur_hp for entity in entities),
+            tuple(round(entity.turn_gauge, 6) for entity in entities),
+            battle.potions,
+        )
+
+    def _search(
+        self, battle: SimBattle, actor: ATBActor, depth: int
+    ) -> Optional[list[ATBPlan]]:
+        """Plans that win within `depth` turns from the actor's turn, if any."""
+        if time.perf_counter() > self._deadline:
+            raise _OutOfTime
+        if self._turns_needed(battle) > depth:
+            return None
+        key = self._key(battle, actor)
+        if self._table.get(key, 0) >= depth:
+            return None
+        for plan in self._candidates(battle, actor):
+            self.nodes += 1
+            child = battle.copy()
+            child.act(child.allies[actor], plan)
+            if child.won:
+                return [plan]
+            if depth > 1 and (next_actor := child.next_ally_turn()) is not None:
+                rest = self._search(child, next_actor, depth - 1)
+                if rest is not None:
+                    return [plan] + rest
+        self._table[key] = depth
+        return None
+
+    def best_plans(self, battle: SimBattle, actor: ATBActor) -> Optional[list[ATBPlan]]:
+        """Shortest winning sequence of plans found within the time budget."""
+        self._deadline = time.perf_counter() + self.time_budget
+        self._table = {}
+        self.nodes = 0
+        try:
+            for depth in range(1, self.max_depth + 1):
+                plans = self._search(battle, actor, depth)
+                if plans is not None:
+                    logger.debug(f"Win in {depth} turns: {plans}")
+                    return plans
+        except _OutOfTime:
+            logger.debug(f"Out of time at depth {depth} ({self.nodes} nodes)")
+        return None
+
+    def best_plan(self, battle: SimBattle, actor: ATBActor) -> Optional[ATBPlan]:
+        plans = self.best_plans(battle, actor)
+        return plans[0] if plans else None
+
+    def plan_from_memory(self, mem: BattleMemory, actor: ATBActor) -> Optional[ATBPlan]:
+        """Best plan for the actor in the battle going on in the game."""
+        battle = SimBattle.from_memory(mem, EvolandRNG().get_rng(), self.model)
+        # It is the actor's turn, its gauge empties once the plan is chosen
+        battle.allies[actor].turn_gauge = 0.0
+        return self.best_plan(battle, actor)
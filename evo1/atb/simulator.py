@@ -0,0 +1,314 @@
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+from evo1.atb.base import ATBAction, ATBActor, ATBPlan
+from evo1.atb.entity import (
+    ATBEntityID,
+    ATBEntityStats,
+    atb_stats_from_id,
+    atb_stats_from_memory,
+)
+from evo1.atb.predict import predict_damage, predict_hit
+from memory.evo1 import BattleEntity, BattleMemory
+from memory.rng import EvolandRNG, random_rng
+
+logger = logging.getLogger(__name__)
+
+
+class ActionModel(NamedTuple):
+    """
+    Effects of the actions that predict.py does not cover. None of these have been
+    measured in the game yet, they are guesses to be calibrated against recorded
+    battles.
+    """
+
+    potions: int = 5  # Unverified
+    potion_heal: int = 50  # Unverified
+    heal_amount: int = 30  # Unverified, Kaeris heals the whole party
+    # Unverified, X-Crystal attacks with magic * power, cannot miss
+    x_crystal_power: float = 2.0
+    babamut_damage: int = 300  # Unverified, to every enemy
+    # Gauge filled per simulated second, for entities without a given speed
+    default_speed: float = 1.0
+    max_turns: int = 200
+
+
+class Combatant(NamedTuple):
+    entity_id: ATBEntityID
+    level: int = 0
+    turn_gauge: float = 0.0
+    speed: Optional[float] = None  # turn_gauge_speed, ActionModel.default_speed if None
+
+
+class BattleSetup(NamedTuple):
+    allies: tuple[Combatant, ...]
+    enemies: tuple[Combatant, ...]
+
+
+class SimEntity:
+    """Battle entity with the same fields as memory.evo1.BattleEntity."""
+
+    def __init__(
+        self, name: str, stats: ATBEntityStats, turn_gauge: float, speed: float
+    ) -> None:
+        self.name = name
+        self.max_hp = stats.max_hp
+        self.cur_hp = stats.cur_hp
+        self.attack = stats.attack
+        self.defense = stats.defense
+        self.magic = stats.magic
+        self.evade = stats.evade
+        self.turn_gauge = turn_gauge
+        self.turn_gauge_speed = speed
+
+    @classmethod
+    def from_combatant(cls, combatant: Combatant, model: ActionModel) -> "SimEntity":
+        return cls(
+            name=combatant.entity_id.name,
+            stats=atb_stats_from_id(combatant.entity_id, level=combatant.level),
+            turn_gauge=combatant.turn_gauge,
+            speed=model.default_speed if combatant.speed is None else combatant.speed,
+        )
+
+    @classmethod
+    def from_memory(cls, entity: BattleEntity) -> "SimEntity":
+        return cls(
+            name=entity.name,
+            stats=atb_stats_from_memory(entity),
+            turn_gauge=entity.turn_gauge,
+            speed=entity.turn_gauge_speed,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.cur_hp > 0
+
+    def __repr__(self) -> str:
+        return f"{self.name}: {self.cur_hp}/{self.max_hp} [{self.turn_gauge:.02f}]"
+
+
+# Decides the action of an ally, from a BattleMemory or a SimBattle
+Policy = Callable[[object, ATBActor], ATBPlan]
+
+
+class SimBattle:
+    """
+    Headless ATB battle. Gauges fill at turn_gauge_speed and whoever reaches 1.0
+    first acts (allies first on ties). Allies act through the policy, enemies
+    attack a random living ally. All rolls come from the Evoland RNG model, so a
+    battle started from a captured RNG state plays out like predict_attack says.
+    """
+
+    def __init__(
+        self,
+        allies: list[SimEntity],
+        enemies: list[SimEntity],
+        rng: EvolandRNG.RNGStruct,
+        model: ActionModel = ActionModel(),
+    ) -> None:
+        self.model = model
+        self.rng = rng
+        self.allies = allies
+        self.enemies = enemies
+        self.potions = model.potions
+        self.time = 0.0
+        self.turns = 0
+
+    @classmethod
+    def from_setup(
+        cls,
+        setup: BattleSetup,
+        rng: EvolandRNG.RNGStruct,
+        model: ActionModel = ActionModel(),
+    ) -> "SimBattle":
+        return cls(
+            [SimEntity.from_combatant(ally, model) for ally in setup.allies],
+            [SimEntity.from_combatant(enemy, model) for enemy in setup.enemies],
+            rng,
+            model,
+        )
+
+    @classmethod
+    def from_memory(
+        cls,
+        mem: BattleMemory,
+        rng: EvolandRNG.RNGStruct,
+        model: ActionModel = ActionModel(),
+    ) -> "SimBattle":
+        """The battle going on in the game, from its current RNG state."""
+        return cls(
+            [SimEntity.from_memory(ally) for ally in mem.allies],
+            [SimEntity.from_memory(enemy) for enemy in mem.enemies],
+            rng,
+            model,
+        )
+
+    def copy(self) -> "SimBattle":
+        battle = copy.copy(self)
+        battle.rng = EvolandRNG.RNGStruct(self.rng.cursor, list(self.rng.values))
+        battle.allies = [copy.copy(ally) for ally in self.allies]
+        battle.enemies = [copy.copy(enemy) for enemy in self.enemies]
+        return battle
+
+    @property
+    def ended(self) -> bool:
+        return self.won or self.lost
+
+    @property
+    def won(self) -> bool:
+        return not any(enemy.alive for enemy in self.enemies)
+
+    @property
+    def lost(self) -> bool:
+        return not any(ally.alive for ally in self.allies)
+
+    def _attack(self, attacker: SimEntity, defender: SimEntity) -> None:
+        # Same rolls, in the same order, as predict_attack
+        dmg = predict_damage(attacker.attack, defender.defense, self.rng.rand_float())
+        if predict_hit(defender.evade, self.rng.rand_int()):
+            defender.cur_hp = max(defender.cur_hp - max(dmg, 0), 0)
+
+    def _enemy_target(self, target: Optional[ATBActor | int]) -> SimEntity:
+        if isinstance(target, int) and target < len(self.enemies):
+            enemy = self.enemies[target]
+            if enemy.alive:
+                return enemy
+        return next(enemy for enemy in self.enemies if enemy.alive)
+
+    def _heal(self, ally: SimEntity, amount: int) -> None:
+        if ally.alive:
+            ally.cur_hp = min(ally.cur_hp + amount, ally.max_hp)
+
+    def act(self, actor: SimEntity, plan: ATBPlan) -> None:
+        match plan.action:
+            case ATBAction.ATTACK:
+                self._attack(actor, self._enemy_target(plan.target))
+            case ATBAction.POTION:
+                if self.potions > 0:
+                    self.potions -= 1
+                    self._heal(self.allies[plan.target], self.model.potion_heal)
+            case ATBAction.HEAL:
+                for ally in self.allies:
+                    self._heal(ally, self.model.heal_amount)
+            case ATBAction.X_CRYSTAL:
+                defender = self._enemy_target(plan.target)
+                power = int(actor.magic * self.model.x_crystal_power)
+                dmg = predict_damage(power, defender.defense, self.rng.rand_float())
+                defender.cur_hp = max(defender.cur_hp - max(dmg, 0), 0)
+            case ATBAction.BABAMUT:
+                for enemy in self.enemies:
+                    enemy.cur_hp = max(enemy.cur_hp - self.model.babamut_damage, 0)
+
+    def _next_actor(self) -> SimEntity:
+        # Fill every gauge until the first one is full
+        alive = [e for e in self.allies + self.enemies if e.alive]
+        actor = min(
+            alive, key=lambda e: (1.0 - e.turn_gauge) / max(e.turn_gauge_speed, 1e-9)
+        )
+        elapsed = max((1.0 - actor.turn_gauge) / max(actor.turn_gauge_speed, 1e-9), 0)
+        self.time += elapsed
+        for entity in alive:
+            entity.turn_gauge += elapsed * entity.turn_gauge_speed
+        return actor
+
+    def next_ally_turn(self) -> Optional[ATBActor]:
+        """Play the enemy turns until an ally can act. None once the battle is over."""
+        while not self.ended:
+            actor = self._next_actor()
+            actor.turn_gauge = 0.0
+            if actor in self.allies:
+                return ATBActor(self.allies.index(actor))
+            living = [ally for ally in self.allies if ally.alive]
+            self._attack(actor, living[self.rng.rand_int() % len(living)])
+        return None
+
+    def run(self, policy: Policy) -> bool:
+        """Play the battle to the end. Returns True if the party won."""
+        while self.turns < self.model.max_turns:
+            actor = self.next_ally_turn()
+            if actor is None:
+                break
+            self.turns += 1
+            self.act(self.allies[actor], policy(self, actor))
+        return self.won
+
+
+class BattleResult(NamedTuple):
+    won: bool
+    turns: int
+    time: float
+
+
+class PolicyReport(NamedTuple):
+    battles: int
+    win_rate: float
+    expected_turns: float  # over the battles won
+    expected_time: float  # over the battles won
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.win_rate:.1%} wins over {self.battles} battles, "
+            f"{self.expected_turns:.2f} turns, {self.expected_time:.2f}s"
+        )
+
+
+def simulate(
+    setup: BattleSetup,
+    policy: Policy,
+    rng: EvolandRNG.RNGStruct,
+    model: ActionModel = ActionModel(),
+) -> BattleResult:
+    battle = SimBattle.from_setup(setup, rng, model)
+    won = battle.run(policy)
+    return BattleResult(won, battle.turns, battle.time)
+
+
+def _simulate_seeds(
+    setup: BattleSetup, policy: Policy, model: ActionModel, seeds: range
+) -> tuple[int, int, float]:
+    wins, turns, time = 0, 0, 0.0
+    for seed in seeds:
+        result = simulate(setup, policy, random_rng(seed), model)
+        if result.won:
+            wins += 1
+            turns += result.turns
+            time += result.time
+    return wins, turns, time
+
+
+def evaluate_policy(
+    setup: BattleSetup,
+    policy: Policy,
+    battles: int = 10000,
+    model: ActionModel = ActionModel(),
+    seed: int = 0,
+    processes: Optional[int] = None,
+) -> PolicyReport:
+    """
+    Monte Carlo evaluation of a policy over random RNG states, split over a process
+    pool (processes=0 runs in this process). The policy must be a module level
+    function so that it can be sent to the workers.
+    """
+    workers = processes or os.cpu_count() or 1
+    chunks = [range(seed + i, seed + battles, workers) for i in range(workers)]
+    if processes == 0 or workers == 1:
+        results = [_simulate_seeds(setup, policy, model, range(seed, seed + battles))]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_simulate_seeds, setup, policy, model, chunk)
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+    wins = sum(result[0] for result in results)
+    turns = sum(result[1] for result in results)
+    time = sum(result[2] for result in results)
+    return PolicyReport(
+        battles=battles,
+        win_rate=wins / battles if battles else 0.0,
+        expected_turns=turns / wins if wins else float("inf"),
+        expected_time=time / wins if wins else float("inf"),
+    )
@@ -8,6 +8,7 @@ from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DCancel, SeqSection2D
 from engine.seq import SeqBase, SeqInteract, SeqList, wait_seconds
 from evo1.move2d import SeqZoneTransition
 from maps.evo1 import GetNavmap
+from memory import advance_frame
 from memory.evo1 import MapID, get_memory
 
 logger = logging.getLogger(__name__)
@@ -68,11 +69,13 @@ class TalkToGranny(SeqBase):
         # TODO: Slightly inefficient
         while player.pos.y < 7:
             ctrl.dpad.left()
+            advance_frame()
         ctrl.dpad.none()
         ctrl.dpad.up()
         # Approach Granny
         while player.pos.x > 3.75:
             wait_seconds(0.1)
+            advance_frame()
         ctrl.dpad.none()
         # Talk to Granny (bomb skip)
         ctrl.confirm(tapping=True)
@@ -84,6 +87,7 @@ class TalkToGranny(SeqBase):
         # Detect when we return to regular control area
         while player.pos.x < 7:
             wait_seconds(0.1)
+            advance_frame()
         ctrl.dpad.none()
         return True
 
@@ -142,6 +146,7 @@ class SeqBombSkip(SeqSection2D):
         player = self.zelda_mem().player
         while not player.in_control:
             ctrl.confirm(tapping=True)
+            advance_frame()
         # TODO: Might be slightly unoptimal, but works
         ctrl.menu()
 
@@ -271,12 +276,14 @@ class Aogai1(SeqList):
                     invert=True,
                 ),
                 SeqBombSkip(),
+                # Planned from wherever the skip actually left the player
                 SeqMove2D(
                     "Move to exit",
                     coords=_aogai_nav.calculate(
                         start=_POST_BOMB_SKIP, goal=_SOUTH_ENTRANCE
                     ),
                     invert=True,
+                    nav=_aogai_nav,
                 ),
                 SeqZoneTransition(
                     "Overworld", direction=Facing.DOWN, target_zone=MapID.OVERWORLD
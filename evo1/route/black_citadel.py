@@ -1,52 +1,63 @@
 import logging
+from typing import Optional
 
 from control import evo_ctrl
 from engine.mathlib import Vec2
 from engine.move2d import SeqMove2D
 from engine.seq import SeqDelay, SeqList
-from evo1.atb import ATBAction, ATBActor, ATBPlan, SeqATBCombat
+from evo1.atb import ATBAction, ATBActor, ATBPlan, ATBSearch, SeqATBCombat
 
 logger = logging.getLogger(__name__)
 
 
-class SeqZephyrosATB(SeqATBCombat):
-    def __init__(self, name="Zephyros") -> None:
-        super().__init__(name=name)
+_ZEPHYROS_PHASE_2_HP = 800
 
-    _PHASE_2_HP = 800
 
-    def create_plan(self, actor: ATBActor) -> ATBPlan:
-        zephyros_hp = self.mem.enemies[0].cur_hp
+# Takes a BattleMemory or a SimBattle, so that it can be tuned offline
+def zephyros_policy(battle, actor: ATBActor) -> ATBPlan:
+    zephyros_hp = battle.enemies[0].cur_hp
+
+    # If we are in the second phase, just attack until we die!
+    if zephyros_hp < _ZEPHYROS_PHASE_2_HP:
+        return ATBPlan(actor, ATBAction.ATTACK, target=0)
+
+    # Check if we need healing
+    clink_hp = battle.allies[0].cur_hp
+    kaeris_hp = battle.allies[1].cur_hp
+    clink_critical = clink_hp < 30 and clink_hp != 0
+    kaeris_critical = kaeris_hp < 30 and kaeris_hp != 0
+
+    if kaeris_critical:
+        return ATBPlan(actor, ATBAction.POTION, target=ATBActor.KAERIS)
+    if clink_critical:
+        return ATBPlan(actor, ATBAction.POTION, target=ATBActor.CLINK)
+
+    # Check if we are low
+    # TODO: Do we want this?
+    clink_low = clink_hp < 50
+    kaeris_low = kaeris_hp < 45
+    should_heal = clink_low and kaeris_low
 
-        # If we are in the second phase, just attack until we die!
-        if zephyros_hp < self._PHASE_2_HP:
+    # Attack the boss
+    match actor:
+        case ATBActor.CLINK:
             return ATBPlan(actor, ATBAction.ATTACK, target=0)
+        case ATBActor.KAERIS:
+            if should_heal:
+                return ATBPlan(actor, ATBAction.HEAL, target=None)
+            return ATBPlan(actor, ATBAction.X_CRYSTAL, target=0)
 
-        # Check if we need healing
-        clink_hp = self.mem.allies[0].cur_hp
-        kaeris_hp = self.mem.allies[1].cur_hp
-        clink_critical = clink_hp < 30 and clink_hp != 0
-        kaeris_critical = kaeris_hp < 30 and kaeris_hp != 0
-
-        if kaeris_critical:
-            return ATBPlan(actor, ATBAction.POTION, target=ATBActor.KAERIS)
-        if clink_critical:
-            return ATBPlan(actor, ATBAction.POTION, target=ATBActor.CLINK)
-
-        # Check if we are low
-        # TODO: Do we want this?
-        clink_low = clink_hp < 50
-        kaeris_low = kaeris_hp < 45
-        should_heal = clink_low and kaeris_low
-
-        # Attack the boss
-        match actor:
-            case ATBActor.CLINK:
-                return ATBPlan(actor, ATBAction.ATTACK, target=0)
-            case ATBActor.KAERIS:
-                if should_heal:
-                    return ATBPlan(actor, ATBAction.HEAL, target=None)
-                return ATBPlan(actor, ATBAction.X_CRYSTAL, target=0)
+
+def babamut_policy(battle, actor: ATBActor) -> ATBPlan:
+    return ATBPlan(actor, ATBAction.BABAMUT, target=None)
+
+
+class SeqZephyrosATB(SeqATBCombat):
+    def __init__(self, name="Zephyros", search: Optional[ATBSearch] = None) -> None:
+        super().__init__(name=name, search=search)
+
+    def create_plan(self, actor: ATBActor) -> ATBPlan:
+        return self.search_plan(actor) or zephyros_policy(self.mem, actor)
 
     def handle_combat(self, should_run: bool = False):
         # TODO: Handle double turn
@@ -77,7 +88,7 @@ class SeqZephyrosBabamut(SeqZephyrosATB):
         super().__init__(name="I'ma firin mah lazer")
 
     def create_plan(self, actor: ATBActor) -> ATBPlan:
-        return ATBPlan(actor, ATBAction.BABAMUT, target=None)
+        return babamut_policy(self.mem, actor)
 
 
 class SeqLeaveBlackCitadel(SeqMove2D):
@@ -1,8 +1,10 @@
 import logging
+from typing import Optional
 
 from control import evo_ctrl
 from engine.mathlib import Facing, Vec2
 from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DConfirm
+from engine.pathing import Pathing
 from engine.seq import SeqDelay, SeqList, SeqMashDelay, SeqMenu
 from evo1.atb import EncounterID, FarmingGoal, SeqATBCombat, SeqATBmove2D
 from evo1.move2d import SeqZoneTransition
@@ -13,8 +15,13 @@ from term.window import WindowLayout
 logger = logging.getLogger(__name__)
 
 
-_cavern_astar = GetNavmap(MapID.CRYSTAL_CAVERN)
-_limbo_astar = GetNavmap(MapID.LIMBO)
+# Maps load on first use, when the route is built
+def _cavern_astar() -> Pathing:
+    return GetNavmap(MapID.CRYSTAL_CAVERN)
+
+
+def _limbo_astar() -> Pathing:
+    return GetNavmap(MapID.LIMBO)
 
 
 class CrystalCavernEncManip(SeqATBmove2D):
@@ -29,6 +36,13 @@ class CrystalCavernEncManip(SeqATBmove2D):
         self.pref_enc = pref_enc
         super().__init__(name=name, coords=coords, goal=goal, precision=precision)
 
+    def _advances_until_pref(self) -> Optional[int]:
+        # If favorable and it's a Kobra, only take it if we're going to hit
+        # TODO: Worth it?
+        return self.enc_table.advances_until(
+            self.pref_enc, start=self.enc_offset, must_hit=[EncounterID.KOBRA]
+        )
+
     # TODO: Leveling requirement should account for exp (if the first manip fails)
     def _should_manip(self) -> bool:
         # Check how close we are to getting an encounter
@@ -36,18 +50,9 @@ class CrystalCavernEncManip(SeqATBmove2D):
         enc_timer = mem.player.encounter_timer
 
         # If we are about to get an encounter, potentially manip (stop and wait)
+        # until a favorable one comes up
         if enc_timer < 0.1:
-            if self.next_enc.enc_id in self.pref_enc:
-                # If favorable and it's a Kobra, wait if we're going to miss
-                # TODO: Worth it?
-                return (
-                    not self.next_enc.first_turn.hit
-                    if self.next_enc.enc_id == EncounterID.KOBRA
-                    else False
-                )
-            else:
-                # Not favorable, wait
-                return True
+            return self._advances_until_pref() != 0
         return False
 
     # Returning true means we seize control instead of moving on
@@ -64,6 +69,10 @@ class CrystalCavernEncManip(SeqATBmove2D):
 
     def render(self, window: WindowLayout) -> None:
         super().render(window=window)
+        if not self.battle_handler.active and self.enc_table is not None:
+            advances = self._advances_until_pref()
+            wait = "none in range" if advances is None else f"{advances} rng"
+            window.stats.addstr(Vec2(1, 14), f" Preferred enc: {wait}")
 
 
 class SeqKefkasGhost(SeqATBCombat):
@@ -100,7 +109,7 @@ class CrystalCavern(SeqList):
             children=[
                 SeqMove2DConfirm(
                     name="Move to chest",
-                    coords=_cavern_astar.calculate(
+                    coords=_cavern_astar().calculate(
                         start=Vec2(24, 77), goal=Vec2(20, 66), final_pos=Vec2(20, 65.6)
                     ),
                 ),
@@ -108,7 +117,7 @@ class CrystalCavern(SeqList):
                 # Should run from these battles
                 CrystalCavernEncManip(
                     name="Move to chest",
-                    coords=_cavern_astar.calculate(
+                    coords=_cavern_astar().calculate(
                         start=Vec2(20, 65), goal=Vec2(18, 39)
                     ),
                     pref_enc=[
@@ -120,7 +129,7 @@ class CrystalCavern(SeqList):
                 SeqGrabChest("Experience", Facing.UP),
                 CrystalCavernEncManip(
                     name="Move to trigger",
-                    coords=_cavern_astar.calculate(
+                    coords=_cavern_astar().calculate(
                         start=Vec2(18, 38), goal=Vec2(54, 36), final_pos=Vec2(54, 36.7)
                     ),
                     goal=FarmingGoal(lvl_goal=2),
@@ -135,7 +144,7 @@ class CrystalCavern(SeqList):
                 # Should run from battle if we have level 2
                 CrystalCavernEncManip(
                     name="Move to boss",
-                    coords=_cavern_astar.calculate(
+                    coords=_cavern_astar().calculate(
                         # (54, 36)
                         start=Vec2(54, 30),
                         goal=Vec2(49, 9),
@@ -154,7 +163,7 @@ class CrystalCavern(SeqList):
                 # Limbo realm
                 SeqMove2D(
                     name="Move to portal",
-                    coords=_limbo_astar.calculate(start=Vec2(7, 10), goal=Vec2(7, 6)),
+                    coords=_limbo_astar().calculate(start=Vec2(7, 10), goal=Vec2(7, 6)),
                 ),
                 SeqZoneTransition(
                     "Enter the third dimension", Facing.UP, target_zone=MapID.EDEL_VALE
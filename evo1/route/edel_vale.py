@@ -4,13 +4,17 @@ from control import evo_ctrl
 from engine.combat import SeqMove2DClunkyCombat
 from engine.mathlib import Box2, Facing, Vec2
 from engine.move2d import SeqGrabChest, SeqGrabChestKeyItem, SeqMove2D, SeqMove2DConfirm
+from engine.pathing import Pathing
 from engine.seq import SeqAttack, SeqList
 from evo1.combat import SeqKnight2D
 from evo1.move2d import SeqZoneTransition
 from maps.evo1 import GetNavmap
 from memory.evo1 import Evo1GameEntity2D, MapID
 
-_edel_vale_astar = GetNavmap(MapID.EDEL_VALE)
+
+# Maps load on first use, when the route is built
+def _edel_vale_astar() -> Pathing:
+    return GetNavmap(MapID.EDEL_VALE)
 
 
 class SeqGridLockedCombat(SeqMove2DClunkyCombat):
@@ -46,21 +50,21 @@ class Edel1(SeqList):
                 SeqGrabChest("Basic Scroll", direction=Facing.UP),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(12, 51), goal=Vec2(20, 52), free_move=False
                     ),
                 ),
                 SeqGrabChest("Smooth Scroll", direction=Facing.LEFT),
                 SeqMove2D(
                     "Move to sword",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(20, 52), goal=Vec2(30, 60), free_move=False
                     ),
                 ),
                 SeqGrabChest("Sword", direction=Facing.DOWN),
                 SeqMove2D(
                     "Move to bush",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(30, 60), goal=Vec2(31, 55), free_move=False
                     ),
                 ),
@@ -70,7 +74,7 @@ class Edel1(SeqList):
                 # From here, use grid locked combat until we get free move
                 SeqGridLockedCombat(
                     "Dodge enemies",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(32, 55), goal=Vec2(39, 52), free_move=False
                     ),
                 ),
@@ -80,7 +84,7 @@ class Edel1(SeqList):
                 SeqMove2D("Move past bush", coords=[Vec2(39, 50)]),
                 SeqGridLockedCombat(
                     "Move to chest",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(39, 50), goal=Vec2(44, 49), free_move=False
                     ),
                     # TODO Optional, chest to the north, save (move to Vec2(39, 45), then open chest N)
@@ -88,7 +92,7 @@ class Edel1(SeqList):
                 SeqGrabChest("16-bit", direction=Facing.DOWN),
                 SeqGridLockedCombat(
                     "Dodge enemies",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(44, 49),
                         goal=Vec2(35, 33),
                         final_pos=Vec2(34, 33),
@@ -161,14 +165,14 @@ class Edel2(SeqList):
             children=[
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(10, 8), goal=Vec2(15, 14)
                     ),
                 ),
                 SeqGrabChestKeyItem("Hearts", direction=Facing.UP, manip=True),
                 SeqMove2DClunkyCombat(
                     "Move to bush",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(15, 13), goal=Vec2(33, 19)
                     ),
                 ),
@@ -185,7 +189,7 @@ class Edel2(SeqList):
                 SeqMove2DClunkyCombat("Move past bush", coords=[Vec2(34, 28)]),
                 SeqMove2DClunkyCombat(
                     "Move to bush",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(34, 28), goal=Vec2(58, 54)
                     ),
                 ),
@@ -197,7 +201,7 @@ class Edel2(SeqList):
                 # TODO: End optional health drops
                 SeqMove2DClunkyCombat(
                     "Move to end",
-                    coords=_edel_vale_astar.calculate(
+                    coords=_edel_vale_astar().calculate(
                         start=Vec2(57, 60), goal=Vec2(58, 78)
                     ),
                 ),
@@ -14,6 +14,7 @@ from engine.move2d import (
     SeqSection2D,
     move_to,
 )
+from engine.pathing import Pathing
 from engine.seq import SeqAttack, SeqDebug, SeqDelay, SeqList, SeqMenu, wait_seconds
 from evo1.combat import SeqDarkClinkFight
 from evo1.move2d import SeqZoneTransition
@@ -27,8 +28,14 @@ from memory.evo1 import (
     get_zelda_memory,
 )
 
-_noria_astar = GetNavmap(MapID.NORIA)
-_noria_start_astar = GetNavmap(MapID.NORIA_CLOSED)
+
+# Maps load on first use, when the route is built
+def _noria_astar() -> Pathing:
+    return GetNavmap(MapID.NORIA)
+
+
+def _noria_start_astar() -> Pathing:
+    return GetNavmap(MapID.NORIA_CLOSED)
 
 
 # TODO: Improve on the chest grab to be more concise (don't require the approach)
@@ -41,28 +48,28 @@ class NoriaToMaze(SeqList):
             children=[
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_start_astar.calculate(
+                    coords=_noria_start_astar().calculate(
                         start=Vec2(47, 67), goal=Vec2(46, 56), final_pos=Vec2(46, 55.6)
                     ),
                 ),
                 SeqGrabChest("Opening the mines", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(46, 55), goal=Vec2(51, 48), final_pos=Vec2(51, 47.6)
                     ),
                 ),
                 SeqGrabChest("Breakable pots", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(51, 47), goal=Vec2(54, 40), final_pos=Vec2(54, 39.6)
                     ),
                 ),
                 SeqGrabChest("Pressure plates", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Trigger plate(R)",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(54, 39), goal=Vec2(58, 37)
                     ),
                 ),
@@ -71,7 +78,7 @@ class NoriaToMaze(SeqList):
                 ),
                 SeqMove2DClunkyCombat(
                     "Trigger plate(L)",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(58, 37), goal=Vec2(50, 37)
                     ),
                     precision=0.1,
@@ -81,7 +88,7 @@ class NoriaToMaze(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(50, 37),
                         goal=Vec2(48, 47),
                     ),
@@ -89,21 +96,21 @@ class NoriaToMaze(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(48, 47), goal=Vec2(48, 45), final_pos=Vec2(48, 44.6)
                     ),
                 ),
                 SeqGrabChest("Red Mage", direction=Facing.UP),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(48, 44), goal=Vec2(35, 41), final_pos=Vec2(35, 40.6)
                     ),
                 ),
                 SeqGrabChestKeyItem("Trap room", direction=Facing.UP, manip=True),
                 SeqMove2D(
                     "Retrigger room",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(35, 41), goal=Vec2(38, 44)
                     ),
                 ),
@@ -121,14 +128,14 @@ class NoriaToMaze(SeqList):
                 SeqGrabChest("Key", direction=Facing.LEFT),
                 SeqMove2DClunkyCombat(
                     "Move to door",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(37, 44), goal=Vec2(41, 42)
                     ),
                 ),
                 # TODO: Open door(N)
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(41, 41), goal=Vec2(41, 40), final_pos=Vec2(41, 39.6)
                     ),
                 ),
@@ -136,14 +143,14 @@ class NoriaToMaze(SeqList):
                 # Skip past first skeleton
                 SeqMove2DCancel(
                     "Move to trigger",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(41, 40), goal=Vec2(30, 40)
                     ),
                 ),
                 # TODO: Deal with mage enemy here?
                 SeqMove2DClunkyCombat(
                     "Trigger plate",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(30, 39), goal=Vec2(27, 42)
                     ),
                 ),
@@ -154,7 +161,7 @@ class NoriaToMaze(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(29, 43), goal=Vec2(22, 40), final_pos=Vec2(22, 39.6)
                     ),
                 ),
@@ -177,14 +184,14 @@ class NoriaMazeAndBlocks(SeqList):
             children=[
                 SeqMove2DClunkyCombat(
                     "Maze",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(22, 38), goal=Vec2(27, 24), final_pos=Vec2(27, 23.6)
                     ),
                 ),
                 SeqGrabChestKeyItem("Key", direction=Facing.UP, manip=True),
                 SeqMove2DClunkyCombat(
                     "Maze",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(27, 24), goal=Vec2(15, 23)
                     ),
                 ),
@@ -192,21 +199,23 @@ class NoriaMazeAndBlocks(SeqList):
                 SeqMove2D("Door", coords=[Vec2(15, 22)]),
                 SeqMove2DClunkyCombat(
                     "Juke skellies",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(15, 21), goal=Vec2(14, 18)
                     ),
                 ),
                 # TODO: Better juking so we can avoid fighting the skellies?
                 SeqMove2DClunkyCombat(
                     "Juke skellies",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(14, 18), goal=Vec2(9, 14), final_pos=Vec2(9, 13.6)
                     ),
                 ),
                 SeqGrabChest("Push blocks", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Move to block",
-                    coords=_noria_astar.calculate(start=Vec2(9, 14), goal=Vec2(12, 15)),
+                    coords=_noria_astar().calculate(
+                        start=Vec2(9, 14), goal=Vec2(12, 15)
+                    ),
                 ),
                 SeqMove2D(
                     "Push block", coords=[Vec2(12, 13), Vec2(12, 14.5), Vec2(11.5, 15)]
@@ -216,16 +225,18 @@ class NoriaMazeAndBlocks(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2D(
                     "Move to block",
-                    coords=_noria_astar.calculate(start=Vec2(12, 15), goal=Vec2(8, 11)),
+                    coords=_noria_astar().calculate(
+                        start=Vec2(12, 15), goal=Vec2(8, 11)
+                    ),
                 ),
                 SeqMove2DClunkyCombat(
                     "Move to block",
-                    coords=_noria_astar.calculate(start=Vec2(8, 11), goal=Vec2(4, 4)),
+                    coords=_noria_astar().calculate(start=Vec2(8, 11), goal=Vec2(4, 4)),
                 ),
                 SeqMove2D("Push block", coords=[Vec2(4, 3)]),
                 SeqMove2DClunkyCombat(
                     "Move to block",
-                    coords=_noria_astar.calculate(start=Vec2(4, 4), goal=Vec2(11, 4)),
+                    coords=_noria_astar().calculate(start=Vec2(4, 4), goal=Vec2(11, 4)),
                 ),
                 SeqMove2D("Push block", coords=[Vec2(11, 3), Vec2(11, 5)]),
                 SeqMenu("Menu manip"),
@@ -235,7 +246,9 @@ class NoriaMazeAndBlocks(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2DClunkyCombat(
                     "Move to trap",
-                    coords=_noria_astar.calculate(start=Vec2(15, 5), goal=Vec2(22, 15)),
+                    coords=_noria_astar().calculate(
+                        start=Vec2(15, 5), goal=Vec2(22, 15)
+                    ),
                 ),
             ],
         )
@@ -309,7 +322,7 @@ class Whackamole(SeqSection2D):
         super().__init__(name="Whackamole")
         tilemap = GetTilemap(MapID.NORIA)
         # Set up navigable arena, removing abyss tiles
-        self.arena = [pos for pos in self._ARENA if pos in tilemap.map]
+        self.arena = [pos for pos in self._ARENA if tilemap.is_passable(pos.x, pos.y)]
         self.spawned = False
 
     def reset(self) -> None:
@@ -382,6 +395,8 @@ class NavigateWindtraps(SeqSection2D):
                     ctrl.menu(tapping=True)
                     wait_seconds(0.2)
                     ctrl.menu(tapping=True)
+                    # Actors read after the wait would be from before it
+                    break
 
         # 4. Detect when we've reached the bottom
         done = player_pos.y >= 26
@@ -448,6 +463,8 @@ class SolveFloorPuzzle(SeqSection2D):
                         ctrl.menu()
                         wait_seconds(0.4)
                         ctrl.menu()
+                        # Actors read after the wait would be from before it
+                        break
         # TODO: Check for failures and reset
         return False
 
@@ -463,7 +480,7 @@ class NoriaPuzzles(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(22, 15), goal=Vec2(22, 17), final_pos=Vec2(22, 17.4)
                     ),
                 ),
@@ -471,7 +488,7 @@ class NoriaPuzzles(SeqList):
                 KaerisSkip(),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(30, 18), goal=Vec2(33, 17), final_pos=Vec2(33, 16.6)
                     ),
                 ),
@@ -485,14 +502,18 @@ class NoriaPuzzles(SeqList):
                 SeqGrabChest("Trick plate", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Trigger plate(R)",
-                    coords=_noria_astar.calculate(start=Vec2(34, 5), goal=Vec2(36, 4)),
+                    coords=_noria_astar().calculate(
+                        start=Vec2(34, 5), goal=Vec2(36, 4)
+                    ),
                 ),
                 SeqHoldInPlace(
                     name="Trigger plate(R)", target=Vec2(36, 4), timeout_in_s=0.5
                 ),
                 SeqMove2DClunkyCombat(
                     "Trigger plate(L)",
-                    coords=_noria_astar.calculate(start=Vec2(36, 4), goal=Vec2(32, 4)),
+                    coords=_noria_astar().calculate(
+                        start=Vec2(36, 4), goal=Vec2(32, 4)
+                    ),
                     precision=0.1,
                 ),
                 SeqMenu("Menu manip"),
@@ -500,28 +521,28 @@ class NoriaPuzzles(SeqList):
                 SeqMenu("Menu manip"),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(32, 4), goal=Vec2(38, 14), final_pos=Vec2(38, 14.4)
                     ),
                 ),
                 SeqGrabChest("Wind trap", direction=Facing.DOWN),
                 SeqMove2D(
                     "Move to wind traps",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(38, 14), goal=Vec2(39, 16)
                     ),
                 ),
                 NavigateWindtraps(),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(39, 26), goal=Vec2(44, 23), final_pos=Vec2(44, 22.6)
                     ),
                 ),
                 SeqGrabChest("Puzzle", direction=Facing.UP),
                 SeqMove2DClunkyCombat(
                     "Move to puzzle",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(44, 23), goal=Vec2(45, 26)
                     ),
                 ),
@@ -533,7 +554,7 @@ class NoriaPuzzles(SeqList):
                 # SeqGrabChest("Key", direction=Facing.RIGHT),
                 SeqMove2DClunkyCombat(
                     "Move to door",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(47, 27), goal=Vec2(51, 24)
                     ),
                 ),
@@ -541,7 +562,7 @@ class NoriaPuzzles(SeqList):
                 SeqMove2D("Door", coords=[Vec2(51, 23)]),
                 SeqMove2DClunkyCombat(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(51, 23), goal=Vec2(53, 19), final_pos=Vec2(53, 18.6)
                     ),
                 ),
@@ -557,7 +578,7 @@ class NavigateFireballs(SeqSection2D):
 
     def __init__(self, precision: float = 0.2):
         super().__init__(name="Fireballs")
-        self.coords = _noria_astar.calculate(start=Vec2(70, 31), goal=Vec2(70, 49))
+        self.coords = _noria_astar().calculate(start=Vec2(70, 31), goal=Vec2(70, 49))
         self.step = 0
         self.precision = precision
 
@@ -598,6 +619,8 @@ class NavigateFireballs(SeqSection2D):
                         ctrl.menu()
                         wait_seconds(0.4)
                         ctrl.menu()
+                        # Actors read after the wait would be from before it
+                        break
         # TODO: Prep deathwarp
         # (1). Prep death warp by repeatedly moving into lava: Vec2(71, 31)
         # 2. Navigate over bridge and through maze: AStar start=Vec2(70, 31), goal=Vec2(70, 49)
@@ -614,14 +637,14 @@ class NoriaLavaMaze(SeqList):
             children=[
                 SeqMove2DClunkyCombat(
                     "Move to trigger",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(53, 18), goal=Vec2(66, 20)
                     ),
                 ),
                 SeqMove2DCancel("Talk", coords=[Vec2(67, 22)], precision=0.4),
                 SeqMove2DClunkyCombat(
                     "Lava Maze",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(67, 22), goal=Vec2(72, 22)
                     ),
                 ),
@@ -631,7 +654,7 @@ class NoriaLavaMaze(SeqList):
                 ),
                 SeqMove2DClunkyCombat(
                     "Lava Maze",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(73, 23),
                         goal=Vec2(70, 26),
                         final_pos=Vec2(69.5, 25.8),
@@ -644,7 +667,7 @@ class NoriaLavaMaze(SeqList):
                 ),
                 SeqMove2DClunkyCombat(
                     "Lava Maze",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(68, 25), goal=Vec2(70, 30), final_pos=Vec2(70, 30.4)
                     ),
                 ),
@@ -654,7 +677,7 @@ class NoriaLavaMaze(SeqList):
                 # Use move here; fighting can cause death before picking up the chest
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(70, 50), goal=Vec2(78, 56), final_pos=Vec2(78.4, 56)
                     ),
                 ),
@@ -731,7 +754,7 @@ class NoriaBoss(SeqList):
             children=[
                 SeqMove2D(
                     "Move to door",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(47, 67), goal=Vec2(41, 55)
                     ),
                 ),
@@ -740,7 +763,7 @@ class NoriaBoss(SeqList):
                 SeqMove2D("Boss door", coords=[Vec2(41, 53)]),
                 SeqMove2DClunkyCombat(
                     "Move to trigger",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(41, 53), goal=Vec2(32, 51)
                     ),
                 ),
@@ -748,7 +771,7 @@ class NoriaBoss(SeqList):
                 SeqDarkClinkFight(),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_noria_astar.calculate(
+                    coords=_noria_astar().calculate(
                         start=Vec2(27, 62), goal=Vec2(21, 61), final_pos=Vec2(21, 60.6)
                     ),
                 ),
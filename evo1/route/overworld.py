@@ -6,22 +6,25 @@ from typing import Optional
 from control import evo_ctrl
 from engine.mathlib import Facing, Vec2, dist, is_close
 from engine.move2d import SeqGrabChest, SeqMove2D, SeqMove2DCancel, move_to
+from engine.pathing import Pathing
 from engine.seq import SeqBase, SeqDelay, SeqInteract, SeqList
 from evo1.atb import (
     Encounter,
     EncounterID,
     FarmingGoal,
     SeqATBmove2D,
-    calc_next_encounter,
 )
 from evo1.move2d import SeqZoneTransition
 from evo1.route.aogai import AogaiWrongWarp
 from maps.evo1 import GetNavmap
 from memory.evo1 import EKind, IKind, MapID, get_memory, get_zelda_memory
-from memory.rng import EvolandRNG
 from term.window import WindowLayout
 
-_overworld_astar = GetNavmap(MapID.OVERWORLD)
+
+# Maps load on first use, when the route is built
+def _overworld_astar() -> Pathing:
+    return GetNavmap(MapID.OVERWORLD)
+
 
 logger = logging.getLogger(__name__)
 
@@ -98,10 +101,10 @@ class OverworldGliFarm(SeqATBmove2D):
                 if not dist_to_chest < player.encounter_timer:
                     return False
 
-                # Calculate the manipulated encounter
-                rng = EvolandRNG().get_rng()
-                rng.advance_rng(self._CHEST_RNG_ADVANCE)
-                self.manipulated_enc = calc_next_encounter(rng, clink_level=0)
+                # Look up the manipulated encounter
+                self.manipulated_enc = self.enc_table[
+                    self.enc_offset + self._CHEST_RNG_ADVANCE
+                ]
 
                 if not self._should_manip():
                     return False
@@ -183,7 +186,7 @@ class OverworldToCavern(SeqList):
                 # Grab the forced combat chest and rescue/name Kaeris
                 SeqATBmove2D(
                     "Picking up Kaeris",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(87, 40), goal=Vec2(79, 35)
                     ),
                     forced=True,
@@ -205,14 +208,14 @@ class OverworldToNoria(SeqList):
             children=[
                 SeqMove2D(
                     "Move to chest",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(79, 73), goal=Vec2(78, 76)
                     ),
                 ),
                 SeqGrabChest("Perspective", direction=Facing.LEFT),
                 SeqMove2D(
                     "Move to mines",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(78, 76), goal=Vec2(75, 79)
                     ),
                 ),
@@ -245,7 +248,7 @@ class OverworldToAogai(SeqList):
                 # Navigate to Aogai village
                 SeqMove2D(
                     "Moving to Aogai",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(78, 85), goal=Vec2(95, 93)
                     ),
                 ),
@@ -263,7 +266,7 @@ class OverworldToSacredGrove(SeqList):
             children=[
                 SeqMove2D(
                     "Moving to Sacred Grove",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(95, 93), goal=Vec2(96, 100)
                     ),
                 ),
@@ -283,7 +286,7 @@ class SacredGroveToAogai(SeqList):
             children=[
                 SeqMove2D(
                     "Moving to Aogai",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(96, 100), goal=Vec2(95, 93)
                     ),
                 ),
@@ -301,7 +304,7 @@ class OverworldToSarudnahk(SeqList):
             children=[
                 SeqMove2D(
                     "Moving to Sarudnahk",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(95, 91), goal=Vec2(100, 77)
                     ),
                 ),
@@ -333,7 +336,7 @@ class OverworldToBlackCitadel(SeqList):
             children=[
                 SeqMove2D(
                     "Moving to Black Citadel",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(95, 91), goal=Vec2(117, 88)
                     ),
                 ),
@@ -351,7 +354,7 @@ class BlackCitadelToAogai(SeqList):
             children=[
                 SeqMove2D(
                     "Moving to Aogai",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(116, 88), goal=Vec2(95, 91)
                     ),
                 ),
@@ -409,7 +412,7 @@ class AogaiToManaTree(SeqList):
             children=[
                 SeqMove2DCancel(
                     "Moving to Airship",
-                    coords=_overworld_astar.calculate(
+                    coords=_overworld_astar().calculate(
                         start=Vec2(95, 93), goal=Vec2(92, 93)
                     ),
                 ),
@@ -12,6 +12,7 @@ from engine.move2d import (
     SeqSection2D,
     move_to,
 )
+from engine.pathing import Pathing
 from engine.seq import (
     SeqAttack,
     SeqCheckpoint,
@@ -33,9 +34,18 @@ from memory.evo1 import (
     get_zelda_memory,
 )
 
-_sg_astar = GetNavmap(MapID.SACRED_GROVE_2D)
-_bow_astar = GetNavmap(MapID.SACRED_GROVE_CAVE_1)
-_amulet_astar = GetNavmap(MapID.SACRED_GROVE_CAVE_2)
+
+# Maps load on first use, when the route is built
+def _sg_astar() -> Pathing:
+    return GetNavmap(MapID.SACRED_GROVE_2D)
+
+
+def _bow_astar() -> Pathing:
+    return GetNavmap(MapID.SACRED_GROVE_CAVE_1)
+
+
+def _amulet_astar() -> Pathing:
+    return GetNavmap(MapID.SACRED_GROVE_CAVE_2)
 
 
 class SacredGrove(SeqList):
@@ -72,7 +82,7 @@ class SacredGroveToBowCave(SeqList):
                 ),
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(start=Vec2(14, 38), goal=Vec2(30, 41)),
+                    coords=_sg_astar().calculate(start=Vec2(14, 38), goal=Vec2(30, 41)),
                 ),
                 SeqAttack("Crystal"),
                 # TODO: Slightly suboptimal movement here
@@ -81,14 +91,14 @@ class SacredGroveToBowCave(SeqList):
                 # SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(start=Vec2(30, 41), goal=Vec2(15, 27)),
+                    coords=_sg_astar().calculate(start=Vec2(30, 41), goal=Vec2(15, 27)),
                 ),
                 SeqAttack("Bush"),
                 SeqMove2D("Move to crystal", coords=[Vec2(13, 27)]),
                 SeqAttack("Crystal"),
                 SeqMove2DClunkyCombat(
                     "Move to dungeon",
-                    coords=_sg_astar.calculate(start=Vec2(15, 27), goal=Vec2(14, 18)),
+                    coords=_sg_astar().calculate(start=Vec2(15, 27), goal=Vec2(14, 18)),
                 ),
                 SeqZoneTransition(
                     "Bow dungeon",
@@ -106,7 +116,7 @@ class BowCave(SeqList):
             children=[
                 SeqMove2DClunkyCombat(
                     "Maze",
-                    coords=_bow_astar.calculate(
+                    coords=_bow_astar().calculate(
                         start=Vec2(12, 26), goal=Vec2(12, 17), final_pos=Vec2(12, 17.4)
                     ),
                 ),
@@ -129,7 +139,7 @@ class SacredGroveToAmuletCave(SeqList):
                 # TODO: Can fail here if the bats force us back into the bow cave
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(start=Vec2(14, 18), goal=Vec2(17, 27)),
+                    coords=_sg_astar().calculate(start=Vec2(14, 18), goal=Vec2(17, 27)),
                 ),
                 # Turn left
                 SeqMove2D("Move to crystal", coords=[Vec2(16.7, 27)], precision=0.1),
@@ -144,7 +154,7 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(start=Vec2(17, 22), goal=Vec2(24, 18)),
+                    coords=_sg_astar().calculate(start=Vec2(17, 22), goal=Vec2(24, 18)),
                 ),
                 SeqSwapWeapon("Bomb", new_weapon=Evo1Weapon.BOMB),
                 SeqPlaceBomb("Crystal", target=Vec2(24, 18)),
@@ -152,13 +162,13 @@ class SacredGroveToAmuletCave(SeqList):
                 # SeqAttack("Crystal"),
                 SeqMove2D(
                     "Skip dimension tree",
-                    coords=_sg_astar.calculate(start=Vec2(24, 18), goal=Vec2(27, 21)),
+                    coords=_sg_astar().calculate(start=Vec2(24, 18), goal=Vec2(27, 21)),
                 ),
                 # TODO: Suboptimal, if we just swap to bow this is quicker
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(27, 21), goal=Vec2(49, 27), final_pos=Vec2(48.6, 27)
                     ),
                 ),
@@ -168,7 +178,7 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2DClunkyCombat(
                     "Move to bush",
-                    coords=_sg_astar.calculate(start=Vec2(49, 27), goal=Vec2(60, 32)),
+                    coords=_sg_astar().calculate(start=Vec2(49, 27), goal=Vec2(60, 32)),
                 ),
                 SeqAttack("Bush"),
                 SeqMove2D("Move to bush", coords=[Vec2(60, 33)]),
@@ -177,14 +187,14 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqAttack("Bush"),
                 SeqMove2DClunkyCombat(
                     "Move to bush",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(60, 35), goal=Vec2(61, 38), final_pos=Vec2(61, 39)
                     ),
                 ),
                 SeqAttack("Bush"),
                 SeqMove2DClunkyCombat(
                     "Move to bush",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(61, 39), goal=Vec2(70, 37), final_pos=Vec2(70, 37.3)
                     ),
                 ),
@@ -196,12 +206,12 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqMove2D("Move to bush", coords=[Vec2(70, 40)]),
                 SeqMove2D(
                     "Move to bush",
-                    coords=_sg_astar.calculate(start=Vec2(70, 40), goal=Vec2(67, 42)),
+                    coords=_sg_astar().calculate(start=Vec2(70, 40), goal=Vec2(67, 42)),
                 ),
                 SeqAttack("Bush"),
                 SeqMove2D(
                     "Move to bush",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(66, 42), goal=Vec2(65, 40), final_pos=Vec2(64.7, 40)
                     ),
                 ),
@@ -212,7 +222,7 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2D(
                     "Move to bush",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(65, 40), goal=Vec2(63, 42), final_pos=Vec2(63, 41.7)
                     ),
                 ),
@@ -223,7 +233,7 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2D(
                     "Move to bush",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(63, 42), goal=Vec2(60, 42), final_pos=Vec2(60.4, 42)
                     ),
                 ),
@@ -241,7 +251,7 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqAttack("Light fire"),
                 SeqMove2D(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(
+                    coords=_sg_astar().calculate(
                         start=Vec2(60, 42), goal=Vec2(65, 42), final_pos=Vec2(65, 41.7)
                     ),
                 ),
@@ -257,11 +267,11 @@ class SacredGroveToAmuletCave(SeqList):
                 SeqSwapWeapon("Sword", new_weapon=Evo1Weapon.SWORD),
                 SeqMove2DClunkyCombat(
                     "Move to cave",
-                    coords=_sg_astar.calculate(start=Vec2(70, 37), goal=Vec2(60, 36)),
+                    coords=_sg_astar().calculate(start=Vec2(70, 37), goal=Vec2(60, 36)),
                 ),
                 SeqMove2DClunkyCombat(
                     "Move to cave",
-                    coords=_sg_astar.calculate(start=Vec2(60, 33), goal=Vec2(59, 27)),
+                    coords=_sg_astar().calculate(start=Vec2(60, 33), goal=Vec2(59, 27)),
                 ),
                 SeqMove2D(
                     "Move to cave",
@@ -386,7 +396,7 @@ class AmuletCaveFight(SeqList):
                 # TODO: Should end this section with sword equipped and menu open
                 SeqMove2D(
                     "Leave cave",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(19, 20), goal=Vec2(14, 20)
                     ),
                 ),
@@ -404,13 +414,13 @@ class AmuletCave(SeqList):
                 # Push blocks (room with bats)
                 SeqMove2DClunkyCombat(
                     "Move to push block(N)",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(4, 20), goal=Vec2(11, 18), final_pos=Vec2(11, 17.3)
                     ),
                 ),
                 SeqMove2DClunkyCombat(
                     "Move to push block(S)",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(11, 17), goal=Vec2(11, 22)
                     ),
                 ),
@@ -421,7 +431,7 @@ class AmuletCave(SeqList):
                 ),
                 SeqMove2D(
                     "Move to door",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(11, 22),
                         goal=Vec2(12, 21),
                         final_pos=Vec2(12.5, 20.5),
@@ -432,14 +442,14 @@ class AmuletCave(SeqList):
                 SeqMenu("Menu glitch"),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(12, 21), goal=Vec2(16, 20)
                     ),
                 ),
                 SeqMenu("Menu glitch"),
                 SeqMove2D(
                     "Move to chest",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(16, 20), goal=Vec2(18, 20)
                     ),
                 ),
@@ -447,7 +457,7 @@ class AmuletCave(SeqList):
                 # Grab amulet
                 SeqMove2D(
                     "Move to chest",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(18, 20), goal=Vec2(26, 20)
                     ),
                 ),
@@ -456,7 +466,7 @@ class AmuletCave(SeqList):
                 # Leave cave
                 SeqMove2DClunkyCombat(
                     "Move to exit",
-                    coords=_amulet_astar.calculate(
+                    coords=_amulet_astar().calculate(
                         start=Vec2(14, 20), goal=Vec2(4, 20)
                     ),
                 ),
@@ -491,7 +501,7 @@ class SacredGroveToExit(SeqList):
             children=[
                 SeqMove2DClunkyCombat(
                     "Move to crystal",
-                    coords=_sg_astar.calculate(start=Vec2(62, 27), goal=Vec2(53, 32)),
+                    coords=_sg_astar().calculate(start=Vec2(62, 27), goal=Vec2(53, 32)),
                 ),
                 # Activate crystal with sword
                 SeqAttack("Crystal"),
@@ -501,18 +511,18 @@ class SacredGroveToExit(SeqList):
                 SeqPlaceBomb("Crystal", target=Vec2(53, 32.3), precision=0.1),
                 SeqMove2D(
                     "Move to exit",
-                    coords=_sg_astar.calculate(start=Vec2(53, 32), goal=Vec2(51, 34)),
+                    coords=_sg_astar().calculate(start=Vec2(53, 32), goal=Vec2(51, 34)),
                 ),
                 SeqSwapWeapon("Sword", Evo1Weapon.SWORD),
                 # Move to south exit
                 SeqMove2DClunkyCombat(
                     "Move to exit",
-                    coords=_sg_astar.calculate(start=Vec2(51, 34), goal=Vec2(47, 40)),
+                    coords=_sg_astar().calculate(start=Vec2(51, 34), goal=Vec2(47, 40)),
                 ),
                 # Skip past dialog and leave for world map
                 SeqMove2DConfirm(
                     "Move to exit",
-                    coords=_sg_astar.calculate(start=Vec2(47, 40), goal=Vec2(47, 43)),
+                    coords=_sg_astar().calculate(start=Vec2(47, 40), goal=Vec2(47, 43)),
                 ),
                 SeqZoneTransition(
                     "Overworld",
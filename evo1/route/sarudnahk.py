@@ -16,6 +16,7 @@ from engine.move2d import (
     SeqSection2D,
     move_to,
 )
+from engine.pathing import NavMesh
 from engine.seq import SeqCheckpoint, SeqList
 from evo1.move2d import SeqZoneTransition
 from maps.evo1.maps import GetNavmap
@@ -62,9 +63,17 @@ class SeqDiabloMove2D(SeqMove2D):
         return get_diablo_memory()
 
 
+# Combat pushes the player around, so the path is replanned (on the navmesh, if
+# given) whenever the next checkpoint gets out of sight
 class SeqDiabloCombat(SeqDiabloMove2D):
-    def __init__(self, name: str, coords: list[Vec2], precision: float = 0.2):
-        super().__init__(name, coords, precision)
+    def __init__(
+        self,
+        name: str,
+        coords: list[Vec2],
+        precision: float = 0.2,
+        nav: Optional[NavMesh] = None,
+    ):
+        super().__init__(name, coords, precision, nav=nav)
         self.attack = ComAttackToggle()
 
     def reset(self) -> None:
@@ -448,6 +457,7 @@ class SarudnahkToBoss(SeqList):
                 SeqDiabloCombat(
                     "Move to chest",
                     coords=_ruins_nav.calculate(start=_ENTRANCE, goal=_CHAR_SEL_CHEST),
+                    nav=_ruins_nav,
                 ),
                 SeqCharacterSelect(),
                 # Navigate through the Diablo section using boid behavior
@@ -458,6 +468,7 @@ class SarudnahkToBoss(SeqList):
                     coords=_ruins_nav.calculate(
                         start=_CHAR_SEL_CHEST, goal=_COMBO_CHEST
                     ),
+                    nav=_ruins_nav,
                 ),
                 SeqGrabChestDiablo("Combo", chest_area=_COMBO_CHEST),
                 SeqDiabloCombat(
@@ -465,6 +476,7 @@ class SarudnahkToBoss(SeqList):
                     coords=_ruins_nav.calculate(
                         start=_COMBO_CHEST, goal=_LIFEBAR_CHEST
                     ),
+                    nav=_ruins_nav,
                 ),
                 SeqGrabChestDiablo("Lifebar", chest_area=_LIFEBAR_CHEST),
                 SeqDiabloCombat(
@@ -472,11 +484,13 @@ class SarudnahkToBoss(SeqList):
                     coords=_ruins_nav.calculate(
                         start=_LIFEBAR_CHEST, goal=_AMBIENT_CHEST
                     ),
+                    nav=_ruins_nav,
                 ),
                 SeqGrabChestDiablo("Ambient", chest_area=_AMBIENT_CHEST),
                 SeqDiabloCombat(
                     "Navigate ruins",
                     coords=_ruins_nav.calculate(start=_AMBIENT_CHEST, goal=_BOSS_CHEST),
+                    nav=_ruins_nav,
                 ),
                 # Practice save
                 SeqCheckpoint(checkpoint_name="lich"),
@@ -495,6 +509,7 @@ class SarudnahkToAogai(SeqList):
                 SeqDiabloCombat(
                     "Navigate ruins",
                     coords=_ruins_nav.calculate(start=_BOSS_CHEST, goal=_GATE),
+                    nav=_ruins_nav,
                 ),
                 SeqDiabloMove2D(
                     "Move to chest",
@@ -1,7 +1,15 @@
-from maps.evo1.maps import CurrentTilemap, GetNavmap, GetTilemap
+from maps.evo1.maps import (
+    CurrentTilemap,
+    GetNavmap,
+    GetPathCache,
+    GetTilemap,
+    SavePathCache,
+)
 
 __all__ = [
     "CurrentTilemap",
     "GetNavmap",
+    "GetPathCache",
     "GetTilemap",
+    "SavePathCache",
 ]
@@ -1,30 +1,96 @@
-from typing import Dict, Optional
-
-from engine.pathing import AStar, NavMesh, Pathing, TileMap
+import atexit
+import functools
+import os
+from typing import Callable, Dict, Optional
+
+from engine.mathlib import Vec2
+from engine.pathing import (
+    AStar,
+    PathCache,
+    Pathing,
+    ThetaStar,
+    TileMap,
+    load_navmesh,
+    load_tilemap,
+)
 from memory.evo1 import MapID, get_memory
 
+# Decoded maps, reused as long as the map files don't change
+_CACHE_DIR = "maps/evo1/.cache"
+# Paths calculated by the routes, keyed by the hash of the map files and the
+# line of sight settings
+_path_cache = PathCache(filename=f"{_CACHE_DIR}/paths.json")
+# Clearance from blocked tiles kept by paths smoothed to straight lines, in tiles
+_PLAYER_RADIUS = 0.3
+
 
+# Maps are only loaded the first time they are used
 class NavMap:
-    def __init__(self) -> None:
-        self.tilemap: Optional[TileMap] = None
-        self.nav: Optional[Pathing] = None
+    # Clearance of the line of sight checks the paths are planned with (smoothing,
+    # any-angle paths, snapping to the navmesh), None if they don't check it. Part
+    # of the path cache key, so that changing it doesn't reuse stale paths
+    sight_radius: Optional[float] = None
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self._tilemap: Optional[TileMap] = None
+        self._nav: Optional[Pathing] = None
+
+    @property
+    def tilemap(self) -> TileMap:
+        if self._tilemap is None:
+            self._tilemap = load_tilemap(self.filename, cache_dir=_CACHE_DIR)
+        return self._tilemap
+
+    @property
+    def nav(self) -> Pathing:
+        if self._nav is None:
+            self._nav = self._create_nav(self.tilemap)
+            self._nav.path_cache = _path_cache
+            source_key = self.tilemap.source_key or self.filename
+            self._nav.cache_key = f"{source_key} sight={self.sight_radius}"
+        return self._nav
+
+    def _line_of_sight(
+        self, tilemap: TileMap
+    ) -> Optional[Callable[[Vec2, Vec2], bool]]:
+        if self.sight_radius is None:
+            return None  # No smoothing or any-angle paths
+        return functools.partial(tilemap.line_of_sight, radius=self.sight_radius)
+
+    # OVERRIDE
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        raise NotImplementedError
 
 
 class AStarNavMap(NavMap):
-    def __init__(self, filename: str) -> None:
-        self.tilemap = TileMap(filename=filename)
-        self.nav = AStar(self.tilemap.map)
+    sight_radius = _PLAYER_RADIUS
+
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        nav = AStar(tilemap.map)
+        # Free move paths beeline between the tiles where they turn
+        nav.line_of_sight = self._line_of_sight(tilemap)
+        return nav
+
+
+# Any-angle paths, for the sections where the player moves freely
+class ThetaStarNavMap(NavMap):
+    sight_radius = _PLAYER_RADIUS
+
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        return ThetaStar(tilemap.map, line_of_sight=self._line_of_sight(tilemap))
 
 
 class NavMeshNavMap(NavMap):
-    def __init__(self, filename: str) -> None:
-        self.tilemap = TileMap(filename=filename)
-        self.nav = NavMesh(
-            map_nodes=self.tilemap.nav_nodes, edges=self.tilemap.nav_edges
-        )
+    # Positions off the navmesh snap to nodes in sight (load_navmesh)
+    sight_radius = 0.0
+
+    def _create_nav(self, tilemap: TileMap) -> Pathing:
+        name = os.path.splitext(os.path.basename(self.filename))[0]
+        return load_navmesh(tilemap, name=name, cache_dir=_CACHE_DIR)
 
 
-_sacred_grove = AStarNavMap("maps/evo1/sacred_grove.yaml")
+_sacred_grove = ThetaStarNavMap("maps/evo1/sacred_grove.yaml")
 
 _maps: Dict[MapID, NavMap] = {
     MapID.EDEL_VALE: AStarNavMap("maps/evo1/edel_vale.yaml"),
@@ -36,7 +102,7 @@ _maps: Dict[MapID, NavMap] = {
     MapID.CRYSTAL_CAVERN: AStarNavMap("maps/evo1/crystal_cavern.yaml"),
     MapID.LIMBO: AStarNavMap("maps/evo1/limbo.yaml"),
     MapID.NORIA_CLOSED: AStarNavMap("maps/evo1/noria_start.yaml"),
-    MapID.NORIA: AStarNavMap("maps/evo1/noria_mines.yaml"),
+    MapID.NORIA: ThetaStarNavMap("maps/evo1/noria_mines.yaml"),
     MapID.AOGAI: NavMeshNavMap("maps/evo1/aogai.yaml"),
     MapID.SACRED_GROVE_2D: _sacred_grove,
     # TODO: Add the 3d map too?
@@ -61,3 +127,15 @@ def CurrentTilemap() -> Optional[TileMap]:
 
 def GetNavmap(map_id: MapID) -> Pathing:
     return _maps.get(map_id).nav
+
+
+def GetPathCache() -> PathCache:
+    return _path_cache
+
+
+def SavePathCache() -> None:
+    _path_cache.save()
+
+
+# Keep paths calculated during the run for the next launch
+atexit.register(SavePathCache)
@@ -1,7 +1,10 @@
+from memory.core import advance_frame, mark_checkpoint
 from memory.rng import EvolandRNG
 from memory.zelda_base import GameEntity2D, ZeldaMemory
 
 __all__ = [
+    "advance_frame",
+    "mark_checkpoint",
     "EvolandRNG",
     "ZeldaMemory",
     "GameEntity2D",
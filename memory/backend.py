@@ -0,0 +1,252 @@
+# Libraries and Core Files
+import array
+import bisect
+import ctypes
+import itertools
+import logging
+import mmap
+import os
+import struct
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessBackend:
+    """Where LocProcess gets its memory from. Implementations only need read_into."""
+
+    def read_into(self, address: int, buffer) -> bool:
+        """Fill the ctypes buffer with the memory at address. Returns False on failure."""
+        raise NotImplementedError
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        buffer = (ctypes.c_char * size)()
+        if self.read_into(address, buffer):
+            return buffer.raw
+        return None
+
+    def read_vectored(self, ranges: list[tuple[int, int]]) -> list[Optional[bytes]]:
+        """Read several (address, size) ranges. Failed ranges are returned as None."""
+        # Backends that can scatter in one call (such as process_vm_readv) override this
+        return [self.read_bytes(address, size) for address, size in ranges]
+
+    def advance_frame(self, frame: int) -> None:
+        """Called by LocProcess when a new frame starts."""
+        pass
+
+    def mark(self, label: str) -> None:
+        """Tag the current frame (such as with a checkpoint name)."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class WindowsBackend(ProcessBackend):
+    """Reads from a live process handle through ReadProcessMemory."""
+
+    def __init__(self, handle: int):
+        self.handle = handle
+
+    def read_into(self, address: int, buffer) -> bool:
+        bytes_read = ctypes.c_size_t()
+        return bool(
+            ctypes.windll.kernel32.ReadProcessMemory(
+                self.handle,
+                address,
+                ctypes.byref(buffer),
+                ctypes.sizeof(buffer),
+                ctypes.byref(bytes_read),
+            )
+        )
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+# Array typecode of one iovec field, to build iovec arrays from flat lists
+_IOV_WORD = "Q" if ctypes.sizeof(ctypes.c_size_t) == 8 else "I"
+
+
+class LinuxBackend(ProcessBackend):
+    """
+    Reads from a live Linux process (such as the game running under Wine) through
+    process_vm_readv, which gathers any number of ranges in a single call.
+    """
+
+    _IOV_MAX = 1024  # Most ranges a single process_vm_readv call accepts
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._readv = libc.process_vm_readv
+        self._readv.restype = ctypes.c_ssize_t
+        self._readv.argtypes = [
+            ctypes.c_int,
+            ctypes.POINTER(_IOVec),
+            ctypes.c_ulong,
+            ctypes.POINTER(_IOVec),
+            ctypes.c_ulong,
+            ctypes.c_ulong,
+        ]
+
+    def module_base(self, name: str) -> int:
+        """Address the module (such as libhl.dll) is mapped at, from /proc/<pid>/maps."""
+        with open(f"/proc/{self.pid}/maps") as maps:
+            for line in maps:
+                fields = line.split(maxsplit=5)
+                if len(fields) < 6 or int(fields[2], 16) != 0:
+                    continue
+                if os.path.basename(fields[5].strip()).lower() == name.lower():
+                    return int(fields[0].split("-")[0], 16)
+        raise ValueError(f"{name} is not mapped in process {self.pid}")
+
+    def read_into(self, address: int, buffer) -> bool:
+        size = ctypes.sizeof(buffer)
+        local = _IOVec(ctypes.addressof(buffer), size)
+        remote = _IOVec(address, size)
+        return self._readv(self.pid, local, 1, remote, 1, 0) == size
+
+    def read_vectored(self, ranges: list[tuple[int, int]]) -> list[Optional[bytes]]:
+        ret: list[Optional[bytes]] = []
+        while len(ret) < len(ranges):
+            batch = ranges[len(ret) : len(ret) + self._IOV_MAX]
+            # The ranges are read back to back into a single buffer
+            buffer = ctypes.create_string_buffer(sum(size for _, size in batch))
+            local = _IOVec(ctypes.addressof(buffer), len(buffer))
+            words = array.array(_IOV_WORD, itertools.chain.from_iterable(batch))
+            remote = (_IOVec * len(batch)).from_buffer(words)
+            read = self._readv(self.pid, local, 1, remote, len(batch), 0)
+            # The call stops at the first range it can't read (-1 if that is the
+            # first one). That range failed, the next call starts after it
+            data = buffer.raw[: max(read, 0)]
+            offset = 0
+            for _, size in batch:
+                if offset + size > len(data):
+                    ret.append(None)
+                    break
+                ret.append(data[offset : offset + size])
+                offset += size
+        return ret
+
+
+# Memory image file layout (little endian):
+#   header:   magic, libhl base address, segment count
+#   segments: address, size, file offset (sorted by address, non-overlapping)
+#   data:     raw segment bytes
+_IMAGE_MAGIC = b"EVOMEM01"
+_IMAGE_HEADER = struct.Struct("<8sII")
+_IMAGE_SEGMENT = struct.Struct("<IIQ")
+
+
+def merge_segments(segments: dict[int, bytes]) -> list[tuple[int, bytes]]:
+    """Merge overlapping or adjacent (address, bytes) segments. Later data wins on overlap."""
+    merged: list[tuple[int, bytearray]] = []
+    for address in sorted(segments):
+        data = segments[address]
+        if merged and address <= merged[-1][0] + len(merged[-1][1]):
+            start, block = merged[-1]
+            offset = address - start
+            block[offset : offset + len(data)] = data
+        else:
+            merged.append((address, bytearray(data)))
+    return [(address, bytes(block)) for address, block in merged]
+
+
+class MemoryImage(ProcessBackend):
+    """
+    Sparse, memory-mapped snapshot of the process (address -> bytes segments).
+    Reads outside of the captured segments fail like reads of unmapped memory.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, "rb") as image_file:
+            self._mmap = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.base_addr, count = _IMAGE_HEADER.unpack_from(self._mmap, 0)
+        if magic != _IMAGE_MAGIC:
+            raise ValueError(f"{filename} is not a memory image")
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._offsets: list[int] = []
+        for i in range(count):
+            address, size, offset = _IMAGE_SEGMENT.unpack_from(
+                self._mmap, _IMAGE_HEADER.size + i * _IMAGE_SEGMENT.size
+            )
+            self._starts.append(address)
+            self._ends.append(address + size)
+            self._offsets.append(offset)
+        logger.debug(f"Loaded memory image {filename} with {count} segments")
+
+    def _locate(self, address: int, size: int) -> Optional[int]:
+        # File offset of the range, if a single segment contains it
+        i = bisect.bisect_right(self._starts, address) - 1
+        if i < 0 or address + size > self._ends[i]:
+            return None
+        return self._offsets[i] + address - self._starts[i]
+
+    def read_into(self, address: int, buffer) -> bool:
+        size = ctypes.sizeof(buffer)
+        offset = self._locate(address, size)
+        if offset is None:
+            return False
+        ctypes.memmove(
+            ctypes.addressof(buffer), self._mmap[offset : offset + size], size
+        )
+        return True
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        offset = self._locate(address, size)
+        if offset is None:
+            return None
+        return self._mmap[offset : offset + size]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    @staticmethod
+    def save(filename: str, base_addr: int, segments: dict[int, bytes]) -> None:
+        merged = merge_segments(segments)
+        offset = _IMAGE_HEADER.size + len(merged) * _IMAGE_SEGMENT.size
+        with open(filename, "wb") as image_file:
+            image_file.write(_IMAGE_HEADER.pack(_IMAGE_MAGIC, base_addr, len(merged)))
+            for address, data in merged:
+                image_file.write(_IMAGE_SEGMENT.pack(address, len(data), offset))
+                offset += len(data)
+            for _, data in merged:
+                image_file.write(data)
+
+
+class CaptureBackend(ProcessBackend):
+    """Forwards reads to another backend and keeps a copy of everything read."""
+
+    def __init__(self, backend: ProcessBackend):
+        self.backend = backend
+        self.segments: dict[int, bytes] = {}
+
+    def read_into(self, address: int, buffer) -> bool:
+        if not self.backend.read_into(address, buffer):
+            return False
+        self._keep(
+            address, ctypes.string_at(ctypes.addressof(buffer), ctypes.sizeof(buffer))
+        )
+        return True
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        data = self.backend.read_bytes(address, size)
+        if data is not None:
+            self._keep(address, data)
+        return data
+
+    def _keep(self, address: int, data: bytes) -> None:
+        # A short read (u8) must not truncate a longer one from the same address
+        if len(data) >= len(self.segments.get(address, b"")):
+            self.segments[address] = data
+
+    def save(self, filename: str, base_addr: int) -> None:
+        """Write everything read so far as a memory image."""
+        MemoryImage.save(filename, base_addr, self.segments)
+
+    def close(self) -> None:
+        self.backend.close()
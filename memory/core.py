@@ -1,12 +1,23 @@
 # Libraries and Core Files
+import atexit
 import ctypes
 import ctypes.wintypes
 import logging
 import os
+from typing import Any, Optional
 
-import pymem
 from ReadWriteMemory import Process, ReadWriteMemory, ReadWriteMemoryError
 
+from config import open_config
+from memory.backend import (
+    CaptureBackend,
+    LinuxBackend,
+    MemoryImage,
+    ProcessBackend,
+    WindowsBackend,
+)
+from memory.recording import RecordingBackend, ReplayBackend
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,18 +25,69 @@ LIBHL_OFFSET = 0x0004914C
 
 
 class LocProcess(Process):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, backend: Optional[ProcessBackend] = None, **kwargs):
         super(LocProcess, self).__init__(*args, **kwargs)
+        # All reads go through the backend (live process or memory image)
+        self.backend = backend
+        # Frame-scoped read cache. Every read is memoized by address until the next
+        # call to advance_frame(), giving one coherent view of the game per tick.
+        self.frame = 0
+        self._frame_cache: dict[tuple, Any] = {}
+        # Resolved pointer chains, keyed by (base, offsets). Valid until one of the
+        # watched root values changes (see watch_generation), which starts a new generation.
+        self.generation = 0
+        self._pointer_cache: dict[tuple[int, tuple[int, ...]], int] = {}
+        self._generation_keys: dict[str, Any] = {}
+
+    def advance_frame(self) -> None:
+        """Drop all cached reads. Must be called whenever the game may have advanced."""
+        self.frame += 1
+        self._frame_cache.clear()
+        self.backend.advance_frame(self.frame)
+
+    def seed_frame_cache(
+        self, address: int, ctype: Optional[type | int], value: Any
+    ) -> None:
+        """
+        Store a value read some other way (see ReadPlan) for this frame, to be
+        returned by the read_* call for the same address and ctypes type (None for
+        read, an int for read_bytes of that size).
+        """
+        self._frame_cache[(address, ctype)] = value
+
+    def watch_generation(self, name: str, value: Any) -> bool:
+        """Invalidate all cached pointer chains if the watched value changed. Returns True on change."""
+        if name in self._generation_keys and self._generation_keys[name] == value:
+            return False
+        self._generation_keys[name] = value
+        self.generation += 1
+        self._pointer_cache.clear()
+        return True
+
+    def resolve_pointer(self, lp_base_address: int, offsets: list[int]) -> int:
+        """Cached version of get_pointer, for chains that are stable within a generation."""
+        key = (lp_base_address, tuple(offsets))
+        ptr = self._pointer_cache.get(key)
+        if ptr is None:
+            ptr = self.get_pointer(lp_base_address, offsets=offsets)
+            self._pointer_cache[key] = ptr
+        return ptr
+
+    def read(self, lp_base_address: int) -> Any:
+        # Used by get_pointer. Never raises, reads as 0 on failure (see ReadWriteMemory)
+        key = (lp_base_address, None)
+        if key not in self._frame_cache:
+            lp_buffer = ctypes.c_uint()
+            self.backend.read_into(lp_base_address, lp_buffer)
+            self._frame_cache[key] = lp_buffer.value
+        return self._frame_cache[key]
 
     def _read_val(self, lp_base_address: int, lp_buffer):
-        bytes_read = ctypes.c_size_t()
-        if ctypes.windll.kernel32.ReadProcessMemory(
-            self.handle,
-            lp_base_address,
-            ctypes.byref(lp_buffer),
-            ctypes.sizeof(lp_buffer),
-            ctypes.byref(bytes_read),
-        ):
+        key = (lp_base_address, type(lp_buffer))
+        if key in self._frame_cache:
+            return self._frame_cache[key]
+        if self.backend.read_into(lp_base_address, lp_buffer):
+            self._frame_cache[key] = lp_buffer.value
             return lp_buffer.value
         raise ReferenceError(
             lp_base_address
@@ -71,6 +133,27 @@ class LocProcess(Process):
         lp_buffer = ctypes.c_uint64()
         return self._read_val(lp_base_address=lp_base_address, lp_buffer=lp_buffer)
 
+    def read_bytes(self, lp_base_address: int, size: int) -> bytes:
+        """Read a contiguous block of memory in a single backend read."""
+        key = (lp_base_address, size)
+        if key in self._frame_cache:
+            data = self._frame_cache[key]
+        else:
+            data = self.backend.read_bytes(lp_base_address, size)
+            # Failed reads are cached too (as None), so they aren't retried this frame
+            self._frame_cache[key] = data
+        if data is None:
+            raise ReferenceError(lp_base_address)
+        return data
+
+    def read_vectored(self, ranges: list[tuple[int, int]]) -> list[Optional[bytes]]:
+        """Read several (address, size) ranges. Failed ranges are returned as None."""
+        missing = [key for key in ranges if key not in self._frame_cache]
+        if missing:
+            for key, data in zip(missing, self.backend.read_vectored(missing)):
+                self._frame_cache[key] = data
+        return [self._frame_cache.get(key) for key in ranges]
+
     def read_string(self, lp_base_address: int, str_len: int) -> str:
         ret = ""
         for i in range(str_len):
@@ -79,6 +162,80 @@ class LocProcess(Process):
         return ret
 
 
+class ReadPlan:
+    """
+    Set of typed fields to read in one go. Fields that lie within `max_gap` bytes
+    of each other are coalesced into a single contiguous read, and the decoded
+    values are stored in the frame cache so the regular read_* calls return them.
+    """
+
+    def __init__(self, process: LocProcess, max_gap: int = 0x40):
+        self.process = process
+        self.max_gap = max_gap
+        # (address, ctypes type), with None standing for LocProcess.read (c_uint)
+        # and an int for a block of that many bytes (LocProcess.read_bytes)
+        self._fields: set[tuple[int, Optional[type | int]]] = set()
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def add(self, address: int, ctype: Optional[type | int] = None) -> None:
+        self._fields.add((address, ctype))
+
+    def add_bytes(self, address: int, size: int) -> None:
+        self.add(address, size)
+
+    def add_u8(self, address: int) -> None:
+        self.add(address, ctypes.c_uint8)
+
+    def add_u32(self, address: int) -> None:
+        self.add(address, ctypes.c_uint32)
+
+    def add_double(self, address: int) -> None:
+        self.add(address, ctypes.c_double)
+
+    @staticmethod
+    def _size(ctype: Optional[type | int]) -> int:
+        if isinstance(ctype, int):
+            return ctype
+        return ctypes.sizeof(ctypes.c_uint if ctype is None else ctype)
+
+    def ranges(self) -> list[tuple[int, int]]:
+        """Merge the registered fields into the fewest (address, size) ranges."""
+        ranges: list[tuple[int, int]] = []
+        for address, ctype in sorted(self._fields, key=lambda field: field[0]):
+            end = address + self._size(ctype)
+            if ranges and address - (ranges[-1][0] + ranges[-1][1]) <= self.max_gap:
+                start, size = ranges[-1]
+                ranges[-1] = (start, max(start + size, end) - start)
+            else:
+                ranges.append((address, end - address))
+        return ranges
+
+    def execute(self) -> int:
+        """Perform the reads and scatter the values to the fields. Returns the number of reads."""
+        ranges = self.ranges()
+        blocks = self.process.read_vectored(ranges)
+        fields = sorted(self._fields, key=lambda field: field[0])
+        seed = self.process.seed_frame_cache
+        i = 0
+        for (start, size), block in zip(ranges, blocks):
+            while i < len(fields) and fields[i][0] < start + size:
+                address, ctype = fields[i]
+                i += 1
+                # Unreadable ranges are skipped, the per-field read will raise as usual
+                if block is None:
+                    continue
+                if isinstance(ctype, int):
+                    offset = address - start
+                    seed(address, ctype, block[offset : offset + ctype])
+                    continue
+                decoder = ctypes.c_uint if ctype is None else ctype
+                value = decoder.from_buffer_copy(block, address - start).value
+                seed(address, ctype, value)
+        return len(ranges)
+
+
 # Process Permissions
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_OPERATION = 0x0008
@@ -96,6 +253,9 @@ class EvolandMemory(ReadWriteMemory):
     def initialize(
         self, process_name: str = "Evoland.exe", dll_name: str = "libhl.dll"
     ):
+        # Windows only, imported here so memory images work on any platform
+        import pymem
+
         pm = pymem.Pymem(process_name)
         self.base_addr = pymem.process.module_from_name(
             pm.process_handle, dll_name
@@ -106,6 +266,51 @@ class EvolandMemory(ReadWriteMemory):
 
         self.process = self._get_process_by_name(process_name)
         self.process.open()
+        self.process.backend = WindowsBackend(self.process.handle)
+
+    def initialize_linux(self, pid: int, dll_name: str = "libhl.dll"):
+        """Read from the game running as a Linux process, such as under Wine."""
+        backend = LinuxBackend(pid)
+        self.base_addr = backend.module_base(dll_name)
+        self.process.pid = pid
+        self.process.name = f"pid {pid}"
+        self.process.backend = backend
+        logger.debug(f"Base address of {dll_name} in pid {pid}: {hex(self.base_addr)}")
+
+    def initialize_image(self, filename: str):
+        """Serve all reads from a memory image file instead of the game."""
+        image = MemoryImage(filename)
+        self.base_addr = image.base_addr
+        self.process.name = filename
+        self.process.backend = image
+        logger.debug(f"Base address of memory image {filename}: {hex(self.base_addr)}")
+
+    def initialize_replay(self, filename: str, checkpoint: Optional[str] = None):
+        """Serve reads frame by frame from a memory recording instead of the game."""
+        replay = ReplayBackend(filename)
+        if checkpoint in replay.labels:
+            replay.seek_label(checkpoint)
+        self.base_addr = replay.base_addr
+        self.process.name = filename
+        self.process.backend = replay
+        logger.debug(f"Replaying {filename} ({len(replay.index)} chunks)")
+
+    def start_recording(self, filename: str) -> None:
+        """Record the reads of every frame to a file (see memory_replay in config)."""
+        self.process.backend = RecordingBackend(
+            self.process.backend, filename=filename, base_addr=self.base_addr
+        )
+        # The index is written when the recording is closed
+        atexit.register(self.process.backend.close)
+
+    def start_capture(self) -> None:
+        """Keep a copy of every read from now on, see save_capture."""
+        if not isinstance(self.process.backend, CaptureBackend):
+            self.process.backend = CaptureBackend(self.process.backend)
+
+    def save_capture(self, filename: str) -> None:
+        """Save everything read since start_capture as a memory image (see memory_image in config)."""
+        self.process.backend.save(filename, self.base_addr)
 
     def _get_process_by_name(self, process_name: str | bytes) -> LocProcess:
         """
@@ -142,9 +347,40 @@ class EvolandMemory(ReadWriteMemory):
         raise ReadWriteMemoryError(f'Process "{self.process.name}" not found!')
 
 
-_mem = EvolandMemory()
-_mem.initialize("Evoland.exe", "libhl.dll")
+_mem: Optional[EvolandMemory] = None
+
+
+def _attach() -> EvolandMemory:
+    mem = EvolandMemory()
+    config = open_config()
+    if config.get("memory_image"):
+        mem.initialize_image(config["memory_image"])
+    elif config.get("memory_replay"):
+        mem.initialize_replay(config["memory_replay"], config.get("checkpoint"))
+    else:
+        if config.get("memory_pid"):
+            mem.initialize_linux(config["memory_pid"], "libhl.dll")
+        else:
+            mem.initialize("Evoland.exe", "libhl.dll")
+        if config.get("memory_record"):
+            mem.start_recording(config["memory_record"])
+    return mem
 
 
 def mem_handle() -> EvolandMemory:
+    # Attached on first use, so importing memory (such as in the ATB planner's
+    # worker processes) doesn't need the game
+    global _mem
+    if _mem is None:
+        _mem = _attach()
     return _mem
+
+
+def advance_frame() -> None:
+    """Start a new frame epoch, invalidating all reads cached during the previous one."""
+    mem_handle().process.advance_frame()
+
+
+def mark_checkpoint(name: str) -> None:
+    """Tag the current frame in memory recordings, so replay can start from it."""
+    mem_handle().process.backend.mark(name)
@@ -5,24 +5,30 @@ from memory.evo1.diablo import (
     Evo1DiabloMemory,
     get_diablo_memory,
     load_diablo_memory,
+    refresh_diablo_memory,
 )
 from memory.evo1.kind import EKind, IKind, MKind
 from memory.evo1.map_id import MapID
 from memory.evo1.zelda import (
+    ActorDiff,
     Evo1GameEntity2D,
     Evo1ZeldaMemory,
     get_zelda_memory,
     load_zelda_memory,
+    refresh_zelda_memory,
 )
 
 __all__ = [
     "BattleEntity",
     "BattleMemory",
     "load_zelda_memory",
+    "refresh_zelda_memory",
     "get_zelda_memory",
     "Evo1ZeldaMemory",
     "Evo1GameEntity2D",
+    "ActorDiff",
     "load_diablo_memory",
+    "refresh_diablo_memory",
     "get_diablo_memory",
     "Evo1DiabloMemory",
     "Evo1DiabloEntity",
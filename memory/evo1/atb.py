@@ -2,120 +2,79 @@
 import contextlib
 import logging
 
-from memory.core import LIBHL_OFFSET, LocProcess, mem_handle
+from memory.core import LIBHL_OFFSET, ReadPlan, mem_handle
 from memory.evo1.zelda import get_zelda_memory
+from memory.layout import Field, Layout, LayoutObject
 
 logger = logging.getLogger(__name__)
 
 
-class BattleEntity:
-    _TIMER_SINCE_TURN_PTR = [0xD0]  # double (could also be animation frame counter?)
-    _MAX_HP_PTR = [0xF0]  # int
-    _CUR_HP_PTR = [0xF4]  # int
-    _ATK_PTR = [0xF8]  # int
-    _DEF_PTR = [0xFC]  # int
-    _EVADE_PTR = [0x100]  # int
-    _MAGIC_PTR = [0x104]  # int
-    _TURN_GAUGE_PTR = [0x110]  # double: [0-1.0]
-    _TURN_GAUGE_SPEED_PTR = [0x118]  # double
-    _TURN_COUNTER_PTR = [0x154]  # int
-    _IS_RUNNING_PTR = [0x109]  # byte
-
-    _NAME_BUF_PTR = [0x3C, 0x4, 0x0]  # string buffer (2-byte unicode)
-    _NAME_LEN_PTR = [0x3C, 0x8]  # string buffer len
-
-    # 0x3C seems to be the name structure. Followed by 0x4 the string buffer, 0x8 the amount of chars
-
-    def __init__(self, process: LocProcess, entity_ptr: int):
-        self.process = process
-        self.entity_ptr = entity_ptr
-        self.setup_pointers()
-
-    def setup_pointers(self) -> None:
-        self.max_hp_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MAX_HP_PTR
-        )
-        self.cur_hp_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._CUR_HP_PTR
-        )
-        self.atk_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._ATK_PTR)
-        self.def_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._DEF_PTR)
-        self.evade_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._EVADE_PTR
-        )
-        self.magic_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MAGIC_PTR
-        )
-        self.turn_gauge_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_GAUGE_PTR
-        )
-        self.turn_gauge_speed_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_GAUGE_SPEED_PTR
-        )
-        self.turn_counter_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TURN_COUNTER_PTR
-        )
-        self.timer_since_turn_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TIMER_SINCE_TURN_PTR
-        )
-        self.name_buf_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._NAME_BUF_PTR
-        )
-        self.name_len_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._NAME_LEN_PTR
-        )
-        self.is_running_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._IS_RUNNING_PTR
-        )
+class BattleEntity(LayoutObject):
+    _LAYOUT = Layout(
+        "BattleEntity",
+        # 0x3C seems to be the name structure. Followed by 0x4 the string buffer, 0x8 the amount of chars
+        name_buf=Field(0x3C, "I", deref=(0x4,)),  # string buffer (2-byte unicode)
+        name_len=Field(0x3C, "I", deref=(0x8,)),  # string buffer len
+        timer_since_turn=Field(0xD0, "d"),  # could also be animation frame counter?
+        max_hp=Field(0xF0, "I"),
+        cur_hp=Field(0xF4, "I"),
+        attack=Field(0xF8, "I"),
+        defense=Field(0xFC, "I"),
+        evade=Field(0x100, "I"),
+        magic=Field(0x104, "I"),
+        is_running=Field(0x109, "B"),
+        turn_gauge=Field(0x110, "d"),  # [0-1.0]
+        turn_gauge_speed=Field(0x118, "d"),
+        turn_counter=Field(0x154, "I"),
+    )
 
     @property
     def name(self) -> str:
-        num_chars = self.process.read_u32(self.name_len_ptr)
-        return self.process.read_string(self.name_buf_ptr, num_chars)
+        return self.process.read_string(self.fields.name_buf, self.fields.name_len)
 
     @property
     def max_hp(self) -> int:
-        return self.process.read_u32(self.max_hp_ptr)
+        return self.fields.max_hp
 
     @property
     def cur_hp(self) -> int:
-        return self.process.read_u32(self.cur_hp_ptr)
+        return self.fields.cur_hp
 
     @property
     def attack(self) -> int:
-        return self.process.read_u32(self.atk_ptr)
+        return self.fields.attack
 
     @property
     def defense(self) -> int:
-        return self.process.read_u32(self.def_ptr)
+        return self.fields.defense
 
     @property
     def evade(self) -> int:
-        return self.process.read_u32(self.evade_ptr)
+        return self.fields.evade
 
     @property
     def magic(self) -> int:
-        return self.process.read_u32(self.magic_ptr)
+        return self.fields.magic
 
     @property
     def turn_gauge(self) -> float:
-        return self.process.read_double(self.turn_gauge_ptr)
+        return self.fields.turn_gauge
 
     @property
     def turn_gauge_speed(self) -> float:
-        return self.process.read_double(self.turn_gauge_speed_ptr)
+        return self.fields.turn_gauge_speed
 
     @property
     def timer_since_turn(self) -> float:
-        return self.process.read_double(self.timer_since_turn_ptr)
+        return self.fields.timer_since_turn
 
     @property
     def turn_counter(self) -> int:
-        return self.process.read_u32(self.turn_counter_ptr)
+        return self.fields.turn_counter
 
     @property
     def running(self) -> bool:
-        return self.process.read_u8(self.is_running_ptr) == 1
+        return self.fields.is_running == 1
 
 
 class BattleMemory:
@@ -150,6 +109,7 @@ class BattleMemory:
         self.base_offset = self.process.get_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._BATTLE_BASE_PTR
         )
+        self.process.watch_generation("battle", self.process.read(self.base_offset))
 
         self.menu_open = False
         self.spec_menu_open = False
@@ -171,6 +131,13 @@ class BattleMemory:
         except ReferenceError:
             self.active = False
 
+        if self.active:
+            # Gauges are polled every tick, fetch all entities in as few reads as possible
+            plan = ReadPlan(self.process)
+            for entity in self.allies + self.enemies:
+                entity.plan_reads(plan)
+            plan.execute()
+
         if self.active:
             with contextlib.suppress(ValueError):
                 self.cursor_ptr = self.process.get_pointer(
@@ -188,17 +155,24 @@ class BattleMemory:
         self, array_size_ptr: list[int], array_base_ptr: list[int]
     ) -> list[BattleEntity]:
         entities: list[BattleEntity] = []
-        entities_arr_size_ptr = self.process.get_pointer(
+        entities_arr_size_ptr = self.process.resolve_pointer(
             self.base_offset, offsets=array_size_ptr
         )
         entities_arr_size = self.process.read_u32(entities_arr_size_ptr)
-        entities_arr_offset = self.process.get_pointer(
+        entities_arr_offset = self.process.resolve_pointer(
             self.base_offset, offsets=array_base_ptr
         )
+        # Defeated entities are removed from the array, shifting the slots
+        self.process.watch_generation(
+            f"battle_{array_base_ptr}",
+            (self.process.read(entities_arr_offset), entities_arr_size),
+        )
         for i in range(entities_arr_size):
             # Set enemy offsets
             entity_offset = self._FIRST_ENT_OFFSET + i * self._ENT_PTR_SIZE
-            entity_ptr = self.process.get_pointer(entities_arr_offset, [entity_offset])
+            entity_ptr = self.process.resolve_pointer(
+                entities_arr_offset, [entity_offset]
+            )
             entities.append(BattleEntity(self.process, entity_ptr))
         return entities
 
@@ -40,21 +40,25 @@ class Evoland1Memory:
         self.process = mem.process
         self.base_addr = mem.base_addr
 
-        self.base_ptr = self.process.get_pointer(
+        self.base_ptr = self.process.resolve_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._GAME_PTR
         )
         self.setup_pointers()
 
     def setup_pointers(self):
-        self.player_hp_overworld_ptr = self.process.get_pointer(
+        # The map is the generation root, so it is always resolved from scratch
+        self.map_id_ptr = self.process.get_pointer(self.base_ptr, self._MAP_ID_PTR)
+        self.process.watch_generation("map_id", self.process.read(self.map_id_ptr))
+
+        self.player_hp_overworld_ptr = self.process.resolve_pointer(
             self.base_ptr, offsets=self._PLAYER_HP_OVERWORLD_PTR
         )
-        self.gli_ptr = self.process.get_pointer(self.base_ptr, offsets=self._GLI_PTR)
-        self.map_id_ptr = self.process.get_pointer(self.base_ptr, self._MAP_ID_PTR)
-        self.lvl_ptr = self.process.get_pointer(self.base_ptr, self._PLAYER_LVL_PTR)
-        self.current_weapon_ptr = self.process.get_pointer(
+        self.gli_ptr = self.process.resolve_pointer(self.base_ptr, self._GLI_PTR)
+        self.lvl_ptr = self.process.resolve_pointer(self.base_ptr, self._PLAYER_LVL_PTR)
+        self.current_weapon_ptr = self.process.resolve_pointer(
             self.base_ptr, self._CUR_WEAPON_PTR
         )
+        # Not cached: the inventory array is reallocated when picking up new items
         self.nr_potions_ptr = self.process.get_pointer(self.base_ptr, self._NR_POTIONS)
 
     # Only valid in zelda map
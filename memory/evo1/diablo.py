@@ -1,8 +1,9 @@
 # Libraries and Core Files
 import logging
+from typing import Optional
 
-from memory.core import LocProcess
-from memory.evo1.zelda import Evo1GameEntity2D, Evo1ZeldaMemory
+from memory.evo1.zelda import ActorDiff, Evo1GameEntity2D, Evo1ZeldaMemory
+from memory.layout import Field
 
 logger = logging.getLogger(__name__)
 
@@ -11,19 +12,16 @@ logger = logging.getLogger(__name__)
 class Evo1DiabloEntity(Evo1GameEntity2D):
     """Memory representation of HackMonster (Sarudnahk section)."""
 
-    _MKIND_PTR = [0xA4, 0x4]  # MKind enum (overrides base class)
-    _HP_PTR = [0x108]  # double (overrides base class)
-
-    def __init__(self, process: LocProcess, entity_ptr: int):
-        super().__init__(process, entity_ptr)
-        # Overrides
-        self.mkind_ptr = self.process.get_pointer(entity_ptr, offsets=self._MKIND_PTR)
-        self.hp_ptr = self.process.get_pointer(entity_ptr, offsets=self._HP_PTR)
+    _LAYOUT = Evo1GameEntity2D._LAYOUT.extend(
+        "Evo1DiabloEntity",
+        mkind=Field(0xA4, "I", deref=(0x4,)),  # MKind enum (overrides base class)
+        hp=Field(0x108, "d"),  # double (overrides base class)
+    )
 
     # Override (double instead of int)
     @property
     def hp(self) -> float:
-        return self.process.read_double(self.hp_ptr)
+        return self.fields.hp
 
 
 class Evo1DiabloMemory(Evo1ZeldaMemory):
@@ -31,15 +29,23 @@ class Evo1DiabloMemory(Evo1ZeldaMemory):
 
     # Override to get correct class
     def _alloc_monster(self, actor_ptr) -> Evo1DiabloEntity:
-        return Evo1DiabloEntity(self.process, actor_ptr)
+        return Evo1DiabloEntity(self.process, actor_ptr, self.snapshot)
 
 
 _diablo_mem = None
 
 
-def load_diablo_memory() -> None:
+def load_diablo_memory(snapshot: bool = False) -> None:
     global _diablo_mem
-    _diablo_mem = Evo1DiabloMemory()
+    _diablo_mem = Evo1DiabloMemory(snapshot=snapshot)
+
+
+def refresh_diablo_memory(snapshot: bool = False) -> Optional[ActorDiff]:
+    """Refresh the loaded memory in place, loading it from scratch if needed."""
+    if _diablo_mem is None or _diablo_mem.snapshot != snapshot:
+        load_diablo_memory(snapshot=snapshot)
+        return None
+    return _diablo_mem.refresh()
 
 
 def get_diablo_memory() -> Evo1DiabloMemory:
@@ -1,50 +1,55 @@
 # Libraries and Core Files
 import logging
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Tuple
 
 from engine.mathlib import Facing, Vec2
-from memory.core import LIBHL_OFFSET, LocProcess
+from memory.core import LIBHL_OFFSET, LocProcess, ReadPlan
 from memory.evo1.kind import EKind, IKind, IKindToChar, MKind, MKindToChar
 from memory.evo1.zephy import (
     ZephyrosGanonMemory,
     ZephyrosGolemMemory,
     ZephyrosPlayerMemory,
 )
+from memory.layout import Field, Layout, LayoutObject
 from memory.zelda_base import GameEntity2D, ZeldaMemory
 
 logger = logging.getLogger(__name__)
 
 
 # Only valid when instantiated, on the screen that they live
-class Evo1GameEntity2D(GameEntity2D):
-    _ENT_KIND_PTR = [0x4, 0x4]  # int
-    _X_PTR = [0x8]  # double
-    _Y_PTR = [0x10]  # double
-    _X_TILE_PTR = [0x14]  # int
-    _Y_TILE_PTR = [0x18]  # int
-    _SPEED_PTR = [0x20]  # double (quite small numbers, 0.05 for player)
-    _TARGET_PTR = [0x40]  # Target pointer. Only valid if != 0
-    _TARGET_X_OFFSET = 0x18  # In reference to Target
-    _TARGET_Y_OFFSET = 0x20  # In reference to Target
-    _TIMER_PTR = [0x48]  # double (timeout in s)
-    _FACING_PTR = [0x58]  # int
-    _ATTACK_PTR = [0x5C]  # byte, bit 5
-    _CUR_ANIM_PTR = [0x88]  # 4 byte pointer
-    _ROTATION_PTR = [0x90]  # double (left = 0.0, up = 1.57, right = 3.14, down = -1.57)
-    # TODO: _ATTACK_TIMER_PTR = [0xC8]  # double. Attack cooldown
-
-    _IKIND_PTR = [0xA4, 0x4]  # int (MKind)
-    # Just for monster, split class?
-    _MKIND_PTR = [0xA8, 0x4]  # int (MKind)
-    _HP_PTR = [0x100]  # int, for enemies such as knights
-
-    # Just for Hero, split class?
-    _IN_CONTROL_PTR = [0xA4]
-    _ENCOUNTER_TIMER_PTR = [0xD0]  # double. Steps to encounter
-
-    def __init__(self, process: LocProcess, entity_ptr: int):
+class Evo1GameEntity2D(LayoutObject, GameEntity2D):
+    _LAYOUT = Layout(
+        "Evo1GameEntity2D",
+        kind=Field(0x4, "I", deref=(0x4,)),  # EKind
+        x=Field(0x8, "d"),
+        y=Field(0x10, "d"),
+        x_tile=Field(0x14, "I"),
+        y_tile=Field(0x18, "I"),
+        speed=Field(0x20, "d"),  # quite small numbers, 0.05 for player
+        target=Field(0x40, "I"),  # Target pointer. Only valid if != 0
+        target_x=Field(0x40, "d", deref=(0x18,)),
+        target_y=Field(0x40, "d", deref=(0x20,)),
+        timer=Field(0x48, "d"),  # timeout in s
+        facing=Field(0x58, "I"),
+        attack=Field(0x5C, "B"),  # bit 5
+        cur_anim=Field(0x88, "I"),  # pointer
+        rotation=Field(0x90, "d"),  # left = 0.0, up = 1.57, right = 3.14, down = -1.57
+        # TODO: attack_timer=Field(0xC8, "d"),  # Attack cooldown
+        # Just for interactibles/monsters, split class?
+        ikind=Field(0xA4, "I", deref=(0x4,)),  # IKind
+        mkind=Field(0xA8, "I", deref=(0x4,)),  # MKind
+        hp=Field(0x100, "I"),  # for enemies such as knights
+        # Just for Hero, split class?
+        in_control=Field(0xA4, "B"),
+        encounter_timer=Field(0xD0, "d"),  # Steps to encounter
+    )
+
+    def __init__(self, process: LocProcess, entity_ptr: int, snapshot: bool = False):
         super().__init__(process=process, entity_ptr=entity_ptr)
-        self.setup_pointers()
+        # In snapshot mode the entity is frozen until the next take_snapshot, instead
+        # of being read again every frame.
+        if snapshot:
+            self.take_snapshot()
 
     def __eq__(self, other: object) -> bool:
         actor_kind = self.kind
@@ -57,56 +62,9 @@ class Evo1GameEntity2D(GameEntity2D):
                 kind_match = self.ikind == other.ikind
         return kind_match and pos_match
 
-    def setup_pointers(self) -> None:
-        self.ent_kind_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._ENT_KIND_PTR
-        )
-        self.x_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._X_PTR)
-        self.y_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._Y_PTR)
-        self.x_tile_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._X_TILE_PTR
-        )
-        self.y_tile_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._Y_TILE_PTR
-        )
-        self.speed_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._SPEED_PTR
-        )
-        self.target_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TARGET_PTR
-        )
-        self.timer_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TIMER_PTR
-        )
-        self.facing_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._FACING_PTR
-        )
-        self.attack_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._ATTACK_PTR
-        )
-        self.rotation_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._ROTATION_PTR
-        )
-        self.hp_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._HP_PTR)
-        self.in_control_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._IN_CONTROL_PTR
-        )
-        self.encounter_timer_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._ENCOUNTER_TIMER_PTR
-        )
-        self.cur_anim_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._CUR_ANIM_PTR
-        )
-        self.mkind_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._MKIND_PTR
-        )
-        self.ikind_ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._IKIND_PTR
-        )
-
     @property
     def kind(self) -> EKind:
-        kind_val = self.process.read_u32(self.ent_kind_ptr)
+        kind_val = self.fields.kind
         try:
             return EKind(kind_val)
         except ValueError:
@@ -150,53 +108,43 @@ class Evo1GameEntity2D(GameEntity2D):
 
     @property
     def pos(self) -> Vec2:
-        return Vec2(
-            self.process.read_double(self.x_ptr),
-            self.process.read_double(self.y_ptr),
-        )
+        return Vec2(self.fields.x, self.fields.y)
 
     @property
     def tile_pos(self) -> Tuple[int, int]:
-        return [
-            self.process.read_u32(self.x_tile_ptr),
-            self.process.read_u32(self.y_tile_ptr),
-        ]
+        return [self.fields.x_tile, self.fields.y_tile]
 
     @property
     def speed(self) -> float:
-        return self.process.read_double(self.speed_ptr)
+        return self.fields.speed
 
     @property
     def target(self) -> Optional[Vec2]:
-        target_ptr = self.process.read_u32(self.target_ptr)
-        if target_ptr != 0:
-            return Vec2(
-                x=self.process.read_double(target_ptr + self._TARGET_X_OFFSET),
-                y=self.process.read_double(target_ptr + self._TARGET_Y_OFFSET),
-            )
+        if self.fields.target != 0:
+            return Vec2(x=self.fields.target_x, y=self.fields.target_y)
         return None
 
     @property
     def timer(self) -> float:
-        return self.process.read_double(self.timer_ptr)
+        return self.fields.timer
 
     # 0=left,1=right,2=up,3=down. Doesn't do diagonal facings.
     @property
     def facing(self) -> Facing:
-        return self.process.read_u32(self.facing_ptr)
+        return self.fields.facing
 
     @property
     def is_attacking(self) -> bool:
-        attacking = self.process.read_u8(self.attack_ptr)
+        attacking = self.fields.attack
         return attacking & 0x10  # Bit5 denotes attacking
 
     @property
     def rotation(self) -> float:
-        return self.process.read_double(self.rotation_ptr)
+        return self.fields.rotation
 
     @property
     def cur_anim(self) -> int:
-        return self.process.read_u32(self.cur_anim_ptr)
+        return self.fields.cur_anim
 
     def __repr__(self) -> str:
         kind = self.kind
@@ -206,7 +154,7 @@ class Evo1GameEntity2D(GameEntity2D):
     # Only interactible
     @property
     def ikind(self) -> IKind:
-        ikind_val = self.process.read_u32(self.ikind_ptr)
+        ikind_val = self.fields.ikind
         try:
             return IKind(ikind_val)
         except ValueError:
@@ -216,7 +164,7 @@ class Evo1GameEntity2D(GameEntity2D):
     # Only monster
     @property
     def mkind(self) -> MKind:
-        mkind_val = self.process.read_u32(self.mkind_ptr)
+        mkind_val = self.fields.mkind
         try:
             return MKind(mkind_val)
         except ValueError:
@@ -225,20 +173,27 @@ class Evo1GameEntity2D(GameEntity2D):
 
     @property
     def hp(self) -> int:
-        return self.process.read_u32(self.hp_ptr)
+        return self.fields.hp
 
     # Only Hero
     @property
     def not_in_control(self) -> bool:
-        return self.process.read_u8(self.in_control_ptr) == 1
+        return self.fields.in_control == 1
 
     @property
     def in_control(self) -> bool:
-        return self.process.read_u8(self.in_control_ptr) == 0
+        return self.fields.in_control == 0
 
     @property
     def encounter_timer(self) -> float:
-        return self.process.read_double(self.encounter_timer_ptr)
+        return self.fields.encounter_timer
+
+
+class ActorDiff(NamedTuple):
+    """Actors that appeared/disappeared since the previous refresh."""
+
+    added: list[Evo1GameEntity2D]
+    removed: list[Evo1GameEntity2D]
 
 
 class Evo1ZeldaMemory(ZeldaMemory):
@@ -259,11 +214,23 @@ class Evo1ZeldaMemory(ZeldaMemory):
     _ZEPHY_PTR = [0x24]
     _ZEPHY_DIALOG_PTR = [0x4]
 
-    def __init__(self):
+    def __init__(self, snapshot: bool = False):
         super().__init__()
+        # Entities are created in snapshot mode (one read per entity block)
+        self.snapshot = snapshot
+        # Entity objects are keyed by (slot address, entity address) so they can be
+        # kept between refreshes for as long as the slot points to the same entity.
+        self.player_key: Optional[tuple[int, int]] = None
+        self.actor_keys: list[tuple[int, int]] = []
+        self.actors: list[Evo1GameEntity2D] = []
+        self.refresh()
+
+    def refresh(self) -> ActorDiff:
+        """Update the memory in place. Only actors in new or changed slots are rebuilt."""
         self.base_offset = self.process.get_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._ZELDA_PTR
         )
+        self.process.watch_generation("zelda", self.process.read(self.base_offset))
 
         self.zephy_fight_ptr = self.process.get_pointer(
             self.base_offset, self._ZEPHY_FIGHT_PTR
@@ -280,14 +247,18 @@ class Evo1ZeldaMemory(ZeldaMemory):
             )
 
         self._init_player()
-        self._init_actors()
+        return self._init_actors()
 
     def _init_player(self):
-        player_ptr = self.process.get_pointer(self.base_offset, self._PLAYER_PTR)
-        self.player = Evo1GameEntity2D(self.process, player_ptr)
-
-    def _init_actors(self):
-        self.actors: list[Evo1GameEntity2D] = []
+        player_ptr = self.process.resolve_pointer(self.base_offset, self._PLAYER_PTR)
+        player_key = (player_ptr, self.process.read(player_ptr))
+        if player_key != self.player_key:
+            self.player = Evo1GameEntity2D(self.process, player_ptr, self.snapshot)
+            self.player_key = player_key
+        elif self.snapshot:
+            self.player.take_snapshot()
+
+    def _init_actors(self) -> ActorDiff:
         actor_arr_size_ptr = self.process.get_pointer(
             self.base_offset, offsets=self._ACTOR_ARR_SIZE_PTR
         )
@@ -295,15 +266,43 @@ class Evo1ZeldaMemory(ZeldaMemory):
         actor_arr_offset = self.process.get_pointer(
             self.base_offset, offsets=self._ACTOR_ARR_PTR
         )
+        # Actor slots are reused/reallocated when the array changes, invalidating cached chains
+        self.process.watch_generation(
+            "actors", (self.process.read(actor_arr_offset), actor_arr_size)
+        )
+        prev_actors = dict(zip(self.actor_keys, self.actors))
+        actor_keys: list[tuple[int, int]] = []
+        actors: list[Evo1GameEntity2D] = []
+        added: list[Evo1GameEntity2D] = []
         for i in range(actor_arr_size):
             # Set enemy offsets
             actor_offset = self._ACTOR_BASE_ADDR + i * self._ACTOR_PTR_SIZE
-            actor_ptr = self.process.get_pointer(actor_arr_offset, [actor_offset])
-            self.actors.append(self._alloc_monster(actor_ptr))
+            actor_ptr = self.process.resolve_pointer(actor_arr_offset, [actor_offset])
+            actor_key = (actor_ptr, self.process.read(actor_ptr))
+            actor = prev_actors.pop(actor_key, None)
+            if actor is None:
+                actor = self._alloc_monster(actor_ptr)
+                added.append(actor)
+            elif self.snapshot:
+                actor.take_snapshot()
+            actor_keys.append(actor_key)
+            actors.append(actor)
+        # Only swap in the new table once every slot has been read successfully
+        self.actor_keys = actor_keys
+        self.actors = actors
+        return ActorDiff(added=added, removed=list(prev_actors.values()))
+
+    def prefetch(self, max_gap: int = 0x40) -> int:
+        """Read the fields of the player and all actors in as few reads as possible."""
+        plan = ReadPlan(self.process, max_gap=max_gap)
+        self.player.plan_reads(plan)
+        for actor in self.actors:
+            actor.plan_reads(plan)
+        return plan.execute()
 
     # OVERRIDE
     def _alloc_monster(self, actor_ptr) -> Evo1GameEntity2D:
-        return Evo1GameEntity2D(self.process, actor_ptr)
+        return Evo1GameEntity2D(self.process, actor_ptr, self.snapshot)
 
     @property
     def in_zephy_fight(self) -> bool:
@@ -338,9 +337,17 @@ class Evo1ZeldaMemory(ZeldaMemory):
 _zelda_mem = None
 
 
-def load_zelda_memory() -> None:
+def load_zelda_memory(snapshot: bool = False) -> None:
     global _zelda_mem
-    _zelda_mem = Evo1ZeldaMemory()
+    _zelda_mem = Evo1ZeldaMemory(snapshot=snapshot)
+
+
+def refresh_zelda_memory(snapshot: bool = False) -> Optional[ActorDiff]:
+    """Refresh the loaded memory in place, loading it from scratch if needed."""
+    if _zelda_mem is None or _zelda_mem.snapshot != snapshot:
+        load_zelda_memory(snapshot=snapshot)
+        return None
+    return _zelda_mem.refresh()
 
 
 def get_zelda_memory() -> Evo1ZeldaMemory:
@@ -3,40 +3,43 @@ from engine.mathlib import Vec2
 from memory.core import LocProcess
 from memory.evo2.entity.kind import EKind
 from memory.evo2.sprite import Sprite
+from memory.layout import Field, Layout, LayoutObject
 from memory.zelda_base import GameEntity2D
 
 
 # Only valid when instantiated, on the screen that they live
-class entEntity(GameEntity2D):
+class entEntity(LayoutObject, GameEntity2D):
     """ent.Entity hashlink class."""
 
-    _HASHLINK_PTR = [0x0]  # ptr to hl_type
-    _GAME_PTR = [0x4]  # ptr to HOBJ
-    _EVENT_PTR = [0x8]  # ptr to HOBJ
-    _MASS_PTR = [0x10]  # double
-    _TMP_PTR = [0x18]  # ptr to HOBJ
-    _COLLIDE_BOUNDS = [0x1C]  # ptr to HOBJ
-    _HIT_BOUNDS = [0x20]  # ptr to HOBJ
-    _KIND_PTR = [0x24, 0x4]  # ptr to HENUM EKind
-    _CACHED_KIND_STR = [0x28]  # ptr to HOBJ
-    _SPRITE_PTR = [0x2C]  # ptr to HOBJ
-    _IS_COLLIDE_PTR = [0x30]  # bool
-    _TARGET_ROTATION_PTR = [0x38]  # double
-    _DO_RECAL_PTR = [0x40]  # bool
-    _DO_SCRIPT_LOCK_PTR = [0x41]  # bool
-    _DO_CAN_BE_FREEZE_PTR = [0x42]  # bool
-    _DO_IS_3D_PTR = [0x43]  # bool
-    _FXS_PTR = [0x44]  # ptr to HOBJ
-    _CHECK_FULL_MOVE_PTR = [0x48]  # bool
-    _REAL_DT_PTR = [0x50]  # double
-    _CHANNELS_PTR = [0x58]  # ptr to HOBJ
-    _IS_SHAKING_PTR = [0x5C]  # bool
-    _PUSHING_BACK_PTR = [0x60]  # int
+    _LAYOUT = Layout(
+        "entEntity",
+        hashlink=Field(0x0, "I"),  # ptr to hl_type
+        game=Field(0x4, "I"),  # ptr to HOBJ
+        event=Field(0x8, "I"),  # ptr to HOBJ
+        mass=Field(0x10, "d"),
+        tmp=Field(0x18, "I"),  # ptr to HOBJ
+        collide_bounds=Field(0x1C, "I"),  # ptr to HOBJ
+        hit_bounds=Field(0x20, "I"),  # ptr to HOBJ
+        kind=Field(0x24, "I", deref=(0x4,)),  # ptr to HENUM EKind
+        cached_kind_str=Field(0x28, "I"),  # ptr to HOBJ
+        sprite=Field(0x2C, "I"),  # ptr to HOBJ
+        is_collide=Field(0x30, "B"),  # bool
+        target_rotation=Field(0x38, "d"),
+        do_recal=Field(0x40, "B"),  # bool
+        do_script_lock=Field(0x41, "B"),  # bool
+        do_can_be_freeze=Field(0x42, "B"),  # bool
+        do_is_3d=Field(0x43, "B"),  # bool
+        fxs=Field(0x44, "I"),  # ptr to HOBJ
+        check_full_move=Field(0x48, "B"),  # bool
+        real_dt=Field(0x50, "d"),
+        channels=Field(0x58, "I"),  # ptr to HOBJ
+        is_shaking=Field(0x5C, "B"),  # bool
+        pushing_back=Field(0x60, "I"),
+    )
 
     def __init__(self, process: LocProcess, entity_ptr: int = 0) -> None:
         super().__init__(process, entity_ptr)
-        sprite_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._SPRITE_PTR)
-        self.sprite = Sprite(process, sprite_ptr)
+        self.sprite = Sprite(process, self.address_of("sprite"))
 
     @property
     def ch(self) -> str:
@@ -44,9 +47,7 @@ class entEntity(GameEntity2D):
 
     @property
     def kind(self) -> EKind:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._KIND_PTR)
-        kind = self.process.read_u32(ptr)
-        return EKind(kind)
+        return EKind(self.fields.kind)
 
     @property
     def pos(self) -> Vec2:
@@ -54,7 +55,4 @@ class entEntity(GameEntity2D):
 
     @property
     def rotation(self) -> float:
-        ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._TARGET_ROTATION_PTR
-        )
-        return self.process.read_double(ptr)
+        return self.fields.target_rotation
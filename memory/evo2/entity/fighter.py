@@ -1,24 +1,23 @@
-from memory.core import LocProcess
 from memory.evo2.entity.base import entEntity
+from memory.layout import Field
 
 
 # Only valid when instantiated, on the screen that they live
 class entFighterBase(entEntity):
     """ent.FighterBase hashlink class."""
 
-    _LIFE_PTR = [0x64]  # int
-    _FORCE_AGGRO_PTR = [0x68]  # bool
-    _ID_PTR = [0x6C]  # ptr to HOBJ
-    _W_PTR = [0x70]  # ptr to HOBJ
-    _IS_BLINKING_PTR = [0x74]  # bool (iframes)
-    _FID_PTR = [0x78]  # int
-    _WKIND_PTR = [0x7C, 0x4]  # ptr to HENUM, WKind
-    _COMBO_PTR = [0x80]  # bool
-    _ON_DIE_EVENT_PTR = [0x84]  # ptr to HFUN
-
-    def __init__(self, process: LocProcess, entity_ptr: int = 0) -> None:
-        super().__init__(process, entity_ptr)
-        self.fid_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._FID_PTR)
+    _LAYOUT = entEntity._LAYOUT.extend(
+        "entFighterBase",
+        life=Field(0x64, "I"),
+        force_aggro=Field(0x68, "B"),  # bool
+        id=Field(0x6C, "I"),  # ptr to HOBJ
+        w=Field(0x70, "I"),  # ptr to HOBJ
+        is_blinking=Field(0x74, "B"),  # bool (iframes)
+        fid=Field(0x78, "I"),
+        wkind=Field(0x7C, "I", deref=(0x4,)),  # ptr to HENUM, WKind
+        combo=Field(0x80, "B"),  # bool
+        on_die_event=Field(0x84, "I"),  # ptr to HFUN
+    )
 
     def __eq__(self, other: object) -> bool:
         try:
@@ -29,8 +28,7 @@ class entFighterBase(entEntity):
 
     @property
     def life(self) -> int:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._LIFE_PTR)
-        return self.process.read_u32(ptr)
+        return self.fields.life
 
     @property
     def is_alive(self) -> bool:
@@ -41,22 +39,19 @@ class entFighterBase(entEntity):
 
     @property
     def fid(self) -> int:
-        return self.process.read_u32(self.fid_ptr)
+        return self.fields.fid
 
     @property
     def force_aggro(self) -> bool:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._FORCE_AGGRO_PTR)
-        return self.process.read_u8(ptr) == 1
+        return self.fields.force_aggro == 1
 
     @property
     def iframe(self) -> bool:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._IS_BLINKING_PTR)
-        return self.process.read_u8(ptr) == 1
+        return self.fields.is_blinking == 1
 
     @property
     def combo(self) -> bool:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._COMBO_PTR)
-        return self.process.read_u8(ptr) == 1
+        return self.fields.combo == 1
 
     # TODO: Implement properties
 
@@ -65,38 +60,34 @@ class entFighterBase(entEntity):
 class entZFighter(entFighterBase):
     """ent.z.Fighter hashlink class."""
 
-    _ATTACK_DELAY_PTR = [0x88]  # double
-    _MOVE_LOCK_PTR = [0x90]  # bool, in_control
-    _SPEED_PTR = [0x98]  # double
-    _ROTATION_VAR_PTR = [0xA0]  # double
-    _ROTATION_SPEED_PTR = [0xA8]  # double
-    _WEAPONS_PTR = [0xB0]  # ptr to HOBJ
+    _LAYOUT = entFighterBase._LAYOUT.extend(
+        "entZFighter",
+        attack_delay=Field(0x88, "d"),
+        move_lock=Field(0x90, "B"),  # bool, in_control
+        speed=Field(0x98, "d"),
+        rotation_var=Field(0xA0, "d"),
+        rotation_speed=Field(0xA8, "d"),
+        weapons=Field(0xB0, "I"),  # ptr to HOBJ
+    )
 
     @property
     def attack_delay(self) -> float:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._ATTACK_DELAY_PTR)
-        return self.process.read_double(ptr)
+        return self.fields.attack_delay
 
     @property
     def move_lock(self) -> bool:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._MOVE_LOCK_PTR)
-        return self.process.read_u8(ptr) == 1
+        return self.fields.move_lock == 1
 
     @property
     def speed(self) -> float:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._SPEED_PTR)
-        return self.process.read_double(ptr)
+        return self.fields.speed
 
     @property
     def rotation_var(self) -> float:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._ROTATION_VAR_PTR)
-        return self.process.read_double(ptr)
+        return self.fields.rotation_var
 
     @property
     def rotation_speed(self) -> float:
-        ptr = self.process.get_pointer(
-            self.entity_ptr, offsets=self._ROTATION_SPEED_PTR
-        )
-        return self.process.read_double(ptr)
+        return self.fields.rotation_speed
 
     # TODO: WEAPONS
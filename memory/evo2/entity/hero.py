@@ -1,6 +1,7 @@
 from enum import IntEnum
 
 from memory.evo2.entity.fighter import entZFighter
+from memory.layout import Field
 
 
 class HeroState(IntEnum):
@@ -16,40 +17,41 @@ class HeroState(IntEnum):
 class entZHero(entZFighter):
     """ent.z.Hero hashlink class."""
 
-    _HERO_STATE_PTR = [0xB4, 0x4]  # ptr to HENUM, HeroState
-    _DO_COLLIDE_PTR = [0xB8]  # bool
-    _K_PTR = [0xBC]  # ptr to HOBJ
-    _SPEED_REF_PTR = [0xC0]  # double
-    _SHEATHE_TIME_PTR = [0xC8]  # double
-    _RUN_FRAME_PTR = [0xD0]  # double
-    _CURRENT_PUSH_PTR = [0xD8]  # ptr to HOBJ
-    _PUSH_TIME_PTR = [0xE0]  # double
-    _PT_PTR = [0xE8]  # ptr to HOBJ
-    _PREV_FRAME_PTR = [0xF0]  # double
-    _ON_BOAT_PTR = [0xF8]  # bool
-    _ON_WING_PTR = [0xF9]  # bool
-    _BOAT_TIME_PTR = [0x100]  # double
-    _ALLOW_DEATH_STATE_PTR = [0x108]  # bool
-    _ON_USE_POWER_PTR = [0x10C]  # ptr to HFUN
-    _ANIM_PLAYED_PTR = [0x110]  # bool
-    _ANIM_PLAYED_SPEED_PTR = [0x118]  # double
-    _BOAT_PTR = [0x120]  # ptr to HOBJ
-    _WAIT_ATTACK_END_PTR = [0x124]  # bool
-    _HURT_LOCK_PTR = [0x125]  # bool
-    _IN_CART_PTR = [0x126]  # bool
-    _FLYING_PTR = [0x127]  # bool
-    _ON_LIFT_PTR = [0x128]  # bool
-    _ON_GROUND_PTR = [0x129]  # bool
-    _LAST_PUSH_PTR = [0x130]  # double
-    _PRESS_TIME_PTR = [0x138]  # double
-    _LAST_POS_PTR = [0x140]  # ptr to HOBJ
-    _STOP_MOVING_PTR = [0x144]  # bool
+    _LAYOUT = entZFighter._LAYOUT.extend(
+        "entZHero",
+        hero_state=Field(0xB4, "I", deref=(0x4,)),  # ptr to HENUM, HeroState
+        do_collide=Field(0xB8, "B"),  # bool
+        k=Field(0xBC, "I"),  # ptr to HOBJ
+        speed_ref=Field(0xC0, "d"),
+        sheathe_time=Field(0xC8, "d"),
+        run_frame=Field(0xD0, "d"),
+        current_push=Field(0xD8, "I"),  # ptr to HOBJ
+        push_time=Field(0xE0, "d"),
+        pt=Field(0xE8, "I"),  # ptr to HOBJ
+        prev_frame=Field(0xF0, "d"),
+        on_boat=Field(0xF8, "B"),  # bool
+        on_wing=Field(0xF9, "B"),  # bool
+        boat_time=Field(0x100, "d"),
+        allow_death_state=Field(0x108, "B"),  # bool
+        on_use_power=Field(0x10C, "I"),  # ptr to HFUN
+        anim_played=Field(0x110, "B"),  # bool
+        anim_played_speed=Field(0x118, "d"),
+        boat=Field(0x120, "I"),  # ptr to HOBJ
+        wait_attack_end=Field(0x124, "B"),  # bool
+        hurt_lock=Field(0x125, "B"),  # bool
+        in_cart=Field(0x126, "B"),  # bool
+        flying=Field(0x127, "B"),  # bool
+        on_lift=Field(0x128, "B"),  # bool
+        on_ground=Field(0x129, "B"),  # bool
+        last_push=Field(0x130, "d"),
+        press_time=Field(0x138, "d"),
+        last_pos=Field(0x140, "I"),  # ptr to HOBJ
+        stop_moving=Field(0x144, "B"),  # bool
+    )
 
     @property
     def hero_state(self) -> HeroState:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._HERO_STATE_PTR)
-        hstate = self.process.read_u32(ptr)
-        return HeroState(hstate)
+        return HeroState(self.fields.hero_state)
 
     @property
     def in_control(self) -> bool:
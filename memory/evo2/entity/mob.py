@@ -2,6 +2,7 @@ from enum import IntEnum
 
 from memory.core import LocProcess
 from memory.evo2.entity.fighter import entZFighter
+from memory.layout import Field, Layout, LayoutObject
 
 
 class MobState(IntEnum):
@@ -29,44 +30,39 @@ class MobState(IntEnum):
     CHANGE_MODE = 21
 
 
-class MobData:
+class MobData(LayoutObject):
     """HVIRTUAL mob data."""
 
-    _ATTACK_PTR = [0xC, 0x0]  # int
-    _DEFENSE_PTR = [0x10, 0x0]  # int
-    _DROP_KIND_PTR = [0x14, 0x0]  # ptr to HOBJ or 0
-    _FLAGS_PTR = [0x18, 0x0]  # int
-    _ID_PTR = [0x1C, 0x0]  # ptr to String
-    _IMAGE_PTR = [0x20, 0x0]  # ptr to HVIRTUAL
-    _LIFE_PTR = [0x24, 0x0]  # int
-    _NAME_PTR = [0x28, 0x0]  # ptr to HOBJ
-    _NPC_REF_PTR = [0x2C, 0x0]  # ptr to HOBJ
-    _SPEED_PTR = [0x30, 0x0]  # double
-    _XP_PTR = [0x34, 0x0]  # int
-
-    def __init__(self, process: LocProcess, base_ptr: int = 0) -> None:
-        self.process = process
-        self.base_ptr = base_ptr
+    _LAYOUT = Layout(
+        "MobData",
+        attack=Field(0xC, "I", deref=(0x0,)),
+        defense=Field(0x10, "I", deref=(0x0,)),
+        drop_kind=Field(0x14, "I", deref=(0x0,)),  # ptr to HOBJ or 0
+        flags=Field(0x18, "I", deref=(0x0,)),
+        id=Field(0x1C, "I", deref=(0x0,)),  # ptr to String
+        image=Field(0x20, "I", deref=(0x0,)),  # ptr to HVIRTUAL
+        life=Field(0x24, "I", deref=(0x0,)),
+        name=Field(0x28, "I", deref=(0x0,)),  # ptr to HOBJ
+        npc_ref=Field(0x2C, "I", deref=(0x0,)),  # ptr to HOBJ
+        speed=Field(0x30, "d", deref=(0x0,)),
+        xp=Field(0x34, "I", deref=(0x0,)),
+    )
 
     @property
     def attack(self) -> int:
-        ptr = self.process.get_pointer(self.base_ptr, offsets=self._ATTACK_PTR)
-        return self.process.read_u32(ptr)
+        return self.fields.attack
 
     @property
     def defense(self) -> int:
-        ptr = self.process.get_pointer(self.base_ptr, offsets=self._DEFENSE_PTR)
-        return self.process.read_u32(ptr)
+        return self.fields.defense
 
     @property
     def life(self) -> int:
-        ptr = self.process.get_pointer(self.base_ptr, offsets=self._LIFE_PTR)
-        return self.process.read_u32(ptr)
+        return self.fields.life
 
     @property
     def xp(self) -> int:
-        ptr = self.process.get_pointer(self.base_ptr, offsets=self._XP_PTR)
-        return self.process.read_u32(ptr)
+        return self.fields.xp
 
     # TODO: More stuff
 
@@ -75,30 +71,30 @@ class MobData:
 class entZMob(entZFighter):
     """ent.z.Mob hashlink class."""
 
-    _C_PTR = [0xB4]  # ptr to HOBJ
-    _MOB_STATE_PTR = [0xB8, 0x4]  # ptr to HENUM, MobState
-    _PATROL_TIME_PTR = [0xC0]  # double
-    _PATROL_SLEEP_PTR = [0xC8]  # double
-    _HURT_LOCK_PTR = [0xD0]  # bool
-    _CELL_TARGET_PTR = [0xD4]  # ptr to HOBJ
-    _DATA_PTR = [0xD8]  # ptr to HOBJ. Template for mob!
-    _AUTO_HERO_COLLIDE_PTR = [0xDC]  # bool
-    _DIED_PLAYED_PTR = [0xDD]  # bool
-    _HERO_HIT_BOUNDS_PTR = [0xE0]  # ptr to HOBJ
-    _SAVE_POS_PTR = [0xE4]  # ptr to HOBJ
-    _SAVE_CPT_PTR = [0xE8]  # double
-    _AGGRO_DECAL_PTR = [0xF0]  # double
+    _LAYOUT = entZFighter._LAYOUT.extend(
+        "entZMob",
+        c=Field(0xB4, "I"),  # ptr to HOBJ
+        mob_state=Field(0xB8, "I", deref=(0x4,)),  # ptr to HENUM, MobState
+        patrol_time=Field(0xC0, "d"),
+        patrol_sleep=Field(0xC8, "d"),
+        hurt_lock=Field(0xD0, "B"),  # bool
+        cell_target=Field(0xD4, "I"),  # ptr to HOBJ
+        data=Field(0xD8, "I"),  # ptr to HOBJ. Template for mob!
+        auto_hero_collide=Field(0xDC, "B"),  # bool
+        died_played=Field(0xDD, "B"),  # bool
+        hero_hit_bounds=Field(0xE0, "I"),  # ptr to HOBJ
+        save_pos=Field(0xE4, "I"),  # ptr to HOBJ
+        save_cpt=Field(0xE8, "d"),
+        aggro_decal=Field(0xF0, "d"),
+    )
 
     def __init__(self, process: LocProcess, entity_ptr: int = 0) -> None:
         super().__init__(process, entity_ptr)
-        data_ptr = self.process.get_pointer(self.entity_ptr, offsets=self._DATA_PTR)
-        self.data = MobData(process, data_ptr)
+        self.data = MobData(process, self.address_of("data"))
 
     @property
     def mob_state(self) -> MobState:
-        ptr = self.process.get_pointer(self.entity_ptr, offsets=self._MOB_STATE_PTR)
-        mstate = self.process.read_u32(ptr)
-        return MobState(mstate)
+        return MobState(self.fields.mob_state)
 
     @property
     def is_enemy(self) -> bool:
@@ -1,47 +1,44 @@
 # Libraries and Core Files
 from engine.mathlib import Vec2
-from memory.core import LocProcess
 from memory.evo2.entity.kind import EKind
+from memory.layout import Field, Layout, LayoutObject
 
 
 # Only valid when instantiated, on the screen that they live
-class Sprite:
+class Sprite(LayoutObject):
     """ent.Entity hashlink class."""
 
-    _HASHLINK_PTR = [0x0]  # ptr to hl_type
-    _KIND_PTR = [0x4, 0x4]  # ptr to HENUM EKind
-    _GAME_PTR = [0x8]  # ptr to HOBJ
-    _ANIM_PTR = [0x10]  # ptr to HOBJ
-    _ANIM_FRAMES_PTR = [0x14]  # ptr to HOBJ
-    _SIZE_PTR = [0x18]  # int
-    _DUMMY_ANIM_TEXT_PTR = [0x1C]  # ptr to HOBJ
-    _CURRENT_BOUNDS_2D_PTR = [0x20]  # ptr to HOBJ
-    _FX_PTR = [0x24]  # ptr to HOBJ
-    _SHADOW_STR = [0x28]  # ptr to HOBJ
-    _SHADOW_Y_PTR = [0x2C]  # int
-    _DEBUG_BOUNDS_COLOR_PTR = [0x30]  # int (rgb)
-    _X_PTR = [0x38]  # double
-    _Y_PTR = [0x40]  # double
-    _Z_PTR = [0x48]  # double
-    _DIR_PTR = [0x50]  # int
-    _ROTATION_PTR = [0x58]  # double
-    _ROTATION_2D_PTR = [0x60]  # double
-    _GLOBAL_SPEED_PTR = [0x68]  # double
-    _BLEND_MODE_PTR = [0x70, 0x4]  # ptr to HENUM, BlendMode
-    _DEBUG_BOUNDS_PTR = [0x74]  # ptr to HOBJ
-    _LEVEL_OVER_VALUE_PTR = [0x78]  # bool
-    _EYES_PTR = [0x7C]  # ptr to HOBJ
-    _FREEZE_FACTOR_PTR = [0x80]  # double
-
-    def __init__(self, process: LocProcess, base_ptr: int = 0) -> None:
-        self.process = process
-        self.base_ptr = base_ptr
+    _LAYOUT = Layout(
+        "Sprite",
+        hashlink=Field(0x0, "I"),  # ptr to hl_type
+        kind=Field(0x4, "I", deref=(0x4,)),  # ptr to HENUM EKind
+        game=Field(0x8, "I"),  # ptr to HOBJ
+        anim=Field(0x10, "I"),  # ptr to HOBJ
+        anim_frames=Field(0x14, "I"),  # ptr to HOBJ
+        size=Field(0x18, "I"),
+        dummy_anim_text=Field(0x1C, "I"),  # ptr to HOBJ
+        current_bounds_2d=Field(0x20, "I"),  # ptr to HOBJ
+        fx=Field(0x24, "I"),  # ptr to HOBJ
+        shadow_str=Field(0x28, "I"),  # ptr to HOBJ
+        shadow_y=Field(0x2C, "I"),
+        debug_bounds_color=Field(0x30, "I"),  # rgb
+        x=Field(0x38, "d"),
+        y=Field(0x40, "d"),
+        z=Field(0x48, "d"),
+        dir=Field(0x50, "I"),
+        rotation=Field(0x58, "d"),
+        rotation_2d=Field(0x60, "d"),
+        global_speed=Field(0x68, "d"),
+        blend_mode=Field(0x70, "I", deref=(0x4,)),  # ptr to HENUM, BlendMode
+        debug_bounds=Field(0x74, "I"),  # ptr to HOBJ
+        level_over_value=Field(0x78, "B"),  # bool
+        eyes=Field(0x7C, "I"),  # ptr to HOBJ
+        freeze_factor=Field(0x80, "d"),
+    )
 
     @property
     def kind(self) -> EKind:
-        ptr = self.process.get_pointer(self.base_ptr, offsets=self._KIND_PTR)
-        kind = self.process.read_u32(ptr)
-        return EKind(kind)
+        return EKind(self.fields.kind)
 
     # TODO: As dict?
     @property
@@ -59,9 +56,4 @@ class Sprite:
 
     @property
     def pos(self) -> Vec2:
-        x_ptr = self.process.get_pointer(self.base_ptr, offsets=self._X_PTR)
-        y_ptr = self.process.get_pointer(self.base_ptr, offsets=self._Y_PTR)
-        return Vec2(
-            self.process.read_double(x_ptr),
-            self.process.read_double(y_ptr),
-        )
+        return Vec2(self.fields.x, self.fields.y)
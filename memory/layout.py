@@ -0,0 +1,159 @@
+# Libraries and Core Files
+import struct
+from typing import Any, Callable, NamedTuple, Optional
+
+from memory.core import LocProcess, ReadPlan
+
+_POINTER = struct.Struct("<I")
+
+
+class Field(NamedTuple):
+    """
+    A field of a memory layout. `fmt` is a struct format character.
+    With `deref`, the field holds a pointer: it is read and each offset is
+    applied in turn (same as LocProcess.get_pointer), e.g. [0x4, 0x4] becomes
+    Field(0x4, "I", deref=(0x4,)).
+    """
+
+    offset: int
+    fmt: str
+    deref: tuple[int, ...] = ()
+
+
+class Layout:
+    """
+    Layout of an object in memory, compiled into struct decoders. All fields stored
+    inline are decoded from a single block read; fields that overlap (unions) are
+    split over as few struct formats as needed.
+    """
+
+    def __init__(self, name: str, /, **fields: Field) -> None:
+        self.name = name
+        self.fields = fields
+        self.size = max(
+            field.offset
+            + (_POINTER.size if field.deref else struct.calcsize(field.fmt))
+            for field in fields.values()
+        )
+        self._lanes = self._compile_lanes()
+        self.accessor = self._compile_accessor()
+
+    def extend(self, name: str, /, **fields: Field) -> "Layout":
+        """Layout of a subclass. Fields with the same name are overridden."""
+        return Layout(name, **{**self.fields, **fields})
+
+    def _compile_lanes(self) -> list[tuple[struct.Struct, list[str]]]:
+        # Greedily pack the inline fields into non-overlapping struct formats
+        lanes: list[tuple[list[str], int, str]] = []
+        inline = [name for name, field in self.fields.items() if not field.deref]
+        for name in sorted(inline, key=lambda n: self.fields[n].offset):
+            field = self.fields[name]
+            for i, (names, end, fmt) in enumerate(lanes):
+                if field.offset >= end:
+                    pad = f"{field.offset - end}x" if field.offset > end else ""
+                    end = field.offset + struct.calcsize(field.fmt)
+                    lanes[i] = (names + [name], end, fmt + pad + field.fmt)
+                    break
+            else:
+                pad = f"{field.offset}x" if field.offset else ""
+                end = field.offset + struct.calcsize(field.fmt)
+                lanes.append(([name], end, pad + field.fmt))
+        return [(struct.Struct("<" + fmt), names) for names, _, fmt in lanes]
+
+    def _compile_accessor(self) -> type:
+        props = {
+            name: property(self._compile_getter(field))
+            for name, field in self.fields.items()
+        }
+        return type(f"{self.name}Fields", (LayoutFields,), props)
+
+    @staticmethod
+    def _compile_getter(field: Field) -> Callable[["LayoutFields"], Any]:
+        decoder = struct.Struct("<" + field.fmt)
+        offset = field.offset
+        if not field.deref:
+
+            def getter(fields: LayoutFields) -> Any:
+                return decoder.unpack_from(*fields.owner.locate(offset, decoder.size))[
+                    0
+                ]
+
+        else:
+            chain, last = field.deref[:-1], field.deref[-1]
+
+            def getter(fields: LayoutFields) -> Any:
+                owner = fields.owner
+                ptr = _POINTER.unpack_from(*owner.locate(offset, _POINTER.size))[0]
+                for deref in chain:
+                    ptr = owner.process.read(ptr + deref)
+                data = owner.process.read_bytes(ptr + last, decoder.size)
+                return decoder.unpack(data)[0]
+
+        return getter
+
+    def decode(self, block: bytes) -> dict[str, Any]:
+        """Decode every inline field of a block, one unpack_from per struct format."""
+        values = {}
+        for decoder, names in self._lanes:
+            values.update(zip(names, decoder.unpack_from(block)))
+        return values
+
+
+class LayoutFields:
+    """Base of the generated accessor classes, one property per layout field."""
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: "LayoutObject") -> None:
+        self.owner = owner
+
+    def all(self) -> dict[str, Any]:
+        return self.owner._LAYOUT.decode(self.owner.block())
+
+
+class LayoutObject:
+    """
+    Object in memory described by a Layout. `entity_ptr` points to the object
+    pointer. The whole object is read once per frame (or once per snapshot) and
+    every field access is decoded from that block.
+    """
+
+    _LAYOUT: Layout
+
+    def __init__(self, process: LocProcess, entity_ptr: int = 0) -> None:
+        self.process = process
+        self.entity_ptr = entity_ptr
+        self.fields = self._LAYOUT.accessor(self)
+        # When set, fields are served from this copy until the next take_snapshot
+        self.snapshot: Optional[bytes] = None
+
+    @property
+    def base(self) -> int:
+        return self.process.read(self.entity_ptr)
+
+    def address_of(self, name: str) -> int:
+        """Address of a field, e.g. to hand a pointer field to another LayoutObject."""
+        return self.base + self._LAYOUT.fields[name].offset
+
+    def block(self) -> bytes:
+        if self.snapshot is not None:
+            return self.snapshot
+        return self.process.read_bytes(self.base, self._LAYOUT.size)
+
+    def take_snapshot(self) -> None:
+        """Freeze the current contents of the object until the next snapshot."""
+        self.snapshot = None
+        self.snapshot = self.block()
+
+    def locate(self, offset: int, size: int) -> tuple[bytes, int]:
+        """Buffer and buffer offset holding the field at offset."""
+        try:
+            return self.block(), offset
+        except ReferenceError:
+            # The object may sit at the end of a readable region, try the field alone
+            return self.process.read_bytes(self.base + offset, size), 0
+
+    def plan_reads(self, plan: ReadPlan) -> None:
+        """Register the object block with a read plan."""
+        if self.snapshot is None:
+            plan.add_bytes(self.base, self._LAYOUT.size)
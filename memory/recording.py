@@ -0,0 +1,299 @@
+# Libraries and Core Files
+import ctypes
+import logging
+import struct
+import time
+import zlib
+from typing import NamedTuple, Optional
+
+from memory.backend import ProcessBackend
+
+logger = logging.getLogger(__name__)
+
+
+# Recording file layout (little endian):
+#   header:  magic, libhl base address
+#   chunks:  chunk header + zlib payload, appended every `chunk_frames` frames.
+#            The payload starts with the full memory state seen so far, so replay
+#            can start at any chunk, followed by the reads of each frame in the chunk.
+#   index:   chunk offsets and checkpoint labels, written when the recording is closed.
+#   footer:  offset of the index. A recording without one is indexed by scanning the chunks.
+_REC_MAGIC = b"EVOREC01"
+_REC_HEADER = struct.Struct("<8sI")
+_CHUNK_MAGIC = b"CHNK"
+_CHUNK_HEADER = struct.Struct("<4sIdII")  # magic, first frame, timestamp, frames, size
+_INDEX_MAGIC = b"EVOIDX01"
+_INDEX_ENTRY = struct.Struct("<IdQ")  # first frame, timestamp, file offset
+_FOOTER = struct.Struct("<Q8s")  # index offset, magic
+_FRAME_HEADER = struct.Struct("<IdH")  # frame, timestamp, label length
+_READ = struct.Struct("<IIB")  # address, size, success
+_COUNT = struct.Struct("<I")
+
+# Memory reads, keyed by (address, size). Failed reads are stored as None.
+Reads = dict[tuple[int, int], Optional[bytes]]
+
+
+class ChunkIndex(NamedTuple):
+    frame: int
+    timestamp: float
+    offset: int
+
+
+class Frame(NamedTuple):
+    frame: int
+    timestamp: float
+    label: str
+    reads: Reads
+
+
+def _pack_reads(reads: Reads) -> bytes:
+    out = [_COUNT.pack(len(reads))]
+    for (address, size), data in reads.items():
+        out.append(_READ.pack(address, size, data is not None))
+        if data is not None:
+            out.append(data)
+    return b"".join(out)
+
+
+def _unpack_reads(payload: bytes, offset: int) -> tuple[Reads, int]:
+    reads: Reads = {}
+    (count,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        address, size, success = _READ.unpack_from(payload, offset)
+        offset += _READ.size
+        if success:
+            reads[(address, size)] = payload[offset : offset + size]
+            offset += size
+        else:
+            reads[(address, size)] = None
+    return reads, offset
+
+
+def _unpack_chunk(payload: bytes, num_frames: int) -> tuple[Reads, list[Frame]]:
+    state, offset = _unpack_reads(payload, 0)
+    frames: list[Frame] = []
+    for _ in range(num_frames):
+        frame, timestamp, label_len = _FRAME_HEADER.unpack_from(payload, offset)
+        offset += _FRAME_HEADER.size
+        label = payload[offset : offset + label_len].decode("utf-8")
+        offset += label_len
+        reads, offset = _unpack_reads(payload, offset)
+        frames.append(Frame(frame, timestamp, label, reads))
+    return state, frames
+
+
+class RecordingBackend(ProcessBackend):
+    """Forwards reads to another backend and records the reads of every frame to a file."""
+
+    def __init__(
+        self,
+        backend: ProcessBackend,
+        filename: str,
+        base_addr: int,
+        chunk_frames: int = 300,
+    ):
+        self.backend = backend
+        self.filename = filename
+        self.chunk_frames = chunk_frames
+        self._file = open(filename, "wb")
+        self._file.write(_REC_HEADER.pack(_REC_MAGIC, base_addr))
+        self._index: list[ChunkIndex] = []
+        self._labels: list[tuple[int, str]] = []
+        # All memory seen so far, and what has been read since the last flushed chunk
+        self._state: Reads = {}
+        self._chunk_state: Reads = {}
+        self._chunk: list[bytes] = []
+        self._chunk_frames = 0
+        self._chunk_start: Optional[tuple[int, float]] = None
+        self._frame = 0
+        self._label = ""
+        self._reads: Reads = {}
+        logger.info(f"Recording memory reads to {filename}")
+
+    def read_into(self, address: int, buffer) -> bool:
+        size = ctypes.sizeof(buffer)
+        if self.backend.read_into(address, buffer):
+            self._reads[(address, size)] = ctypes.string_at(
+                ctypes.addressof(buffer), size
+            )
+            return True
+        self._reads[(address, size)] = None
+        return False
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        data = self.backend.read_bytes(address, size)
+        self._reads[(address, size)] = data
+        return data
+
+    def mark(self, label: str) -> None:
+        self._label = label
+        self._labels.append((self._frame, label))
+
+    def advance_frame(self, frame: int) -> None:
+        timestamp = time.time()
+        if self._chunk_start is None:
+            self._chunk_start = (self._frame, timestamp)
+            self._chunk_state = dict(self._state)
+        label = self._label.encode("utf-8")
+        self._chunk.append(_FRAME_HEADER.pack(self._frame, timestamp, len(label)))
+        self._chunk.append(label)
+        self._chunk.append(_pack_reads(self._reads))
+        self._chunk_frames += 1
+        self._state.update(self._reads)
+        self._reads = {}
+        self._label = ""
+        self._frame = frame
+        if self._chunk_frames >= self.chunk_frames:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._chunk_start is None:
+            return
+        payload = zlib.compress(_pack_reads(self._chunk_state) + b"".join(self._chunk))
+        first_frame, timestamp = self._chunk_start
+        self._index.append(ChunkIndex(first_frame, timestamp, self._file.tell()))
+        self._file.write(
+            _CHUNK_HEADER.pack(
+                _CHUNK_MAGIC,
+                first_frame,
+                timestamp,
+                self._chunk_frames,
+                len(payload),
+            )
+        )
+        self._file.write(payload)
+        self._file.flush()
+        self._chunk = []
+        self._chunk_frames = 0
+        self._chunk_start = None
+
+    def close(self) -> None:
+        # Finish the current frame so that its reads are not lost
+        self.advance_frame(self._frame + 1)
+        self._flush()
+        index_offset = self._file.tell()
+        self._file.write(_COUNT.pack(len(self._index)))
+        for entry in self._index:
+            self._file.write(_INDEX_ENTRY.pack(*entry))
+        self._file.write(_COUNT.pack(len(self._labels)))
+        for frame, label in self._labels:
+            encoded = label.encode("utf-8")
+            self._file.write(_FRAME_HEADER.pack(frame, 0.0, len(encoded)) + encoded)
+        self._file.write(_FOOTER.pack(index_offset, _INDEX_MAGIC))
+        self._file.close()
+        self.backend.close()
+        logger.info(f"Recorded {self._frame} frames to {self.filename}")
+
+
+class ReplayBackend(ProcessBackend):
+    """Serves reads frame by frame from a recording made with RecordingBackend."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        magic, self.base_addr = _REC_HEADER.unpack(self._file.read(_REC_HEADER.size))
+        if magic != _REC_MAGIC:
+            raise ValueError(f"{filename} is not a memory recording")
+        self.index: list[ChunkIndex] = []
+        self.labels: dict[str, int] = {}
+        if not self._read_index():
+            self._scan_index()
+        # Memory as of the current frame, and the frames left in the current chunk
+        self._state: Reads = {}
+        self._frames: list[Frame] = []
+        self._chunk = -1
+        self.frame: Optional[Frame] = None
+        self.seek(self.index[0].frame if self.index else 0)
+
+    def _read_index(self) -> bool:
+        self._file.seek(0, 2)
+        end = self._file.tell()
+        if end < _REC_HEADER.size + _FOOTER.size:
+            return False
+        self._file.seek(end - _FOOTER.size)
+        index_offset, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != _INDEX_MAGIC:
+            return False
+        self._file.seek(index_offset)
+        (count,) = _COUNT.unpack(self._file.read(_COUNT.size))
+        for _ in range(count):
+            entry = _INDEX_ENTRY.unpack(self._file.read(_INDEX_ENTRY.size))
+            self.index.append(ChunkIndex(*entry))
+        (count,) = _COUNT.unpack(self._file.read(_COUNT.size))
+        for _ in range(count):
+            frame, _, label_len = _FRAME_HEADER.unpack(
+                self._file.read(_FRAME_HEADER.size)
+            )
+            self.labels[self._file.read(label_len).decode("utf-8")] = frame
+        return True
+
+    def _scan_index(self) -> None:
+        # Recording was not closed properly, walk the chunks that made it to disk
+        logger.warning(f"{self.filename} has no index, scanning chunks")
+        offset = _REC_HEADER.size
+        while True:
+            self._file.seek(offset)
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                break
+            magic, frame, timestamp, num_frames, size = _CHUNK_HEADER.unpack(header)
+            payload = self._file.read(size)
+            if magic != _CHUNK_MAGIC or len(payload) < size:
+                break
+            self.index.append(ChunkIndex(frame, timestamp, offset))
+            for rec in _unpack_chunk(zlib.decompress(payload), num_frames)[1]:
+                if rec.label:
+                    self.labels[rec.label] = rec.frame
+            offset += _CHUNK_HEADER.size + size
+
+    def _load_chunk(self, chunk: int) -> None:
+        self._file.seek(self.index[chunk].offset)
+        _, _, _, num_frames, size = _CHUNK_HEADER.unpack(
+            self._file.read(_CHUNK_HEADER.size)
+        )
+        self._state, self._frames = _unpack_chunk(
+            zlib.decompress(self._file.read(size)), num_frames
+        )
+        self._frames.reverse()
+        self._chunk = chunk
+
+    def _next_frame(self) -> bool:
+        if not self._frames:
+            if self._chunk + 1 >= len(self.index):
+                return False
+            self._load_chunk(self._chunk + 1)
+        self.frame = self._frames.pop()
+        self._state.update(self.frame.reads)
+        return True
+
+    def seek(self, frame: int) -> None:
+        """Jump to a recorded frame, using the index to skip the chunks before it."""
+        chunk = 0
+        while chunk + 1 < len(self.index) and self.index[chunk + 1].frame <= frame:
+            chunk += 1
+        if self.index:
+            self._load_chunk(chunk)
+        while self._next_frame() and self.frame.frame < frame:
+            pass
+
+    def seek_label(self, label: str) -> None:
+        """Jump to the frame where the checkpoint was marked."""
+        self.seek(self.labels[label])
+
+    def advance_frame(self, frame: int) -> None:
+        if not self._next_frame():
+            logger.warning(f"End of recording {self.filename}, replaying last frame")
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        return self._state.get((address, size))
+
+    def read_into(self, address: int, buffer) -> bool:
+        data = self.read_bytes(address, ctypes.sizeof(buffer))
+        if data is None:
+            return False
+        ctypes.memmove(ctypes.addressof(buffer), data, len(data))
+        return True
+
+    def close(self) -> None:
+        self._file.close()
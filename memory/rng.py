@@ -1,5 +1,7 @@
 # Libraries and Core Files
 import logging
+import random
+from typing import Optional
 
 from memory.core import LIBHL_OFFSET, mem_handle
 
@@ -21,7 +23,12 @@ class EvolandRNG:
 
     _RNG_VALUE_SIZE = 4  # 4 bytes
     _RNG_BASE_PTR = [0x7F4, 0x0, 0x18, 0x0]
-    _RNG_CURSOR_PTR = [0x7F4, 0x0, 0x18, 0x64]
+    # The cursor is at offset 0x64 of the same struct (right after the values), so
+    # both are read in one go
+    _RNG_BLOCK_SIZE = (RNG_VALS + 1) * _RNG_VALUE_SIZE
+    # Last decoded ((frame, base ptr), cursor, values). Shared by all instances, since
+    # most callers create a new EvolandRNG every time they need the RNG state.
+    _cached: Optional[tuple[tuple[int, int], int, tuple[int, ...]]] = None
 
     def __init__(self) -> None:
         mem = mem_handle()
@@ -30,10 +37,7 @@ class EvolandRNG:
         self.setup_pointers()
 
     def setup_pointers(self):
-        self.rng_cursor_ptr = self.process.get_pointer(
-            self.base_addr + LIBHL_OFFSET, offsets=self._RNG_CURSOR_PTR
-        )
-        self.rng_base_ptr = self.process.get_pointer(
+        self.rng_base_ptr = self.process.resolve_pointer(
             self.base_addr + LIBHL_OFFSET, offsets=self._RNG_BASE_PTR
         )
 
@@ -84,11 +88,22 @@ class EvolandRNG:
                 (self.rand_int() / big + self.rand_int()) / big + self.rand_int()
             ) / big
 
-    # Get the current RNG values
+    # Get the current RNG values. The returned struct is a copy and can be advanced freely.
     def get_rng(self) -> RNGStruct:
-        cursor = self.process.read_u32(self.rng_cursor_ptr)
-        values = [
-            self.process.read_u32(self.rng_base_ptr + i * self._RNG_VALUE_SIZE)
-            for i in range(self.RNG_VALS)
-        ]
-        return EvolandRNG.RNGStruct(cursor=cursor, values=values)
+        key = (self.process.frame, self.rng_base_ptr)
+        if EvolandRNG._cached is None or EvolandRNG._cached[0] != key:
+            block = self.process.read_bytes(self.rng_base_ptr, self._RNG_BLOCK_SIZE)
+            words = memoryview(block).cast("I")
+            cursor, values = words[self.RNG_VALS], tuple(words[: self.RNG_VALS])
+            EvolandRNG._cached = (key, cursor, values)
+        _, cursor, values = EvolandRNG._cached
+        return EvolandRNG.RNGStruct(cursor=cursor, values=list(values))
+
+
+def random_rng(seed: int) -> EvolandRNG.RNGStruct:
+    """Random RNG state, with the cursor anywhere it can be after the first batch."""
+    gen = random.Random(seed)
+    return EvolandRNG.RNGStruct(
+        cursor=gen.randint(1, EvolandRNG.RNG_VALS),
+        values=[gen.getrandbits(32) for _ in range(EvolandRNG.RNG_VALS)],
+    )
@@ -0,0 +1,120 @@
+# Libraries and Core Files
+import numpy as np
+
+from memory.rng import EvolandRNG
+
+_BIG = 4294967296.0
+_MAG01 = np.array(EvolandRNG.RNG_MAG01, dtype=np.uint32)
+
+# Laid out as one stream, the batches follow x[n + 25] = x[n + 7] ^ f(x[n]), where
+# f(v) = (v >> 1) ^ MAG01[v & 1] is linear over GF(2). Squaring the recurrence J times
+# gives x[n + 25 * 2^J] = x[n + 7 * 2^J] ^ f^(2^J)(x[n]), which produces 18 * 2^J
+# words per step instead of 25, with f^(2^J) applied through byte lookup tables.
+_JUMP = 6
+_JUMP_BASE = EvolandRNG.RNG_VALS << _JUMP
+_JUMP_LAG = (EvolandRNG.RNG_VALS - EvolandRNG.RNG_MAX) << _JUMP
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    return (values >> 1) ^ _MAG01[values & 1]
+
+
+def _twist(values: np.ndarray) -> np.ndarray:
+    """Next batch of 25 words. Same as RNGStruct._calc_next_rng."""
+    split = EvolandRNG.RNG_VALS - EvolandRNG.RNG_MAX
+    mixed = _mix(values)
+    new = np.empty_like(values)
+    new[:split] = values[EvolandRNG.RNG_MAX :] ^ mixed[:split]
+    new[split:] = new[: EvolandRNG.RNG_MAX] ^ mixed[split:]
+    return new
+
+
+def _jump_tables() -> np.ndarray:
+    # tables[i][b] = f^(2^J)(b << 8i), so f^(2^J)(v) is the xor over the bytes of v
+    tables = (
+        np.arange(256, dtype=np.uint32) << (8 * np.arange(4, dtype=np.uint32))[:, None]
+    )
+    for _ in range(1 << _JUMP):
+        tables = _mix(tables)
+    return tables
+
+
+_JUMP_TABLES = _jump_tables()
+
+
+def _jump_mix(values: np.ndarray) -> np.ndarray:
+    t = _JUMP_TABLES
+    return (
+        t[0][values & 0xFF]
+        ^ t[1][(values >> 8) & 0xFF]
+        ^ t[2][(values >> 16) & 0xFF]
+        ^ t[3][values >> 24]
+    )
+
+
+def _stream(values: list[int], length: int) -> np.ndarray:
+    """The current batch followed by the next ones, as one array of at least length words."""
+    num_batches = min(length, _JUMP_BASE) // EvolandRNG.RNG_VALS + 1
+    batches = np.empty((num_batches, EvolandRNG.RNG_VALS), dtype=np.uint32)
+    batches[0] = values
+    for i in range(1, num_batches):
+        batches[i] = _twist(batches[i - 1])
+    if length <= batches.size:
+        return batches.reshape(-1)
+    stream = np.empty(length, dtype=np.uint32)
+    stream[:_JUMP_BASE] = batches.reshape(-1)[:_JUMP_BASE]
+    for i in range(_JUMP_BASE, length, _JUMP_LAG):
+        end = min(i + _JUMP_LAG, length)
+        stream[i:end] = stream[i - _JUMP_LAG : end - _JUMP_LAG] ^ _jump_mix(
+            stream[i - _JUMP_BASE : end - _JUMP_BASE]
+        )
+    return stream
+
+
+def _temper(values: np.ndarray) -> np.ndarray:
+    """Same as the tempering in RNGStruct.rand_int."""
+    values = values ^ ((values << 7) & np.uint32(0x2B5B2500))
+    values = values ^ ((values << 15) & np.uint32(0xDB8B0000))
+    return values ^ (values >> 16)
+
+
+class RNGLookahead:
+    """
+    The next `steps` RNG values after the cursor of an RNGStruct, generated in bulk.
+    ints[k] is what the (k+1)-th rand_int() call from now returns, and floats[k] what
+    rand_float() returns after k values have been consumed. Bit-exact with RNGStruct.
+    """
+
+    def __init__(self, rng: EvolandRNG.RNGStruct, steps: int) -> None:
+        self.cursor = rng.cursor
+        # Raw words: the current batch followed by as many batches as needed, padded
+        # to whole batches so rng_at can hand out any of them
+        length = self.cursor + steps + 2 + EvolandRNG.RNG_VALS
+        self.raw = _stream(rng.values, length - length % EvolandRNG.RNG_VALS)
+        self.ints = _temper(self.raw[self.cursor : self.cursor + steps + 2])
+        # Three consecutive values per float, evaluated in the same order as rand_float
+        ints = self.ints.astype(np.float64)
+        self.floats = ((ints[:-2] / _BIG + ints[1:-1]) / _BIG + ints[2:]) / _BIG
+        self.ints = self.ints[:steps]
+        self.floats = self.floats[:steps]
+
+    def __len__(self) -> int:
+        return len(self.ints)
+
+    def rand_int(self, offset: int) -> int:
+        return int(self.ints[offset])
+
+    def rand_float(self, offset: int) -> float:
+        return float(self.floats[offset])
+
+    def rng_at(self, offset: int) -> EvolandRNG.RNGStruct:
+        """RNGStruct after `offset` values have been consumed, for step by step code."""
+        pos = self.cursor + offset
+        if pos <= EvolandRNG.RNG_VALS:
+            batch, cursor = 0, pos
+        else:
+            batch = (pos - 1) // EvolandRNG.RNG_VALS
+            cursor = pos - batch * EvolandRNG.RNG_VALS
+        start = batch * EvolandRNG.RNG_VALS
+        values = self.raw[start : start + EvolandRNG.RNG_VALS].tolist()
+        return EvolandRNG.RNGStruct(cursor=cursor, values=values)
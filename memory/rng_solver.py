@@ -0,0 +1,149 @@
+# Libraries and Core Files
+import logging
+from typing import Callable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from memory.rng import EvolandRNG
+from memory.rng_lookahead import RNGLookahead
+
+logger = logging.getLogger(__name__)
+
+
+class IntObservation(NamedTuple):
+    """A rand_int() whose (value & mask) % modulo was one of `values`."""
+
+    modulo: int
+    values: frozenset[int]
+    mask: int = 0x3FFFFFFF
+
+
+class FloatObservation(NamedTuple):
+    """A rand_float() for which `match` holds. `match` maps a float64 array to bools."""
+
+    match: Callable[[np.ndarray], np.ndarray]
+
+
+class Skip(NamedTuple):
+    """RNG values consumed for something that was not observed."""
+
+    count: int
+
+
+Observation = Union[IntObservation, FloatObservation, Skip]
+
+
+def _width(observation: Observation) -> int:
+    if isinstance(observation, IntObservation):
+        return 1
+    if isinstance(observation, FloatObservation):
+        return 3
+    return observation.count
+
+
+class _NGramIndex:
+    """Offsets of every run of n (value & mask) % modulo outcomes, sorted by run."""
+
+    def __init__(self, ints: np.ndarray, modulo: int, mask: int, n: int) -> None:
+        self.modulo = modulo
+        self.mask = mask
+        self.n = n
+        residues = ((ints & mask) % modulo).astype(np.int64)
+        count = len(residues) - n + 1
+        # A run encoded as a number in base modulo, first outcome most significant
+        keys = np.zeros(count, dtype=np.int64)
+        for i in range(n):
+            keys = keys * modulo + residues[i : i + count]
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def lookup(self, outcomes: list[int]) -> np.ndarray:
+        key = 0
+        for outcome in outcomes:
+            key = key * self.modulo + outcome
+        start, end = np.searchsorted(self.keys, [key, key + 1])
+        return np.sort(self.order[start:end])
+
+
+class RNGSolver:
+    """
+    Finds where the game's RNG is, relative to a captured state, from a sequence of
+    observed outcomes (modulo values, hits, damage rolls and so on). The outcomes
+    are matched against the next `steps` RNG values. With an n-gram index on a
+    modulo, sequences starting with n single-value IntObservations of that modulo
+    are looked up directly instead of scanning every offset.
+    """
+
+    def __init__(self, rng: EvolandRNG.RNGStruct, steps: int = 100000) -> None:
+        self.lookahead = RNGLookahead(rng, steps)
+        self.steps = steps
+        self._indexes: list[_NGramIndex] = []
+
+    def add_index(self, modulo: int, n: int = 4, mask: int = 0x3FFFFFFF) -> None:
+        """Index every run of n outcomes of (value & mask) % modulo."""
+        self._indexes.append(_NGramIndex(self.lookahead.ints, modulo, mask, n))
+
+    def _matches(
+        self, observation: Observation, offsets: np.ndarray | slice
+    ) -> Optional[np.ndarray]:
+        # Whether the observation matches at each of the offsets, None for a Skip
+        if isinstance(observation, IntObservation):
+            ints = self.lookahead.ints[offsets]
+            return np.isin(
+                (ints & observation.mask) % observation.modulo, list(observation.values)
+            )
+        if isinstance(observation, FloatObservation):
+            floats = self.lookahead.floats[offsets]
+            return np.asarray(observation.match(floats), dtype=bool)
+        return None
+
+    def _indexed(self, observations: list[Observation]) -> Optional[np.ndarray]:
+        # Candidate offsets from an index matching the start of the sequence
+        for index in self._indexes:
+            head = observations[: index.n]
+            if len(head) == index.n and all(
+                isinstance(obs, IntObservation)
+                and obs.modulo == index.modulo
+                and obs.mask == index.mask
+                and len(obs.values) == 1
+                for obs in head
+            ):
+                return index.lookup([next(iter(obs.values)) for obs in head])
+        return None
+
+    def solve(self, observations: list[Observation]) -> list[int]:
+        """Every offset from the captured state at which the observations fit."""
+        width = sum(_width(obs) for obs in observations)
+        last = self.steps - width
+        if last < 0:
+            return []
+        candidates = self._indexed(observations)
+        if candidates is not None:
+            candidates = candidates[candidates <= last]
+        pos = 0
+        for obs in observations:
+            if candidates is None:
+                # First observation, check every offset it can land on
+                matches = self._matches(obs, slice(pos, pos + last + 1))
+                if matches is not None:
+                    candidates = np.nonzero(matches)[0]
+            else:
+                matches = self._matches(obs, candidates + pos)
+                if matches is not None:
+                    candidates = candidates[matches]
+            pos += _width(obs)
+        if candidates is None:
+            candidates = np.arange(last + 1)
+        return candidates.tolist()
+
+    def resync(self, observations: list[Observation]) -> Optional[EvolandRNG.RNGStruct]:
+        """
+        RNG state right after the observations, if they fit a single offset.
+        Re-syncs predictions after unmodeled RNG consumption without reading memory.
+        """
+        offsets = self.solve(observations)
+        if len(offsets) != 1:
+            logger.debug(f"{len(offsets)} offsets fit the observations")
+            return None
+        width = sum(_width(obs) for obs in observations)
+        return self.lookahead.rng_at(offsets[0] + width)
@@ -45,6 +45,11 @@ def main_menu(window: WindowLayout):
                 "key": "7",
                 "func": evo1.move_speed_test,
             },
+            {
+                "name": "Evoland 1 Compile Routes",
+                "key": "8",
+                "func": evo1.compile_routes,
+            },
         ]
 
         # Update side window
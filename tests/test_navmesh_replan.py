@@ -0,0 +1,78 @@
+import os
+from typing import Optional
+
+from engine.mathlib import Vec2, dist, is_close
+from engine.pathing import NavMesh, load_navmesh, load_tilemap
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SPEED = 0.15  # Tiles per tick
+_PRECISION = 0.2  # SeqMove2D default
+
+
+def _ruins_nav() -> NavMesh:
+    tilemap = load_tilemap(os.path.join(_ROOT, "maps/evo1/sarudnahk.yaml"))
+    return load_navmesh(tilemap, name="sarudnahk")
+
+
+def _follow(
+    nav: NavMesh,
+    coords: list[Vec2],
+    pos: Vec2,
+    max_ticks: int = 2000,
+    knockback: Optional[tuple[int, Vec2]] = None,
+) -> tuple[int, list[Vec2]]:
+    """
+    Walk coords the way SeqMove2D does (replan, then step towards the next
+    waypoint), returning the ticks it took and the waypoints reached. The player can
+    be knocked back by a vector on a given tick.
+    """
+    goal, step, planned, origin = coords[-1], 0, False, pos
+    reached = []
+    for tick in range(max_ticks):
+        if knockback is not None and tick == knockback[0]:
+            pos = pos + knockback[1]
+        if step >= len(coords):
+            return tick, reached
+        prev = (coords[step - 1] if step else origin) if planned else None
+        path = nav.replan(pos, prev, coords[step:], goal, _PRECISION)
+        planned = True
+        if path is not None:
+            coords, step, origin = path, 0, pos
+            if not coords:
+                return tick, reached
+        target = coords[step]
+        if is_close(pos, target, _PRECISION):
+            reached.append(target)
+            step += 1
+        else:
+            move = target - pos
+            pos = pos + move.normalized * min(_SPEED, dist(pos, target))
+    raise AssertionError(f"Never got to {goal}, stuck at {pos} (step {step})")
+
+
+def test_combo_to_lifebar_chest_finishes():
+    # Nodes 6 and 7 are connected but not in sight of each other (a rock is in the way)
+    nav = _ruins_nav()
+    combo_chest, lifebar_chest = nav.map[4], nav.map[7]
+    coords = nav.calculate(start=combo_chest, goal=lifebar_chest)
+    assert not nav.visible_from(nav.map[6], nav.map[7])
+    _, reached = _follow(nav, coords, combo_chest)
+    assert reached[-1] == lifebar_chest
+    assert reached.count(nav.map[6]) == 1
+
+
+def test_every_leg_finishes():
+    nav = _ruins_nav()
+    for i, start in enumerate(nav.map):
+        for j in nav.edges[i]:
+            _follow(nav, nav.calculate(start=start, goal=nav.map[j]), start)
+
+
+def test_knockback_continues_towards_goal():
+    nav = _ruins_nav()
+    start, goal = nav.map[4], nav.map[7]
+    coords = nav.calculate(start=start, goal=goal)
+    # Knocked sideways off the first leg, the path doesn't go back to the start
+    _, reached = _follow(nav, coords, start, knockback=(20, Vec2(0, 2)))
+    assert reached[-1] == goal
+    assert start not in reached